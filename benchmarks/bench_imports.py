@@ -0,0 +1,105 @@
+"""
+Import time of the package's entry modules, checked against a budget
+
+Each module is imported in a fresh interpreter under ``python -X importtime``
+(best of ``--repeat`` runs, since the first run also pays for a cold disk
+cache). The report lists the slowest modules each import pulls in. With
+``--check`` the script exits with status 1 when a module exceeds its budget,
+when ``job_tracker.app`` loads a heavy dependency, or when importing it
+creates a database; ``invoke test`` runs it that way.
+
+Usage:
+    python benchmarks/bench_imports.py [--check] [--repeat 3] [--top 8]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+# Cumulative import time allowed per module, in milliseconds (about twice the measured time)
+BUDGET_MS = {
+    "job_tracker.app": 50,
+    "job_tracker.cli": 150,
+    "job_tracker.models": 800,
+    "job_tracker.ingest": 2000,
+    "job_tracker.queries": 2000,
+}
+
+# Dependencies that importing the entry point must leave for first use
+DEFERRED_MODULES = {
+    "job_tracker.app": ["streamlit", "pandas", "numpy", "sqlalchemy", "job_tracker.ui"],
+    "job_tracker.cli": ["streamlit", "pandas", "numpy", "sqlalchemy"],
+    "job_tracker.models": ["streamlit"],
+    "job_tracker.ingest": ["streamlit"],
+    "job_tracker.queries": ["streamlit"],
+}
+
+# Appended to the import so the child reports which of DEFERRED_MODULES it loaded
+REPORT_LOADED = "; import sys; print(' '.join(sorted(sys.modules)))"
+
+def measure(module, cwd):
+    """Import ``module`` in a fresh interpreter
+
+    Args:
+        module: Dotted module name
+        cwd: Working directory of the child; must hold no job_tracker.db
+
+    Returns:
+        Tuple of (cumulative microseconds of ``module`` and each module it
+        imported, set of all loaded module names)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}" + REPORT_LOADED],
+        cwd=cwd, capture_output=True, text=True, check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package; nested imports are indented
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            # A top-level import closes here; everything listed since belongs to it
+            if name.strip() == module:
+                cumulative[module] = int(total)
+                break
+            cumulative.clear()
+            continue
+        cumulative[name.strip()] = int(total)
+    return cumulative, set(result.stdout.split())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 when a budget is exceeded")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports listed per module")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for module, budget in BUDGET_MS.items():
+            runs = [measure(module, tmp) for _ in range(args.repeat)]
+            cumulative, loaded = min(runs, key=lambda run: run[0].get(module, 0))
+            total_ms = cumulative.get(module, 0) / 1000
+            status = "ok" if total_ms <= budget else "OVER"
+            print(f"{module:<22} {total_ms:9.1f} ms  (budget {budget} ms) {status}")
+            slowest = sorted((item for item in cumulative.items() if item[0] != module), key=lambda item: -item[1])
+            for name, micros in slowest[:args.top]:
+                print(f"    {micros / 1000:9.1f} ms  {name}")
+
+            if total_ms > budget:
+                failures.append(f"{module} took {total_ms:.1f} ms, over its {budget} ms budget")
+            eager = [name for name in DEFERRED_MODULES.get(module, []) if name in loaded]
+            if eager:
+                failures.append(f"{module} imports {', '.join(eager)} at import time")
+        if os.listdir(tmp):
+            failures.append(f"importing created files: {', '.join(sorted(os.listdir(tmp)))}")
+
+    for failure in failures:
+        print(failure)
+    if args.check and failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Async ingest benchmarks: overlapping a slow source's reads with the database writes
+"""
+import asyncio
+import itertools
+import time
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+pytest.importorskip('aiosqlite')
+
+from job_tracker.aio import create_async_session_factory, init_async_engine, process_csv_async
+from job_tracker.ingest import sync_csv_stream
+
+# Chunks the slow source hands over, whatever the export size
+SOURCE_CHUNKS = 10
+
+# Seconds the source waits per row of a chunk, like a slow disk or network upload (about a row's write time)
+SOURCE_DELAY_PER_ROW = 0.0003
+
+def slow_chunks(export):
+    """The export in ``SOURCE_CHUNKS`` chunks, each delayed in proportion to its rows"""
+    chunk_rows = -(-len(export.index) // SOURCE_CHUNKS)
+    for start in range(0, len(export.index), chunk_rows):
+        chunk = export.iloc[start:start + chunk_rows]
+        time.sleep(SOURCE_DELAY_PER_ROW * len(chunk.index))
+        yield chunk
+
+async def sync_async(db_url, source):
+    engine = await init_async_engine(db_url)
+    try:
+        async with create_async_session_factory(engine)() as session:
+            return await process_csv_async(session, source)
+    finally:
+        await engine.dispose()
+
+@pytest.mark.benchmark(group='slow-source')
+def test_sync_slow_source(benchmark, export, fresh_db):
+    """Streaming sync: each chunk is read, then written"""
+    summary = benchmark.pedantic(
+        lambda session: sync_csv_stream(session, slow_chunks(export)),
+        setup=lambda: ((fresh_db(),), {}), rounds=3,
+    )
+    assert summary.inserted
+
+@pytest.mark.benchmark(group='slow-source')
+def test_async_slow_source(benchmark, export, fresh_db, tmp_path):
+    """Async sync: the next chunk is read while the current one is written, so it beats the streaming sync"""
+    counter = itertools.count()
+    start = time.perf_counter()
+    sync_csv_stream(fresh_db(), slow_chunks(export))
+    sequential = time.perf_counter() - start
+
+    summary = benchmark.pedantic(
+        lambda: asyncio.run(sync_async(f"sqlite:///{tmp_path / f'async{next(counter)}.db'}", slow_chunks(export))),
+        rounds=3,
+    )
+    assert summary.inserted
+    assert benchmark.stats.stats.median < 0.9 * sequential
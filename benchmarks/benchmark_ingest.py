@@ -0,0 +1,90 @@
+"""
+Ingest benchmarks: syncing an export into a new and an up-to-date database, ID
+generation, parallel parsing of a batch import and company canonicalization
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from job_tracker.app import process_csv
+from job_tracker.batch import parse_range, plan_tasks
+from job_tracker.canonical import canonical_company_keys
+from job_tracker.companies import company_keys
+from job_tracker.ingest import generate_unique_id, generate_unique_ids
+
+# Rows hashed by the scalar ID benchmark; the per-row function is too slow for whole exports
+SCALAR_ID_ROWS = 1000
+
+# Files the export is split into for the batch parse benchmark
+BATCH_FILES = 8
+
+# Worker counts compared by the parallel benchmarks: in-process and one per CPU
+PROCESS_COUNTS = sorted({1, os.cpu_count() or 1})
+
+@pytest.mark.benchmark(group='sync')
+def test_process_csv_cold(benchmark, export, fresh_db):
+    """Sync the whole export into an empty database"""
+    added = benchmark.pedantic(
+        process_csv, setup=lambda: ((export,), {'session': fresh_db()}), rounds=3,
+    )
+    assert added > 0
+
+@pytest.mark.benchmark(group='sync')
+def test_process_csv_resync(benchmark, export, synced_db):
+    """Sync the same export again: every row is compared and none is written"""
+    assert benchmark.pedantic(process_csv, args=(export,), kwargs={'session': synced_db}, rounds=3, warmup_rounds=1) == 0
+
+@pytest.mark.benchmark(group='ids')
+def test_generate_unique_id(benchmark, export):
+    """Scalar ID generation, one row at a time"""
+    rows = [row for _, row in export.head(SCALAR_ID_ROWS).iterrows()]
+    benchmark(lambda: [generate_unique_id(row) for row in rows])
+
+@pytest.mark.benchmark(group='ids')
+@pytest.mark.parametrize('processes', PROCESS_COUNTS)
+def test_generate_unique_ids(benchmark, export, processes):
+    """Batch ID generation over the whole export"""
+    ids = benchmark(generate_unique_ids, export, processes=processes)
+    assert len(ids) == len(export.index)
+
+@pytest.fixture(scope='module')
+def batch_tasks(export, tmp_path_factory):
+    """Parse tasks of the export written as ``BATCH_FILES`` CSV files"""
+    directory = tmp_path_factory.mktemp('batch')
+    part = -(-len(export.index) // BATCH_FILES)
+    paths = []
+    for number in range(BATCH_FILES):
+        path = directory / f'export_{number}.csv'
+        export.iloc[number * part:(number + 1) * part].to_csv(path, index=False)
+        paths.append(str(path))
+    return plan_tasks(paths)
+
+def parse_all(tasks, processes):
+    if processes == 1:
+        return [parse_range(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(parse_range, tasks))
+
+@pytest.mark.benchmark(group='batch')
+@pytest.mark.parametrize('processes', PROCESS_COUNTS)
+def test_parse_batch(benchmark, export, batch_tasks, processes):
+    """Parse and normalize the files of a batch import, in-process or in a worker pool"""
+    parsed = benchmark.pedantic(parse_all, args=(batch_tasks, processes), rounds=3)
+    assert sum(rows for rows, _ in parsed) == len(export.index)
+
+@pytest.mark.benchmark(group='companies')
+def test_company_keys(benchmark, export):
+    """Rule-based company keys (case, punctuation, legal forms)"""
+    assert benchmark(company_keys, export['Company Name']).notna().any()
+
+@pytest.mark.benchmark(group='companies')
+def test_canonical_company_keys(benchmark, export, fresh_db):
+    """Fuzzy canonicalization of every key into an empty alias table"""
+    keys = company_keys(export['Company Name'])
+    canonical = benchmark.pedantic(
+        canonical_company_keys, setup=lambda: ((fresh_db(), keys), {}), rounds=3,
+    )
+    assert canonical.nunique() <= keys.nunique()
@@ -0,0 +1,117 @@
+"""
+Read-path benchmarks: company statistics, search, building the applications
+frames, and the dashboard's reads while another connection keeps writing
+"""
+import itertools
+import threading
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from job_tracker.app import search_applications
+from job_tracker.companies import get_company_table
+from job_tracker.database import create_session_registry, session_scope
+from job_tracker.frames import frame_memory
+from job_tracker.ingest import sync_applications
+from job_tracker.queries import count_applications, get_company_stats, load_applications_frame, load_applications_page
+from job_tracker.search import build_inverted_index, parse_query, search_application_ids
+from job_tracker.snapshot import load_snapshot_frame, refresh_snapshot, snapshot_path
+
+# Search box texts used by the search benchmarks: a common word, a prefix, a phrase and a company word
+SEARCH_TEXTS = ['engineer', 'software eng', '"software engineer"', 'capital']
+
+# Rows the background writer syncs per transaction in the concurrency benchmark
+WRITER_CHUNK_ROWS = 500
+
+@pytest.fixture(scope='module')
+def frame(synced_db):
+    """Every application as a display frame"""
+    return load_applications_frame(synced_db)
+
+@pytest.mark.benchmark(group='stats')
+def test_get_company_stats(benchmark, synced_db):
+    """Aggregate applications per company in the database"""
+    assert not benchmark(get_company_stats, synced_db).empty
+
+@pytest.mark.benchmark(group='stats')
+def test_get_company_table(benchmark, synced_db):
+    """Read the materialized company table"""
+    assert not benchmark(get_company_table, synced_db).empty
+
+@pytest.mark.benchmark(group='search')
+@pytest.mark.parametrize('query', SEARCH_TEXTS)
+def test_search_applications(benchmark, frame, query):
+    """Substring search over an in-memory frame"""
+    benchmark(search_applications, frame, query)
+
+@pytest.mark.benchmark(group='search')
+@pytest.mark.parametrize('query', SEARCH_TEXTS)
+def test_search_application_ids(benchmark, synced_db, query):
+    """Ranked search in the database (FTS5)"""
+    benchmark(search_application_ids, synced_db, query, limit=1000)
+
+@pytest.mark.benchmark(group='search')
+@pytest.mark.parametrize('query', SEARCH_TEXTS)
+def test_inverted_index_search(benchmark, synced_db, query):
+    """Ranked search in the in-memory index used without FTS5"""
+    index = build_inverted_index(synced_db)
+    benchmark(index.search, parse_query(query), limit=1000)
+
+@pytest.mark.benchmark(group='frames')
+def test_load_applications_frame(benchmark, synced_db, export):
+    """Build the frame of every application from a Core select"""
+    loaded = benchmark(load_applications_frame, synced_db)
+    assert len(loaded.index) <= len(export.index)
+    benchmark.extra_info['frame_mb'] = round(frame_memory(loaded) / 2**20, 2)
+
+@pytest.mark.benchmark(group='frames')
+def test_load_snapshot_frame(benchmark, synced_db, frame):
+    """Load the frame of every application from the up-to-date memory-mapped snapshot"""
+    path = snapshot_path(synced_db.get_bind())
+    refresh_snapshot(synced_db, path)
+    loaded = benchmark(load_snapshot_frame, synced_db, path)
+    assert len(loaded.index) == len(frame.index)
+    benchmark.extra_info['frame_mb'] = round(frame_memory(loaded) / 2**20, 2)
+
+@pytest.mark.benchmark(group='frames')
+def test_load_applications_page(benchmark, synced_db):
+    """Build one page of the applications table"""
+    page, _ = benchmark(load_applications_page, synced_db)
+    assert not page.empty
+
+@pytest.fixture
+def busy_db(export, fresh_db):
+    """Session registry on a database that another thread keeps writing new applications to"""
+    Session = create_session_registry(fresh_db().get_bind())
+    stop = threading.Event()
+    writes = []
+
+    def write():
+        chunk = export.head(WRITER_CHUNK_ROWS)
+        for copy in itertools.count():
+            if stop.is_set():
+                break
+            batch = chunk.assign(**{'Job URL': chunk['Job URL'].fillna('https://example.com/job') + f'#writer-{copy}'})
+            with session_scope(Session) as session:
+                sync_applications(session, batch)
+            writes.append(copy)
+        Session.remove()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    yield Session
+    stop.set()
+    writer.join()
+    assert writes  # The reads overlapped with committed writes
+
+@pytest.mark.benchmark(group='concurrency')
+def test_reads_while_writing(benchmark, busy_db):
+    """The dashboard's count and company stats while a sync commits in another thread (WAL keeps readers unblocked)"""
+    def read():
+        with session_scope(busy_db) as session:
+            count_applications(session)
+            return get_company_stats(session)
+
+    benchmark.pedantic(read, rounds=20, warmup_rounds=2)
+    busy_db.remove()
@@ -0,0 +1,54 @@
+"""
+Fixtures for the pytest-benchmark suite (``invoke bench``)
+
+The suite lives in ``benchmark_*.py`` files so the default test run never
+collects it; run it with ``invoke bench`` or
+``python -m pytest benchmarks -o python_files='benchmark_*.py'``. The
+exports come from ``BENCH_ROWS``, comma separated: synthetic row counts (e.g.
+``1000,100000,1000000``) and ``sample``, the shipped export repeated
+``SAMPLE_COPIES`` times.
+"""
+import itertools
+import os
+
+import pytest
+
+from job_tracker.ingest import sync_applications
+from job_tracker.models import init_db
+from synthetic import read_export, sample_export, synthetic_export
+
+# Copies of the shipped export in the "sample" export (323 rows each)
+SAMPLE_COPIES = 1000
+
+# Exports each benchmark runs at: synthetic row counts, or "sample"
+BENCH_ROWS = [rows if rows == 'sample' else int(rows) for rows in os.environ.get('BENCH_ROWS', '10000').split(',')]
+
+@pytest.fixture(scope='session', params=BENCH_ROWS,
+                ids=lambda rows: f'sample-x{SAMPLE_COPIES}' if rows == 'sample' else f'{rows}rows')
+def export(request):
+    """A seeded synthetic export, or the scaled shipped export, as ``pd.read_csv`` returns it"""
+    if request.param == 'sample':
+        return sample_export(SAMPLE_COPIES)
+    return read_export(synthetic_export(request.param))
+
+@pytest.fixture(scope='session')
+def synced_db(export, tmp_path_factory):
+    """A SQLite file database holding the export"""
+    session = init_db(f"sqlite:///{tmp_path_factory.mktemp('synced') / 'bench.db'}")
+    sync_applications(session, export)
+    session.commit()
+    yield session
+    session.close()
+
+@pytest.fixture
+def fresh_db(tmp_path):
+    """Factory of empty SQLite file databases, one per benchmark round"""
+    counter = itertools.count()
+    sessions = []
+
+    def create():
+        sessions.append(init_db(f"sqlite:///{tmp_path / f'round{next(counter)}.db'}"))
+        return sessions[-1]
+    yield create
+    for session in sessions:
+        session.close()
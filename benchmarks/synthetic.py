@@ -0,0 +1,191 @@
+"""
+Seeded synthetic Simplify exports for benchmarks
+
+Modeled on ``Simplify_Tracked_Jobs_2025-03-31.csv``: a few employers account
+for many applications and most appear once or twice (Zipf-distributed, with
+suffix and case variants of the same name), job titles repeat heavily, about
+half the rows have no job URL (written as "N/A"), saved jobs have no applied
+date, and a small share of rows are reposts, exact copies of an earlier row.
+The same ``rows`` and ``seed`` always produce the same export.
+``sample_export`` instead repeats the shipped export itself, for checking
+against real data.
+
+Usage:
+    python benchmarks/synthetic.py --rows 100000 --output export.csv
+"""
+import argparse
+import io
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# The real export shipped with the repository
+SAMPLE_CSV = Path(__file__).resolve().parent.parent / 'Simplify_Tracked_Jobs_2025-03-31.csv'
+
+# Export columns in the order Simplify writes them
+COLUMNS = [
+    'Job Title', 'Company Name', 'Job URL', 'Applied Date', 'Status',
+    'Status Date', 'Archived', 'Date Archived', 'Notes',
+]
+
+# Status mix of the sample export, plus the later stages a longer search reaches
+STATUS_WEIGHTS = {
+    'APPLIED': 0.80,
+    'REJECTED': 0.11,
+    'SAVED': 0.04,
+    'SCREEN': 0.02,
+    'INTERVIEW': 0.02,
+    'OFFER': 0.01,
+}
+
+# Most common titles of the sample export, most frequent first
+JOB_TITLES = [
+    'Software Engineer', 'SWE', 'Software Engineer II', 'Senior Software Engineer', 'SDET',
+    'Software Engineer in Test', 'Backend Software Engineer', 'Sr. Software QA Engineer',
+    'Full Stack Engineer', 'Full Stack Software Engineer', 'Data Engineer', 'Platform Engineer',
+    'Site Reliability Engineer', 'Machine Learning Engineer', 'Frontend Engineer',
+]
+
+# Applicant tracking systems hosting the job URLs, by share of the sample's URLs
+ATS_HOSTS = {
+    'job-boards.greenhouse.io': 0.55,
+    'jobs.lever.co': 0.15,
+    'jobs.ashbyhq.com': 0.10,
+    'careers.icims.com': 0.08,
+    'wd1.myworkdayjobs.com': 0.07,
+    'jobs.jobvite.com': 0.05,
+}
+
+# Spellings of the same employer seen in exports, most common first
+COMPANY_SUFFIXES = ['', '', '', '', ' Inc', ', Inc.', ' LLC', ' Corp', '-Corporate Office', ' Careers']
+
+# Applied dates span the sample's range
+FIRST_DAY = pd.Timestamp('2023-09-25')
+LAST_DAY = pd.Timestamp('2025-03-31')
+
+# Share of rows without a job URL, archived, with notes, and exact reposts
+MISSING_URL_RATE = 0.48
+ARCHIVED_RATE = 0.03
+NOTES_RATE = 0.05
+DUPLICATE_RATE = 0.02
+
+# Company names are two pseudo-words built from these syllables
+SYLLABLES = ['ac', 'al', 'an', 'ar', 'bo', 'ca', 'de', 'el', 'en', 'ex', 'fi', 'ga', 'io', 'ka', 'lo',
+             'ma', 'ne', 'no', 'or', 'pa', 'qu', 'ra', 're', 'sa', 'ta', 'te', 'tr', 'un', 'vi', 'xo']
+
+def _choice(rng, options, size):
+    """Draw ``size`` values from a {value: weight} dict or a list (uniformly)"""
+    if isinstance(options, dict):
+        weights = np.array(list(options.values()), dtype=float)
+        return rng.choice(np.array(list(options), dtype=object), size=size, p=weights / weights.sum())
+    return rng.choice(np.array(options, dtype=object), size=size)
+
+def company_pool(companies, rng):
+    """``companies`` distinct employer names"""
+    words = np.array([a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES], dtype=object)
+    first = rng.choice(words, size=companies)
+    second = rng.choice(np.array(['Systems', 'Capital', 'Labs', 'Technologies', 'Health', 'Bank', 'Group',
+                                  'Software', 'Partners', 'Networks', 'Energy', 'Analytics'], dtype=object), size=companies)
+    names = pd.Series(first).str.capitalize() + ' ' + pd.Series(second)
+    # Collisions of the random words get a numeric suffix so every employer is distinct
+    repeat = names.groupby(names).cumcount()
+    return np.where(repeat > 0, names + ' ' + repeat.astype(str), names).astype(object)
+
+def synthetic_export(rows, seed=0):
+    """Raw export rows, as strings the way Simplify writes them
+
+    Args:
+        rows: Number of rows, reposts included
+        seed: Random seed; equal seeds give equal exports
+
+    Returns:
+        DataFrame with the export ``COLUMNS``; missing values are "N/A" (or
+        empty for notes) like in the real file, so pass it through
+        ``read_export`` to get what ``pd.read_csv`` would return
+    """
+    rng = np.random.default_rng(seed)
+    companies = max(10, int(rows ** 0.9))  # 323 rows -> 180 employers; grows sublinearly
+    pool = company_pool(companies, rng)
+    ranks = np.arange(1, companies + 1)
+    weights = 1.0 / ranks ** 1.1
+    company = pool[rng.choice(companies, size=rows, p=weights / weights.sum())]
+    suffix = _choice(rng, COMPANY_SUFFIXES, rows)
+    shout = rng.random(rows) < 0.05
+    company_name = pd.Series(company + suffix)
+    company_name[shout] = company_name[shout].str.upper()
+
+    title_weights = {title: 1.0 / rank for rank, title in enumerate(JOB_TITLES, start=1)}
+    status = _choice(rng, STATUS_WEIGHTS, rows)
+
+    span_days = (LAST_DAY - FIRST_DAY).days
+    # Skewed toward the recent end, like an active search
+    applied = FIRST_DAY + pd.to_timedelta((span_days * rng.beta(3, 1.2, size=rows)).astype(int), unit='D')
+    waited = np.where(np.isin(status, ['APPLIED', 'SAVED']), 0, rng.exponential(20, size=rows).astype(int))
+    status_date = applied + pd.to_timedelta(waited, unit='D')
+    saved = status == 'SAVED'
+
+    job_number = rng.integers(1_000_000, 9_999_999, size=rows).astype(str).astype(object)
+    url = 'https://' + _choice(rng, ATS_HOSTS, rows) + '/' + pd.Series(company).str.lower().str.replace(' ', '', regex=False) + '/jobs/' + job_number
+    url[rng.random(rows) < MISSING_URL_RATE] = 'N/A'
+
+    archived = rng.random(rows) < ARCHIVED_RATE
+    date_archived = (status_date + pd.to_timedelta(rng.integers(0, 30, size=rows), unit='D')).strftime('%Y-%m-%d').to_numpy(dtype=object)
+    date_archived[~archived] = 'N/A'
+    notes = np.full(rows, '', dtype=object)
+    with_notes = rng.random(rows) < NOTES_RATE
+    notes[with_notes] = _choice(rng, ['Referral', 'Recruiter reached out', 'Follow up next week', 'Take-home sent'], int(with_notes.sum()))
+
+    applied_text = applied.strftime('%Y-%m-%d').to_numpy(dtype=object)
+    applied_text[saved] = 'N/A'
+    export = pd.DataFrame({
+        'Job Title': _choice(rng, title_weights, rows),
+        'Company Name': company_name.to_numpy(dtype=object),
+        'Job URL': url.to_numpy(dtype=object),
+        'Applied Date': applied_text,
+        'Status': status,
+        'Status Date': status_date.strftime('%Y-%m-%d').to_numpy(dtype=object),
+        'Archived': np.where(archived, 'Yes', 'No').astype(object),
+        'Date Archived': date_archived,
+        'Notes': notes,
+    }, columns=COLUMNS)
+
+    # Reposts: exact copies of an earlier row
+    reposts = np.flatnonzero(rng.random(rows) < DUPLICATE_RATE)
+    reposts = reposts[reposts > 0]
+    if len(reposts):
+        originals = (rng.random(len(reposts)) * reposts).astype(int)
+        export.iloc[reposts] = export.iloc[originals].to_numpy()
+    return export
+
+def read_export(export):
+    """Round-trip an export through CSV, returning what ``pd.read_csv`` gives the app for the real file"""
+    buffer = io.StringIO()
+    export.to_csv(buffer, index=False)
+    buffer.seek(0)
+    return pd.read_csv(buffer)
+
+def sample_export(copies):
+    """The shipped export repeated ``copies`` times, as ``pd.read_csv`` returns it
+
+    Each copy's job URLs get a ``#copy-<n>`` suffix (rows without a URL get
+    a placeholder first), so every copy is a distinct set of applications.
+    """
+    base = pd.read_csv(SAMPLE_CSV)
+    export = pd.concat([base] * copies, ignore_index=True)
+    copy = pd.Series(export.index // len(base.index), index=export.index).astype(str)
+    export['Job URL'] = export['Job URL'].fillna('https://example.com/job') + '#copy-' + copy
+    return export
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="synthetic_export.csv")
+    args = parser.parse_args()
+
+    synthetic_export(args.rows, args.seed).to_csv(args.output, index=False)
+    print(f"wrote {args.rows:,} rows to {args.output}")
+
+if __name__ == "__main__":
+    main()
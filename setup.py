@@ -6,9 +6,20 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     install_requires=[
+        "click",
         "pandas",
         "streamlit",
         "sqlalchemy",
     ],
+    extras_require={
+        "async": ["aiosqlite", "greenlet"],
+        "snapshot": ["pyarrow"],
+        "parquet": ["pyarrow"],
+    },
+    entry_points={
+        "console_scripts": [
+            "job-tracker=job_tracker.cli:main",
+        ],
+    },
     python_requires=">=3.10",
 ) 
\ No newline at end of file
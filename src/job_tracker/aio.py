@@ -0,0 +1,165 @@
+"""
+Async counterparts of the ingest and query layer
+
+Built on SQLAlchemy's AsyncEngine/AsyncSession; requires an async driver
+(``aiosqlite`` for SQLite, ``asyncpg`` for PostgreSQL).
+"""
+import asyncio
+import os
+
+import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from job_tracker.cache import data_cache
+from job_tracker.database import (
+    BUSY_TIMEOUT_MS,
+    DEFAULT_DB_URL,
+    MAX_OVERFLOW,
+    POOL_SIZE,
+    POOL_TIMEOUT,
+    configure_sqlite,
+    is_memory_sqlite,
+)
+from job_tracker.ingest import STREAM_CHUNK_SIZE, SyncSummary, normalize_simplify_frame, sync_frame
+from job_tracker.migrations import migrate_connection
+from job_tracker.models import Base
+from job_tracker.queries import (
+    DEFAULT_PAGE_SIZE,
+    company_stats_frame,
+    company_stats_query,
+    count_applications,
+    load_applications_page,
+)
+from job_tracker.search import search_application_ids
+
+# Async driver used for each synchronous database URL scheme
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+def async_url(db_url):
+    """Rewrite a database URL to use the async driver for its backend"""
+    url = make_url(db_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+def create_async_db_engine(
+    db_url=DEFAULT_DB_URL,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    busy_timeout=BUSY_TIMEOUT_MS,
+):
+    """Create an AsyncEngine configured like ``create_db_engine``
+
+    Args:
+        db_url: Database URL, with or without an async driver
+        pool_size: Connections kept open in the pool
+        max_overflow: Extra connections opened when the pool is exhausted
+        pool_timeout: Seconds to wait for a connection from a full pool
+        busy_timeout: Milliseconds SQLite waits on a locked database
+
+    Returns:
+        SQLAlchemy AsyncEngine
+    """
+    url = async_url(db_url)
+    if is_memory_sqlite(url):
+        return create_async_engine(url)
+
+    engine = create_async_engine(url, pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout)
+    if url.get_backend_name() == 'sqlite':
+        event.listen(engine.sync_engine, 'connect', configure_sqlite(busy_timeout))
+    return engine
+
+async def init_async_engine(db_url=DEFAULT_DB_URL, **pool_options):
+    """Create an AsyncEngine and bring the schema up to date"""
+    engine = create_async_db_engine(db_url, **pool_options)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.run_sync(migrate_connection)
+    return engine
+
+def create_async_session_factory(engine):
+    """Session factory for an AsyncEngine; use one session per request or task"""
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+def _frame_chunks(source, chunksize):
+    """Iterate the raw DataFrame chunks of a CSV path, file object, DataFrame or iterable of DataFrames"""
+    if isinstance(source, pd.DataFrame):
+        return (source.iloc[start:start + chunksize] for start in range(0, len(source.index), chunksize))
+    if isinstance(source, (str, os.PathLike)) or hasattr(source, 'read'):
+        return pd.read_csv(source, chunksize=chunksize)
+    return iter(source)
+
+def _parse_next(chunks):
+    """Read and normalize the next chunk, or return None when the source is exhausted"""
+    chunk = next(chunks, None)
+    return None if chunk is None else normalize_simplify_frame(chunk)
+
+async def process_csv_async(session, source, chunksize=STREAM_CHUNK_SIZE, progress=None):
+    """Sync an export without blocking the event loop on parsing or database I/O
+
+    Chunks are read and normalized in a worker thread. While one chunk is
+    written and committed, the next one is already being parsed, so reading
+    the file and writing the database overlap instead of alternating. Each
+    chunk is synced exactly like ``sync_frame`` and committed on its own.
+
+    Args:
+        session: AsyncSession
+        source: CSV path, binary/text file object, DataFrame, or an iterable of DataFrames
+        chunksize: Rows per chunk
+        progress: Optional callback ``progress(rows_processed)``
+
+    Returns:
+        SyncSummary of the inserted, updated and unchanged applications
+    """
+    chunks = _frame_chunks(source, chunksize)
+    summary = SyncSummary()
+    pending = asyncio.create_task(asyncio.to_thread(_parse_next, chunks))
+    try:
+        while True:
+            frame = await pending
+            if frame is None:
+                break
+            # Start parsing the next chunk before writing this one
+            pending = asyncio.create_task(asyncio.to_thread(_parse_next, chunks))
+
+            try:
+                chunk_summary = await session.run_sync(sync_frame, frame)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                raise e
+
+            if chunk_summary.changed:
+                data_cache.bump()
+            summary.merge(chunk_summary)
+            if progress is not None:
+                progress(summary.rows)
+    finally:
+        # The parser thread cannot be cancelled; let it finish before the source is released
+        await asyncio.wait([pending])
+        if not pending.cancelled():
+            pending.exception()  # A parse error behind a failed write is not reported twice
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    return summary
+
+async def get_company_stats_async(session, search=None):
+    """Async ``get_company_stats``"""
+    result = await session.execute(company_stats_query(search))
+    return company_stats_frame(result.all())
+
+async def search_application_ids_async(session, query, limit=None):
+    """Async ``search_application_ids``"""
+    return await session.run_sync(search_application_ids, query, limit)
+
+async def count_applications_async(session):
+    """Async ``count_applications``"""
+    return await session.run_sync(count_applications)
+
+async def load_applications_page_async(session, columns=None, page_size=DEFAULT_PAGE_SIZE, after=None):
+    """Async ``load_applications_page``"""
+    return await session.run_sync(load_applications_page, columns, page_size, after)
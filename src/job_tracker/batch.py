@@ -0,0 +1,171 @@
+"""
+Batch import of many exports, or one very large export, across processes
+"""
+import glob
+import io
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from job_tracker.cache import data_cache
+from job_tracker.ingest import SyncSummary, normalize_simplify_frame, sync_frame
+
+# Files larger than this are split into byte ranges of about this size
+SPLIT_BYTES = 64 * 1024 * 1024
+
+# Bytes counted per slice while tracking quote parity through a file
+SCAN_BLOCK_SIZE = 16 * 1024 * 1024
+
+def expand_paths(patterns):
+    """Expand glob patterns and directories into a sorted, de-duplicated list of CSV paths"""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '*.csv'))
+        else:
+            matches = glob.glob(pattern) or [pattern]
+        paths.extend(sorted(matches))
+    return list(dict.fromkeys(paths))
+
+def _count_quotes(data, start, end):
+    """Number of double quotes in ``data[start:end]``, counted in bounded slices"""
+    quotes = 0
+    for block_start in range(start, end, SCAN_BLOCK_SIZE):
+        quotes += data[block_start:min(block_start + SCAN_BLOCK_SIZE, end)].count(b'"')
+    return quotes
+
+def _record_end(data, position, quotes):
+    """First position at or after ``position`` that ends a CSV record
+
+    A line break only ends a record when the number of quotes before it is
+    even; otherwise it is inside a quoted field.
+
+    Args:
+        data: bytes-like file contents (e.g. an mmap)
+        position: Offset to search from
+        quotes: Number of quotes in ``data[:position]``
+
+    Returns:
+        ``(offset, quotes)`` just past the record's line break (the file size
+        when the last record has none), and the quote count up to it
+    """
+    while True:
+        newline = data.find(b'\n', position)
+        if newline == -1:
+            return len(data), quotes + _count_quotes(data, position, len(data))
+        quotes += data[position:newline].count(b'"')
+        position = newline + 1
+        if quotes % 2 == 0:
+            return position, quotes
+
+def split_byte_ranges(path, target_size=SPLIT_BYTES):
+    """Split a CSV file into byte ranges of whole records
+
+    Args:
+        path: CSV file path
+        target_size: Approximate size of each range in bytes
+
+    Returns:
+        ``(header, ranges)``: the header line bytes and a list of
+        ``(start, end)`` offsets covering every record after the header
+    """
+    with open(path, 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return b'', []
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header_end, quotes = _record_end(data, 0, 0)
+            header = data[:header_end]
+
+            ranges = []
+            start = header_end
+            while start < len(data):
+                target = min(start + target_size, len(data))
+                quotes += _count_quotes(data, start, target)
+                end, quotes = _record_end(data, target, quotes) if target < len(data) else (target, quotes)
+                ranges.append((start, end))
+                start = end
+            return header, ranges
+
+def frame_to_arrays(frame):
+    """Column arrays of a normalized frame: datetime64, bool and string arrays that pickle compactly"""
+    return {column: frame[column].to_numpy() for column in frame.columns}
+
+def parse_range(task):
+    """Worker: parse and normalize one byte range of an export
+
+    Args:
+        task: ``(path, header, start, end)``
+
+    Returns:
+        ``(rows, arrays)``: rows parsed and the normalized column arrays
+    """
+    path, header, start, end = task
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        body = handle.read(end - start)
+    if header and not header.endswith(b'\n'):
+        header += b'\n'
+    df = pd.read_csv(io.BytesIO(header + body))
+    return len(df.index), frame_to_arrays(normalize_simplify_frame(df))
+
+def plan_tasks(paths, split_bytes=SPLIT_BYTES):
+    """Parse tasks for a batch: one per file, or several byte ranges for large files"""
+    tasks = []
+    for path in paths:
+        header, ranges = split_byte_ranges(path, split_bytes)
+        tasks.extend((path, header, start, end) for start, end in ranges)
+    return tasks
+
+def import_files(session, paths, processes=None, split_bytes=SPLIT_BYTES, progress=None):
+    """Import several exports at once, parsing them in parallel
+
+    Files (and byte-range splits of files larger than ``split_bytes``) are
+    parsed and normalized in a ProcessPoolExecutor. This process is the only
+    writer: it merges the workers' column arrays in file order, keeps the
+    first row of each simplify_id, and syncs the result in one transaction.
+
+    Args:
+        session: SQLAlchemy session
+        paths: CSV paths, directories or glob patterns
+        processes: Worker processes (defaults to every CPU; 1 parses in-process)
+        split_bytes: Approximate size of the byte ranges large files are split into
+        progress: Optional callback ``progress(tasks_done, tasks_total)``
+
+    Returns:
+        SyncSummary of the inserted, updated and unchanged applications
+    """
+    tasks = plan_tasks(expand_paths(paths), split_bytes)
+    processes = processes or os.cpu_count() or 1
+
+    results = []
+    if processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(tasks))) as executor:
+            for result in executor.map(parse_range, tasks):
+                results.append(result)
+                if progress is not None:
+                    progress(len(results), len(tasks))
+    else:
+        for task in tasks:
+            results.append(parse_range(task))
+            if progress is not None:
+                progress(len(results), len(tasks))
+
+    rows = sum(count for count, _ in results)
+    frames = [pd.DataFrame(arrays) for count, arrays in results if count]
+    try:
+        if frames:
+            frame = pd.concat(frames, ignore_index=True)
+            summary = sync_frame(session, frame[~frame['simplify_id'].duplicated()])
+        else:
+            summary = SyncSummary()
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise e
+
+    if summary.changed:
+        data_cache.bump()
+    summary.rows = rows
+    return summary
@@ -0,0 +1,88 @@
+"""
+In-process cache for data derived from the database
+"""
+import threading
+from collections import OrderedDict
+
+class DataCache:
+    """LRU cache whose entries are tied to a data version counter
+
+    Every write path (sync, edits, preference changes) calls ``bump()``, which
+    increments the version and drops all entries; until then, Streamlit reruns
+    reuse the cached frames without touching the database. The counter lives
+    in this process, so writes made by other processes (the command line, a
+    batch import, a second dashboard) are caught by ``observe``: each rerun
+    passes it a cheap fingerprint read from the database, and a changed
+    fingerprint bumps the version too. Cached values are shared between
+    reruns and sessions and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._token = None  # Database fingerprint last passed to observe()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` on a miss
+
+        Args:
+            key: Hashable key, e.g. ``('company_stats', search)``
+            compute: Zero-argument callable producing the value
+        """
+        with self._lock:
+            version_key = (self.version, key)
+            if version_key in self._entries:
+                self._entries.move_to_end(version_key)
+                self.hits += 1
+                return self._entries[version_key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            # Skip storing if a write bumped the version while computing
+            if version_key[0] == self.version:
+                self._entries[version_key] = value
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def bump(self):
+        """Record that the underlying data changed, invalidating every entry"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def observe(self, token):
+        """Bump if the database changed since the last call, e.g. by another process
+
+        Args:
+            token: Fingerprint of the data compared by equality, such as
+                ``snapshot.table_version``; the first token seen is only recorded
+
+        Returns:
+            Whether the version was bumped
+        """
+        with self._lock:
+            previous, self._token = self._token, token
+        if previous is None or previous == token:
+            return False
+        self.bump()
+        return True
+
+    def stats(self):
+        """Hit/miss counters for verifying that reruns are served from cache"""
+        with self._lock:
+            return {
+                'version': self.version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+            }
+
+# Shared by the Streamlit app and the ingest path
+data_cache = DataCache()
@@ -0,0 +1,334 @@
+"""
+Fuzzy canonicalization of company keys
+
+``company_keys`` folds spelling differences that follow rules (case,
+punctuation, legal forms). This module merges the rest, e.g. typos or
+"Capital One Financial" next to "Capital One Finacial", by mapping each
+key to a canonical key of a similar enough company already seen.
+
+Candidates come from MinHash signatures of character n-grams, split into
+LSH bands: two keys are compared only when one band of their signatures
+collides, so matching a key costs a few bucket lookups instead of a pass
+over every known company. Candidates are then verified with the exact
+n-gram Jaccard similarity, and must also agree on the first word (up to one
+typo, never in its first letter) and on their digits: "Bell Technologies"
+and "Dell Technologies", or "Acme Labs 2" and "Acme Labs", share most
+n-grams but are different employers. Decisions are persisted in ``company_aliases``
+and served from an LRU cache in front of that table. Decisions made in a
+transaction only reach the shared cache and index when it commits, so a
+rolled-back sync leaves no mapping behind whose alias row is gone.
+"""
+import re
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+from sqlalchemy import event, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from job_tracker.models import CompanyAlias
+
+# Character n-gram length used for similarity
+SHINGLE_SIZE = 3
+
+# MinHash signature length, split into LSH bands of equal width
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+# Minimum n-gram Jaccard similarity for two keys to be the same company
+SIMILARITY_THRESHOLD = 0.75
+
+# Keys whose canonical key is kept in memory per database
+ALIAS_CACHE_SIZE = 100_000
+
+# Keep IN (...) lists well under SQLite's bound parameter limit
+ALIAS_LOOKUP_CHUNK_SIZE = 500
+
+# Mersenne prime for the universal hash family; coefficients stay below it so products fit in uint64
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Fixed seed: signatures must agree between processes and runs
+_rng = np.random.default_rng(20250331)
+HASH_A = _rng.integers(1, MERSENNE_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+HASH_B = _rng.integers(0, MERSENNE_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+def shingles(key):
+    """Hashed character n-grams of a key without its spaces, padded so short keys still have several"""
+    padded = f" {key.replace(' ', '')} "  # Spacing differences ("jp morgan") do not count
+    grams = {padded[i:i + SHINGLE_SIZE] for i in range(max(len(padded) - SHINGLE_SIZE + 1, 1))}
+    return frozenset(zlib.crc32(gram.encode()) for gram in grams)
+
+def minhash_signatures(shingle_sets):
+    """MinHash signatures of several shingle sets at once
+
+    All shingles are hashed by every permutation in one array operation and
+    reduced per set with ``np.minimum.reduceat``.
+
+    Returns:
+        uint64 array of shape ``(len(shingle_sets), MINHASH_PERMUTATIONS)``
+    """
+    if not shingle_sets:
+        return np.empty((0, MINHASH_PERMUTATIONS), dtype=np.uint64)
+    lengths = np.fromiter((len(shingle_set) for shingle_set in shingle_sets), dtype=np.int64, count=len(shingle_sets))
+    values = np.fromiter(
+        (value for shingle_set in shingle_sets for value in shingle_set), dtype=np.uint64, count=int(lengths.sum())
+    ) % np.uint64(MERSENNE_PRIME)
+    hashed = (HASH_A[:, None] * values[None, :] + HASH_B[:, None]) % np.uint64(MERSENNE_PRIME)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    return np.minimum.reduceat(hashed, starts, axis=1).T
+
+def band_hashes(signatures):
+    """One hash per LSH band of each signature (rows of ``MINHASH_PERMUTATIONS // LSH_BANDS`` values)
+
+    Returns:
+        List with one list of ``LSH_BANDS`` ints per signature
+    """
+    width = MINHASH_PERMUTATIONS // LSH_BANDS
+    bands = np.asarray(signatures, dtype=np.uint64).reshape(-1, LSH_BANDS, width)
+    # Polynomial combination of the band's values; uint64 arithmetic wraps around
+    weights = np.uint64(MERSENNE_PRIME) ** np.arange(width, dtype=np.uint64)
+    return (bands * weights).sum(axis=2, dtype=np.uint64).tolist()
+
+def _add_to_index(buckets, shingle_map, keys, shingle_sets, bands):
+    """Add canonical keys to LSH buckets (one dict per band) and their shingles to ``shingle_map``"""
+    for key, shingle_set, key_bands in zip(keys, shingle_sets, bands):
+        shingle_map[key] = shingle_set
+        for band_buckets, band in zip(buckets, key_bands):
+            band_buckets.setdefault(band, []).append(key)
+
+def jaccard(left, right):
+    """Jaccard similarity of two shingle sets"""
+    return len(left & right) / len(left | right) if left or right else 1.0
+
+def _within_one_edit(left, right):
+    """Whether two strings differ by at most one insertion, deletion or substitution"""
+    if abs(len(left) - len(right)) > 1:
+        return False
+    if len(left) > len(right):
+        left, right = right, left
+    for i, (a, b) in enumerate(zip(left, right)):
+        if a != b:
+            # Substitution when the lengths match, otherwise the longer one has an extra character here
+            return left[i + 1:] == right[i + 1:] if len(left) == len(right) else left[i:] == right[i + 1:]
+    return True
+
+def same_name_shape(left, right):
+    """Whether two keys may name the same company despite a high n-gram similarity
+
+    The first words must be equal, one typo apart with the same first letter,
+    or differ only in spacing ("jp morgan" and "jpmorgan"); any digits must be
+    identical.
+    """
+    if re.sub(r'\D', '', left) != re.sub(r'\D', '', right):
+        return False
+    first_left, first_right = left.split(' ', 1)[0], right.split(' ', 1)[0]
+    if first_left == first_right:
+        return True
+    if first_left[:1] == first_right[:1] and _within_one_edit(first_left, first_right):
+        return True
+    compact_left, compact_right = left.replace(' ', ''), right.replace(' ', '')
+    return compact_left.startswith(first_right) and compact_right.startswith(first_left)
+
+class _PendingDecisions:
+    """Mappings and new canonical keys decided in a transaction that has not committed yet"""
+
+    def __init__(self):
+        self.resolved = {}  # Key -> canonical key
+        self.buckets = [{} for _ in range(LSH_BANDS)]
+        self.shingles = {}
+        self.new_keys = []  # (canonical key, shingle set, band hashes), in order of creation
+
+class CompanyMatcher:
+    """Maps company keys to canonical keys for one database
+
+    Holds an LSH index of the canonical keys (loaded from
+    ``company_aliases`` on first use) and an LRU cache of resolved keys.
+    Keys resolved inside a transaction are staged per connection and merged
+    into both when that connection commits; a rollback discards them.
+    Thread-safe; Streamlit reruns and sync threads share one matcher.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, cache_size=ALIAS_CACHE_SIZE):
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self.comparisons = 0  # Candidate pairs verified, for checking that blocking works
+        self._cache = OrderedDict()
+        self._buckets = [{} for _ in range(LSH_BANDS)]  # Per band: band hash -> canonical keys
+        self._shingles = {}
+        self._loaded = False
+        self._pending = weakref.WeakKeyDictionary()  # Connection -> _PendingDecisions
+        self._listening = weakref.WeakSet()  # Connections with commit/rollback listeners
+        self._lock = threading.Lock()
+
+    def _remember(self, key, canonical):
+        self._cache[key] = canonical
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _index(self, keys, shingle_sets, bands):
+        _add_to_index(self._buckets, self._shingles, keys, shingle_sets, bands)
+
+    def _pending_for(self, executor):
+        """Staged decisions of the transaction ``executor`` is in, listening for its end"""
+        connection = executor.connection() if hasattr(executor, 'get_bind') else executor
+        pending = self._pending.get(connection)
+        if pending is None:
+            pending = self._pending[connection] = _PendingDecisions()
+            if connection not in self._listening:
+                event.listen(connection, 'commit', self._committed)
+                event.listen(connection, 'rollback', self._rolled_back)
+                self._listening.add(connection)
+        return pending
+
+    def _committed(self, connection):
+        """Merge the committed transaction's decisions into the shared cache and index"""
+        with self._lock:
+            pending = self._pending.pop(connection, None)
+            if pending is None:
+                return
+            for key, canonical in pending.resolved.items():
+                self._remember(key, canonical)
+            if pending.new_keys:
+                self._index(*zip(*pending.new_keys))
+
+    def _rolled_back(self, connection):
+        """Forget the decisions of a rolled-back transaction; their alias rows are gone"""
+        with self._lock:
+            self._pending.pop(connection, None)
+
+    def _load(self, executor):
+        """Index the canonical keys already stored"""
+        canonical = sorted(executor.execute(select(CompanyAlias.canonical_key).distinct()).scalars())
+        shingle_sets = [shingles(key) for key in canonical]
+        self._index(canonical, shingle_sets, band_hashes(minhash_signatures(shingle_sets)))
+        self._loaded = True
+
+    def _match(self, key, shingle_set, key_bands, pending):
+        """Most similar canonical key (committed or staged) at or above the threshold, or None"""
+        candidates = {
+            candidate
+            for buckets in (self._buckets, pending.buckets)
+            for band_buckets, band in zip(buckets, key_bands)
+            for candidate in band_buckets.get(band, ())
+        }
+        best, best_similarity = None, self.threshold
+        for candidate in sorted(candidates):
+            self.comparisons += 1
+            candidate_shingles = self._shingles.get(candidate) or pending.shingles[candidate]
+            similarity = jaccard(shingle_set, candidate_shingles)
+            if similarity >= best_similarity and same_name_shape(key, candidate):
+                best, best_similarity = candidate, similarity
+        return best
+
+    def canonicalize(self, executor, keys):
+        """Canonical key of each key, matching and persisting keys never seen before
+
+        Resolution order: decisions staged by this transaction, LRU cache,
+        stored aliases, then LSH candidates. A key without a match becomes
+        canonical itself, so later keys (also later ones in the same batch or
+        transaction) can merge into it. New decisions are staged until the
+        transaction commits.
+
+        Args:
+            executor: Session or Connection to execute on (the caller commits)
+            keys: Iterable of company keys
+
+        Returns:
+            Dict mapping each distinct key to its canonical key
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load(executor)
+            pending = self._pending_for(executor)
+
+            resolved = {}
+            lookup = []
+            for key in dict.fromkeys(keys):
+                if key in pending.resolved:
+                    resolved[key] = pending.resolved[key]
+                elif key in self._cache:
+                    self._cache.move_to_end(key)
+                    resolved[key] = self._cache[key]
+                else:
+                    lookup.append(key)
+
+            for start in range(0, len(lookup), ALIAS_LOOKUP_CHUNK_SIZE):
+                chunk = lookup[start:start + ALIAS_LOOKUP_CHUNK_SIZE]
+                rows = executor.execute(
+                    select(CompanyAlias.alias_key, CompanyAlias.canonical_key).where(CompanyAlias.alias_key.in_(chunk))
+                )
+                for alias_key, canonical_key in rows:
+                    resolved[alias_key] = canonical_key
+                    self._remember(alias_key, canonical_key)
+
+            unknown = [key for key in lookup if key not in resolved]
+            shingle_sets = [shingles(key) for key in unknown]
+            aliases = []
+            for key, shingle_set, key_bands in zip(unknown, shingle_sets, band_hashes(minhash_signatures(shingle_sets))):
+                canonical = self._match(key, shingle_set, key_bands, pending)
+                if canonical is None:
+                    canonical = key
+                    _add_to_index(pending.buckets, pending.shingles, [key], [shingle_set], [key_bands])
+                    pending.new_keys.append((key, shingle_set, key_bands))
+                resolved[key] = canonical
+                pending.resolved[key] = canonical
+                aliases.append({'alias_key': key, 'canonical_key': canonical})
+
+            write_aliases(executor, aliases)
+            return resolved
+
+    def clear(self):
+        """Forget the index and cache, e.g. after the alias table was rebuilt"""
+        with self._lock:
+            self._cache.clear()
+            self._buckets = [{} for _ in range(LSH_BANDS)]
+            self._shingles.clear()
+            self._pending.clear()
+            self._loaded = False
+
+def write_aliases(executor, aliases):
+    """Store new alias -> canonical key decisions, keeping any stored concurrently"""
+    if not aliases:
+        return
+    table = CompanyAlias.__table__
+    dialect = _engine(executor).dialect.name
+    if dialect == 'sqlite':
+        stmt = sqlite.insert(table).on_conflict_do_nothing(index_elements=['alias_key'])
+    elif dialect == 'postgresql':
+        stmt = postgresql.insert(table).on_conflict_do_nothing(index_elements=['alias_key'])
+    else:
+        stmt = insert(table)
+    executor.execute(stmt, aliases)
+
+def _engine(executor):
+    """Engine behind a Session or Connection"""
+    bind = executor.get_bind() if hasattr(executor, 'get_bind') else executor
+    return bind.engine
+
+# One matcher per engine, dropped with the engine
+_matchers = weakref.WeakKeyDictionary()
+_matchers_lock = threading.Lock()
+
+def get_matcher(executor):
+    """The shared matcher of the database ``executor`` is connected to"""
+    engine = _engine(executor)
+    with _matchers_lock:
+        if engine not in _matchers:
+            _matchers[engine] = CompanyMatcher()
+        return _matchers[engine]
+
+def canonical_company_keys(executor, keys):
+    """Map a Series of company keys to their canonical keys
+
+    Args:
+        executor: Session or Connection to execute on (the caller commits)
+        keys: Series of keys from ``company_keys``
+
+    Returns:
+        Series of canonical keys aligned with ``keys``
+    """
+    mapping = get_matcher(executor).canonicalize(executor, keys.dropna().unique())
+    return keys.map(mapping).astype(object)
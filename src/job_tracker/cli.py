@@ -0,0 +1,283 @@
+"""
+Command line interface for syncing exports and writing reports without the dashboard
+
+Installed as ``job-tracker`` (see setup.py); ``python -m job_tracker.cli``
+works too. Reports are read in batches of ``OUTPUT_BATCH_SIZE`` rows and
+written to stdout as each batch arrives, as CSV, JSON Lines or Parquet, so
+memory stays bounded however many rows a query returns. Only click is
+imported up front; each command imports what it needs when it runs.
+
+Usage:
+    job-tracker sync exports/*.csv
+    job-tracker stats --by status --format json
+    job-tracker search "backend remote" > matches.csv
+    job-tracker export --format parquet > applications.parquet
+"""
+import csv
+import json
+import os
+import sys
+from datetime import date, datetime
+
+import click
+
+# Database used when neither --db nor JOB_TRACKER_DB is given (the dashboard's database)
+DEFAULT_DB_URL = 'sqlite:///job_tracker.db'
+
+# Environment variable holding the database URL
+DB_URL_ENV = 'JOB_TRACKER_DB'
+
+# Rows fetched from the database and written per batch
+OUTPUT_BATCH_SIZE = 10_000
+
+# Output formats of the report commands; json writes one object per line
+OUTPUT_FORMATS = ['csv', 'json', 'parquet']
+
+# Application columns written by ``export`` and ``search``, in output order
+EXPORT_COLUMNS = [
+    'id', 'job_title', 'company_name', 'job_url', 'applied_date', 'status', 'status_date',
+    'archived', 'date_archived', 'notes', 'simplify_id', 'updated_at',
+]
+
+format_option = click.option(
+    '--format', '-f', 'output_format', type=click.Choice(OUTPUT_FORMATS), default='csv', show_default=True,
+    help='Output format written to stdout; json is one object per line.',
+)
+
+def open_session():
+    """Session on the database chosen by ``--db``, closed when the command finishes"""
+    from sqlalchemy.orm import Session
+
+    from job_tracker.instrumentation import instrument_engine
+    from job_tracker.models import init_engine
+
+    ctx = click.get_current_context()
+    engine = instrument_engine(init_engine(ctx.obj['db_url']))
+    return ctx.with_resource(Session(engine))
+
+def stream_batches(session, stmt):
+    """Yield the rows of ``stmt`` in lists of at most ``OUTPUT_BATCH_SIZE``"""
+    result = session.execute(stmt.execution_options(yield_per=OUTPUT_BATCH_SIZE))
+    for partition in result.partitions():
+        yield partition
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _arrow_type(pa, column_type):
+    """Arrow type for a SQLAlchemy column type"""
+    from sqlalchemy import Boolean, Date, DateTime, Float, Integer
+
+    if isinstance(column_type, DateTime):
+        return pa.timestamp('us')
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    return pa.string()
+
+def write_csv(columns, batches, stream):
+    writer = csv.writer(stream, lineterminator='\n')
+    writer.writerow([name for name, _ in columns])
+    for batch in batches:
+        writer.writerows(batch)
+
+def write_json(columns, batches, stream):
+    names = [name for name, _ in columns]
+    for batch in batches:
+        stream.write(''.join(json.dumps(dict(zip(names, row)), default=_json_default) + '\n' for row in batch))
+
+def write_parquet(columns, batches, stream):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise click.UsageError('Parquet output needs pyarrow: pip install "job-tracker[parquet]"')
+
+    schema = pa.schema([(name, _arrow_type(pa, column_type)) for name, column_type in columns])
+    with pq.ParquetWriter(stream, schema) as writer:
+        for batch in batches:
+            if batch:
+                arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+def write_rows(columns, batches, output_format):
+    """Write row batches to stdout in ``output_format``
+
+    Args:
+        columns: List of (name, SQLAlchemy type) pairs, in row order
+        batches: Iterable of lists of row tuples
+        output_format: One of ``OUTPUT_FORMATS``
+    """
+    if output_format == 'parquet':
+        stream = sys.stdout.buffer
+        if stream.isatty():
+            raise click.UsageError('Refusing to write Parquet to a terminal; redirect stdout to a file')
+        write_parquet(columns, batches, stream)
+    else:
+        stream = sys.stdout
+        writer = write_csv if output_format == 'csv' else write_json
+        writer(columns, batches, stream)
+    stream.flush()
+
+def write_query(session, stmt, output_format):
+    """Stream the rows of a select to stdout, named after its column labels"""
+    columns = [(column.name, column.type) for column in stmt.selected_columns]
+    write_rows(columns, stream_batches(session, stmt), output_format)
+
+def applications_select():
+    """Select of ``EXPORT_COLUMNS``, in id order"""
+    from sqlalchemy import select
+
+    from job_tracker.models import JobApplication
+
+    table = JobApplication.__table__
+    return select(*[table.c[name] for name in EXPORT_COLUMNS]).order_by(table.c.id)
+
+@click.group()
+@click.option('--db', 'db_url', envvar=DB_URL_ENV, default=DEFAULT_DB_URL, show_default=True,
+              help=f'Database URL (also read from {DB_URL_ENV}).')
+@click.pass_context
+def cli(ctx, db_url):
+    """Sync Simplify exports and report on the tracked applications."""
+    ctx.obj = {'db_url': db_url}
+
+@cli.command()
+@click.argument('paths', nargs=-1, required=True)
+@click.option('--processes', type=int, default=1, show_default=True,
+              help='Parse the files in this many processes (0 = one per CPU) and write them in one '
+                   'transaction; 1 streams each file in chunks with resumable checkpoints.')
+@click.option('--chunksize', type=int, default=None, help='Rows per streamed chunk.')
+def sync(paths, processes, chunksize):
+    """Sync exports (CSV files, directories, glob patterns, or - for stdin) into the database."""
+    from job_tracker.batch import expand_paths, import_files
+    from job_tracker.ingest import STREAM_CHUNK_SIZE, SyncSummary, sync_csv_stream
+    from job_tracker.instrumentation import record_run
+
+    session = open_session()
+    paths = expand_paths(paths)
+    with record_run('cli.sync'):
+        if processes != 1:
+            if '-' in paths:
+                raise click.UsageError('stdin can only be synced with --processes 1')
+            summary = import_files(
+                session, paths, processes=processes or None,
+                progress=lambda done, total: click.echo(f"Parsed {done}/{total} parts", err=True),
+            )
+        else:
+            summary = SyncSummary()
+            for path in paths:
+                source = sys.stdin.buffer if path == '-' else path
+                label = 'stdin' if path == '-' else path
+                reported = [None]  # Rows last reported; the final call repeats the last chunk's count
+
+                def progress(rows, fraction, label=label, reported=reported):
+                    if rows != reported[0]:
+                        reported[0] = rows
+                        share = f" ({fraction:.0%})" if fraction is not None else ''
+                        click.echo(f"{label}: {rows:,} rows{share}", err=True)
+
+                summary.merge(sync_csv_stream(session, source, chunksize=chunksize or STREAM_CHUNK_SIZE, progress=progress))
+    click.echo(
+        f"Synced {summary.rows:,} rows: {len(summary.inserted):,} new, "
+        f"{len(summary.updated):,} updated, {summary.unchanged:,} unchanged"
+    )
+
+@cli.command()
+@click.option('--by', 'group_by', type=click.Choice(['company', 'status']), default='company', show_default=True,
+              help='company: applications, latest applied date and a count per status; status: applications per status.')
+@click.option('--company', 'company_search', help='Only companies whose name contains this text (case-insensitive).')
+@format_option
+def stats(group_by, company_search, output_format):
+    """Application counts aggregated in the database, most applications first."""
+    from sqlalchemy import case, func, select
+
+    from job_tracker.models import Company, CompanyStatus, JobApplication
+
+    session = open_session()
+    if group_by == 'status':
+        applications = func.count().label('applications')
+        stmt = (
+            select(JobApplication.status, applications, func.max(JobApplication.applied_date).label('most_recent'))
+            .group_by(JobApplication.status)
+            .order_by(applications.desc(), JobApplication.status)
+        )
+        if company_search:
+            stmt = stmt.where(func.lower(JobApplication.company_name).contains(company_search.lower(), autoescape=True))
+    else:
+        # One count column per status, pivoted in SQL from the company status table
+        statuses = session.execute(select(CompanyStatus.status).distinct().order_by(CompanyStatus.status)).scalars().all()
+        counts = [
+            func.coalesce(func.sum(case((CompanyStatus.status == status, CompanyStatus.applications), else_=0)), 0).label(status)
+            for status in statuses
+        ]
+        stmt = (
+            select(Company.name.label('company'), Company.applications, Company.latest_applied.label('most_recent'), *counts)
+            .outerjoin(CompanyStatus, CompanyStatus.company_key == Company.key)
+            .group_by(Company.key, Company.name, Company.applications, Company.latest_applied)
+            .order_by(Company.applications.desc(), Company.key)
+        )
+        if company_search:
+            stmt = stmt.where(func.lower(Company.name).contains(company_search.lower(), autoescape=True))
+    write_query(session, stmt, output_format)
+
+@cli.command()
+@click.argument('query')
+@click.option('--limit', type=int, default=None, help='Return at most this many matches.')
+@format_option
+def search(query, limit, output_format):
+    """Applications matching QUERY (job title, company name, notes), most relevant first."""
+    from job_tracker.models import JobApplication
+    from job_tracker.search import search_application_ids
+
+    session = open_session()
+    ids = search_application_ids(session, query, limit=limit)
+    base = applications_select().order_by(None)
+
+    def batches():
+        # Matches are loaded a batch of ids at a time and put back in rank order
+        for start in range(0, len(ids), OUTPUT_BATCH_SIZE):
+            chunk = ids[start:start + OUTPUT_BATCH_SIZE]
+            rows = {row[0]: row for row in session.execute(base.where(JobApplication.id.in_(chunk)))}
+            yield [rows[application_id] for application_id in chunk if application_id in rows]
+
+    write_rows([(column.name, column.type) for column in base.selected_columns], batches(), output_format)
+
+@cli.command()
+@click.option('--status', 'statuses', multiple=True, help='Only applications in this status (repeatable).')
+@click.option('--since', type=click.DateTime(['%Y-%m-%d']), help='Only applications applied on or after this date.')
+@click.option('--include-archived/--exclude-archived', default=True, show_default=True)
+@format_option
+def export(statuses, since, include_archived, output_format):
+    """Every stored application, in id order."""
+    from sqlalchemy import false, or_
+
+    from job_tracker.models import JobApplication
+
+    session = open_session()
+    stmt = applications_select()
+    if statuses:
+        stmt = stmt.where(JobApplication.status.in_([status.upper() for status in statuses]))
+    if since:
+        stmt = stmt.where(JobApplication.applied_date >= since)
+    if not include_archived:
+        stmt = stmt.where(or_(JobApplication.archived.is_(None), JobApplication.archived == false()))
+    write_query(session, stmt, output_format)
+
+def main():
+    """Console entry point; exits quietly when stdout is closed early (e.g. piped into head)"""
+    try:
+        cli()
+    except BrokenPipeError:
+        # Python flushes stdout again at exit; point it at devnull so that flush cannot fail
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
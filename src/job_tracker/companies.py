@@ -0,0 +1,202 @@
+"""
+Company table: one row per normalized company name, kept up to date by the ingest path
+
+Applications are grouped by ``company_key``, their company name folded to
+lowercase words without punctuation or a trailing legal form, so "Acme Inc"
+and "ACME, Inc." count as one company, and near-duplicate keys merged by
+the fuzzy matcher in ``job_tracker.canonical``. Like the SQL company stats,
+only applications with an applied date are counted. Each sync refreshes only the
+companies it touched, which keeps the Company Statistics panel a plain
+ordered read of ``companies`` instead of an aggregation over every
+application.
+"""
+import re
+
+import pandas as pd
+from sqlalchemy import String, bindparam, delete, func, insert, select, type_coerce, update
+
+from job_tracker.canonical import canonical_company_keys, get_matcher
+from job_tracker.frames import apply_schema
+from job_tracker.instrumentation import span
+from job_tracker.models import Company, CompanyAlias, CompanyStatus, JobApplication
+
+# Legal forms dropped from the end of a company name
+COMPANY_SUFFIXES = [
+    'inc', 'incorporated', 'llc', 'l l c', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'plc', 'lp', 'llp', 'gmbh', 'ag', 'sa', 'bv', 'pty',
+]
+
+# One or more trailing suffixes, e.g. "holdings co ltd" -> "holdings"
+SUFFIX_PATTERN = re.compile(r'(?: (?:' + '|'.join(COMPANY_SUFFIXES) + r'))+$')
+
+# Words that describe a site or posting rather than the company, dropped anywhere in a name
+NOISE_PATTERN = re.compile(r'^the | (?:corporate|head) office\b| headquarters\b| hq\b| careers\b')
+
+# Keep IN (...) lists well under SQLite's bound parameter limit
+REFRESH_CHUNK_SIZE = 500
+
+def company_keys(names):
+    """Normalized company keys for a Series of company names
+
+    Case, punctuation and runs of whitespace are folded, descriptive noise
+    ("Corporate Office", "Careers", a leading "The") and trailing legal forms
+    removed; a name made only of such words (e.g. "Company") keeps them.
+    """
+    folded = names.astype(object).fillna('').astype(str).str.lower()
+    folded = folded.str.replace(r'[\W_]+', ' ', regex=True).str.strip()
+    stripped = folded.str.replace(NOISE_PATTERN, '', regex=True)
+    stripped = stripped.str.replace(SUFFIX_PATTERN, '', regex=True).str.strip()
+    return stripped.where(stripped != '', folded).astype(object)
+
+def normalize_company_name(name):
+    """Normalized company key of a single name (see ``company_keys``)"""
+    return company_keys(pd.Series([name])).iloc[0]
+
+def canonical_keys(executor, names):
+    """Company keys of a Series of names, with fuzzy variants merged (see ``job_tracker.canonical``)"""
+    return canonical_company_keys(executor, company_keys(names))
+
+def _aggregate(executor, keys=None):
+    """Company and status-breakdown rows aggregated from the applications
+
+    Args:
+        executor: Session or Connection to execute on
+        keys: Company keys to aggregate (defaults to every company)
+
+    Returns:
+        ``(companies, statuses)`` lists of column dictionaries
+    """
+    stmt = (
+        select(
+            JobApplication.company_key,
+            JobApplication.company_name,
+            JobApplication.status,
+            func.count(),
+            type_coerce(func.max(JobApplication.applied_date), String),
+        )
+        # Saved jobs without an applied date are left out, like in ``queries.company_stats_query``
+        .where(JobApplication.applied_date.isnot(None))
+        .group_by(JobApplication.company_key, JobApplication.company_name, JobApplication.status)
+    )
+    if keys is None:
+        rows = executor.execute(stmt.where(JobApplication.company_key.isnot(None))).all()
+    else:
+        rows = []
+        for start in range(0, len(keys), REFRESH_CHUNK_SIZE):
+            chunk = keys[start:start + REFRESH_CHUNK_SIZE]
+            rows.extend(executor.execute(stmt.where(JobApplication.company_key.in_(chunk))).all())
+
+    groups = pd.DataFrame(rows, columns=['key', 'name', 'status', 'applications', 'latest_applied'])
+    if groups.empty:
+        return [], []
+    groups['latest_applied'] = pd.to_datetime(groups['latest_applied'], format='ISO8601')
+
+    # The most common spelling names the company; ties go to the first name alphabetically
+    spellings = groups.groupby(['key', 'name'])['applications'].sum().reset_index()
+    spellings = spellings.sort_values(['key', 'applications', 'name'], ascending=[True, False, True])
+    companies = groups.groupby('key').agg(applications=('applications', 'sum'), latest_applied=('latest_applied', 'max'))
+    companies['name'] = spellings.drop_duplicates('key').set_index('key')['name']
+    companies['latest_applied'] = companies['latest_applied'].astype(object).where(companies['latest_applied'].notna(), None)
+
+    statuses = groups[groups['status'].notna()].groupby(['key', 'status'])['applications'].sum().reset_index()
+    return (
+        companies.reset_index().to_dict('records'),
+        statuses.rename(columns={'key': 'company_key'}).to_dict('records'),
+    )
+
+def refresh_companies(executor, keys):
+    """Recompute the company rows of the given keys from their applications
+
+    Recomputing (instead of adding deltas) keeps counts, latest dates and
+    spellings exact after updates that move or remove applications; it costs
+    one indexed aggregation over the touched companies' applications.
+
+    Args:
+        executor: Session or Connection to execute on (the caller commits)
+        keys: Iterable of company keys whose applications changed
+
+    Returns:
+        Number of companies stored for those keys
+    """
+    keys = sorted({key for key in keys if key is not None})
+    if not keys:
+        return 0
+
+    for start in range(0, len(keys), REFRESH_CHUNK_SIZE):
+        chunk = keys[start:start + REFRESH_CHUNK_SIZE]
+        executor.execute(delete(CompanyStatus.__table__).where(CompanyStatus.company_key.in_(chunk)))
+        executor.execute(delete(Company.__table__).where(Company.key.in_(chunk)))
+
+    companies, statuses = _aggregate(executor, keys)
+    if companies:
+        executor.execute(insert(Company.__table__), companies)
+    if statuses:
+        executor.execute(insert(CompanyStatus.__table__), statuses)
+    return len(companies)
+
+def rebuild_companies(connection):
+    """Recompute every application's company key and the whole company table
+
+    For databases synced before the table existed, or after changing the
+    normalization rules or similarity threshold: stored aliases are
+    discarded and every name is matched again.
+
+    Returns:
+        Number of companies stored
+    """
+    connection.execute(delete(CompanyAlias.__table__))
+    get_matcher(connection).clear()
+
+    rows = connection.execute(select(JobApplication.id, JobApplication.company_name)).all()
+    if rows:
+        applications = pd.DataFrame(rows, columns=['id', 'company_name'])
+        applications['company_key'] = canonical_keys(connection, applications['company_name'])
+        table = JobApplication.__table__
+        stmt = update(table).where(table.c.id == bindparam('application_id')).values(company_key=bindparam('key'))
+        connection.execute(stmt, [
+            {'application_id': int(application_id), 'key': key}
+            for application_id, key in zip(applications['id'], applications['company_key'])
+        ])
+
+    connection.execute(delete(CompanyStatus.__table__))
+    connection.execute(delete(Company.__table__))
+    companies, statuses = _aggregate(connection)
+    if companies:
+        connection.execute(insert(Company.__table__), companies)
+    if statuses:
+        connection.execute(insert(CompanyStatus.__table__), statuses)
+    return len(companies)
+
+def get_company_table(session, search=None):
+    """Company statistics read from the company table
+
+    Args:
+        session: SQLAlchemy session
+        search: Optional case-insensitive substring of the company name
+
+    Returns:
+        DataFrame indexed by company (categorical) with Applications, Most
+        Recent and Days Since Last columns followed by one count column per
+        status, ordered by number of applications
+    """
+    with span('company_table'):
+        stmt = (
+            select(Company.key, Company.name, Company.applications, type_coerce(Company.latest_applied, String))
+            .order_by(Company.applications.desc(), Company.key)
+        )
+        if search:
+            stmt = stmt.where(func.lower(Company.name).contains(search.lower(), autoescape=True))
+        companies = pd.DataFrame(session.execute(stmt).all(), columns=['key', 'Company', 'Applications', 'Most Recent'])
+        companies['Most Recent'] = pd.to_datetime(companies['Most Recent'], format='ISO8601')
+        companies['Days Since Last'] = (pd.Timestamp.now() - companies['Most Recent']).dt.days
+
+        statuses = pd.DataFrame(
+            session.execute(select(CompanyStatus.company_key, CompanyStatus.status, CompanyStatus.applications)).all(),
+            columns=['key', 'status', 'applications'],
+        )
+        breakdown = statuses.pivot_table(index='key', columns='status', values='applications', aggfunc='sum', fill_value=0)
+        breakdown = breakdown.reindex(companies['key'], fill_value=0).astype('int64')
+        breakdown.columns.name = None
+
+        table = pd.concat([companies.drop(columns='key').reset_index(drop=True), breakdown.reset_index(drop=True)], axis=1)
+        return apply_schema(table.set_index('Company'))
@@ -0,0 +1,96 @@
+"""
+Engine and session management
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+DEFAULT_DB_URL = "sqlite:///job_tracker.db"
+
+# Connections kept open per engine, and extra ones allowed under load
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
+# Seconds to wait for a free pooled connection before giving up
+POOL_TIMEOUT = 30
+
+# Milliseconds a SQLite connection waits on a locked database before raising
+BUSY_TIMEOUT_MS = 5000
+
+def is_memory_sqlite(url):
+    """Whether the URL points at a private in-memory SQLite database"""
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+def configure_sqlite(busy_timeout):
+    """Connect event that switches a SQLite file to WAL and sets its busy timeout"""
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL lets readers keep reading while a sync writes; NORMAL sync is safe under WAL
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout)}")
+        cursor.close()
+    return on_connect
+
+def create_db_engine(
+    db_url=DEFAULT_DB_URL,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    busy_timeout=BUSY_TIMEOUT_MS,
+):
+    """Create an engine with a connection pool shared by all threads
+
+    SQLite file databases are opened in WAL mode with a busy timeout, so
+    concurrent readers are not blocked by a writer and a second writer waits
+    for the lock instead of failing immediately. In-memory SQLite databases
+    keep SQLAlchemy's default single-connection pool.
+
+    Args:
+        db_url: Database URL
+        pool_size: Connections kept open in the pool
+        max_overflow: Extra connections opened when the pool is exhausted
+        pool_timeout: Seconds to wait for a connection from a full pool
+        busy_timeout: Milliseconds SQLite waits on a locked database
+
+    Returns:
+        SQLAlchemy Engine
+    """
+    url = make_url(db_url)
+    if is_memory_sqlite(url):
+        return create_engine(url)
+
+    engine = create_engine(url, pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout)
+    if url.get_backend_name() == 'sqlite':
+        event.listen(engine, 'connect', configure_sqlite(busy_timeout))
+    return engine
+
+def create_session_registry(engine):
+    """Thread-local session registry: each thread (e.g. each Streamlit script run) gets its own session
+
+    Call ``remove()`` on the registry when the thread's unit of work ends to
+    close the session and return its connection to the pool.
+    """
+    return scoped_session(sessionmaker(bind=engine))
+
+@contextmanager
+def session_scope(session_factory):
+    """Provide a session for one unit of work, committing on success
+
+    Args:
+        session_factory: sessionmaker or scoped_session to take the session from
+
+    Yields:
+        SQLAlchemy session, rolled back if the block raises and closed afterwards
+    """
+    session = session_factory()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
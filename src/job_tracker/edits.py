@@ -0,0 +1,223 @@
+"""
+Write-back of cell edits made in the dashboard's applications table
+
+``st.data_editor`` reports edits as a delta (``edited_rows``: row position ->
+changed cells). ``EditBuffer`` collects that delta across reruns so a burst
+of edits is written once, and ``apply_edits`` writes it with one batched
+``UPDATE ... SET column = CASE id ... END WHERE id IN (...)`` per changed
+column, touching only the edited cells of the edited rows.
+
+Edits are made against the page as it was loaded. Each row carries a
+``version`` that every write increments; an edit is only written when the
+row is still at the version the page showed, otherwise it is reported as a
+conflict instead of overwriting the newer data (e.g. a sync that ran
+meanwhile).
+"""
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import Boolean, DateTime, String, case, literal, select, tuple_, type_coerce, update
+
+from job_tracker.cache import data_cache
+from job_tracker.companies import canonical_keys, refresh_companies
+from job_tracker.history import EVENT_COLUMNS, record_status_events
+from job_tracker.models import JobApplication
+from job_tracker.queries import DISPLAY_COLUMNS
+
+# Quiet time after the last cell edit before pending edits are written
+EDIT_DEBOUNCE_SECONDS = 2.0
+
+# Rows per statement; the claim and each CASE bind two parameters per row
+EDIT_CHUNK_SIZE = 250
+
+# Display columns whose edits change the company table (counts, latest date, status breakdown)
+COMPANY_COLUMNS = {'Company', 'Status', 'Applied Date'}
+
+class EditBuffer:
+    """Cell edits waiting to be written, collected across Streamlit reruns
+
+    Every cell edit in ``st.data_editor`` reruns the script. Staging the
+    editor's delta here and writing once edits have been quiet for
+    ``debounce`` seconds (or on an explicit save) turns a burst of edits into
+    one transaction.
+    """
+
+    def __init__(self, debounce=EDIT_DEBOUNCE_SECONDS, clock=time.monotonic):
+        self.debounce = debounce
+        self.clock = clock
+        self.edits = {}  # Application id -> (version shown, {display column: new value})
+        self.changed_at = None
+
+    def __len__(self):
+        return len(self.edits)
+
+    def stage(self, ids, versions, edited_rows):
+        """Record an editor's ``edited_rows`` delta
+
+        Args:
+            ids: Application ids of the editor's rows, in display order
+            versions: Dict mapping application id to the row version shown
+            edited_rows: Dict mapping row position to ``{display column: value}``
+
+        Returns:
+            Whether the delta held edits not staged yet
+        """
+        staged = False
+        for position, changes in edited_rows.items():
+            application_id = int(ids[int(position)])
+            _, pending = self.edits.setdefault(application_id, (versions[application_id], {}))
+            new = {
+                name: value for name, value in changes.items()
+                if name in DISPLAY_COLUMNS and (name not in pending or pending[name] != value)
+            }
+            if new:
+                pending.update(new)
+                staged = True
+        if staged:
+            self.changed_at = self.clock()
+        return staged
+
+    def due(self):
+        """Whether edits are pending and none was staged for ``debounce`` seconds"""
+        return bool(self.edits) and self.clock() - self.changed_at >= self.debounce
+
+    def take(self):
+        """Remove and return the pending edits (see ``apply_edits``)"""
+        edits, self.edits, self.changed_at = self.edits, {}, None
+        return edits
+
+@dataclass
+class EditResult:
+    """What an edit write-back did, by application id"""
+    saved: list = field(default_factory=list)  # Rows written
+    conflicts: list = field(default_factory=list)  # Rows changed or deleted since they were shown; not written
+
+def coerce_value(column, value):
+    """Convert a value from the editor to what ``column`` stores (blank values become NULL)"""
+    if value is None or value == '' or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    if isinstance(column.type, DateTime):
+        return pd.Timestamp(value).to_pydatetime()
+    if isinstance(column.type, Boolean):
+        return bool(value)
+    return str(value)
+
+def _chunks(values):
+    for start in range(0, len(values), EDIT_CHUNK_SIZE):
+        yield values[start:start + EDIT_CHUNK_SIZE]
+
+def apply_edits(session, edits):
+    """Write cell edits in the session's transaction (the caller commits)
+
+    Rows still at the version they were edited against are claimed by one
+    version-checked UPDATE; then each changed column is written with one
+    ``CASE id`` UPDATE over the claimed rows that changed it. Status changes
+    are appended to the status history and the companies of the edited rows
+    refreshed, as a sync would.
+
+    Args:
+        session: SQLAlchemy session
+        edits: Dict mapping application id to ``(version, changes)``, the
+            version the edits were made against and a dict of display column
+            to new value (as taken from ``EditBuffer``)
+
+    Returns:
+        EditResult of the saved and conflicting application ids
+
+    Raises:
+        ValueError: If an edit clears a required column
+    """
+    table = JobApplication.__table__
+    result = EditResult()
+
+    changes = {}
+    for application_id, (version, cells) in edits.items():
+        changes[application_id] = {DISPLAY_COLUMNS[name]: coerce_value(table.c[DISPLAY_COLUMNS[name]], value) for name, value in cells.items()}
+        for attribute, value in changes[application_id].items():
+            if value is None and not table.c[attribute].nullable:
+                raise ValueError(f"{attribute.replace('_', ' ').capitalize()} cannot be empty")
+    if not changes:
+        return result
+
+    # Claim the rows still at the version shown by moving them to the next version
+    ids = sorted(changes)
+    current = (table.c.id, table.c.company_name, table.c.company_key, table.c.status, type_coerce(table.c.status_date, String))
+    returning = session.get_bind().dialect.update_returning
+    stored = []
+    for chunk in _chunks(ids):
+        shown = tuple_(table.c.id, table.c.version).in_([(application_id, edits[application_id][0]) for application_id in chunk])
+        claim = update(table).where(shown).values(version=table.c.version + 1)
+        if returning:
+            stored.extend(session.execute(claim.returning(*current)).all())
+        else:
+            stored.extend(session.execute(select(*current).where(shown)).all())
+            session.execute(claim)
+    before = pd.DataFrame(stored, columns=['id', 'company_name', 'company_key', 'status', 'status_date']).set_index('id')
+    result.saved = before.index.tolist()
+    result.conflicts = [application_id for application_id in ids if application_id not in before.index]
+    claimed = {application_id: changes[application_id] for application_id in result.saved}
+
+    renamed = {application_id: cells['company_name'] for application_id, cells in claimed.items() if 'company_name' in cells}
+    if renamed:
+        keys = canonical_keys(session, pd.Series(renamed))
+        for application_id, key in keys.items():
+            claimed[application_id]['company_key'] = key
+
+    columns = {}
+    for application_id, cells in claimed.items():
+        for attribute, value in cells.items():
+            columns.setdefault(attribute, {})[application_id] = value
+    for attribute, values in columns.items():
+        column = table.c[attribute]
+        for chunk in _chunks(sorted(values)):
+            new_values = case({application_id: literal(values[application_id], column.type) for application_id in chunk}, value=table.c.id)
+            session.execute(update(table).where(table.c.id.in_(chunk)).values({attribute: new_values}))
+
+    moved = [
+        application_id for application_id, cells in claimed.items()
+        if 'status' in cells and cells['status'] != before.at[application_id, 'status']
+    ]
+    if moved:
+        now = datetime.utcnow()
+        events = pd.DataFrame({
+            'application_id': moved,
+            'company_name': [claimed[application_id].get('company_name', before.at[application_id, 'company_name']) for application_id in moved],
+            'from_status': before.loc[moved, 'status'].tolist(),
+            'to_status': [claimed[application_id]['status'] for application_id in moved],
+            'event_date': [claimed[application_id].get('status_date') or now for application_id in moved],
+            'stage_started': pd.to_datetime(before.loc[moved, 'status_date'], format='ISO8601').tolist(),
+        }, columns=EVENT_COLUMNS)
+        record_status_events(session, session.get_bind().dialect.name, events, 'edit')
+
+    touched = [
+        application_id for application_id, (_, cells) in edits.items()
+        if application_id in claimed and COMPANY_COLUMNS.intersection(cells)
+    ]
+    refresh_companies(session, [before.at[application_id, 'company_key'] for application_id in touched] + [
+        claimed[application_id]['company_key'] for application_id in touched if 'company_key' in claimed[application_id]
+    ])
+    return result
+
+def save_edits(session, edits):
+    """Apply edits in one transaction and commit it
+
+    Args:
+        session: SQLAlchemy session
+        edits: Pending edits, see ``apply_edits``
+
+    Returns:
+        EditResult of the saved and conflicting application ids
+    """
+    try:
+        result = apply_edits(session, edits)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise e
+
+    # A conflict means another write changed the rows, so cached pages and versions are stale too
+    if result.saved or result.conflicts:
+        data_cache.bump()
+    return result
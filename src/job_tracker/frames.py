@@ -0,0 +1,90 @@
+"""
+Memory-efficient dtypes for the DataFrames the dashboard builds
+
+Every frame of applications (pages, search results, the snapshot) and the
+company stats frame goes through ``FRAME_SCHEMA``: repeated values such as
+company names and statuses become categoricals (one small integer code per
+row plus each distinct string once), free text is stored in Arrow string
+arrays instead of Python objects, and dates and flags keep compact numpy or
+nullable masked arrays.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = pd.StringDtype('pyarrow')
+except ImportError:  # Same missing-value semantics, Python object storage
+    STRING_DTYPE = pd.StringDtype('python')
+
+# Display dtype of each frame column; columns not listed keep their dtype
+FRAME_SCHEMA = {
+    'Job Title': STRING_DTYPE,
+    'Company': 'category',
+    'Status': 'category',
+    'Applied Date': 'datetime64[ns]',
+    'Status Date': 'datetime64[ns]',
+    'Archived': 'boolean',
+    'Date Archived': 'datetime64[ns]',
+    'Notes': STRING_DTYPE,
+    'Job URL': STRING_DTYPE,
+    'Applications': 'int64',
+    'Most Recent': 'datetime64[ns]',
+}
+
+# Columns stored as categoricals, e.g. dictionary-encoded in the snapshot
+CATEGORICAL_COLUMNS = [name for name, dtype in FRAME_SCHEMA.items() if dtype == 'category']
+
+def typed_array(name, values):
+    """Convert one column's values to the array type ``FRAME_SCHEMA`` gives it
+
+    Args:
+        name: Display column name
+        values: Sequence of Python values (strings, datetimes, bools or None)
+    """
+    dtype = FRAME_SCHEMA.get(name, object)
+    if dtype == 'datetime64[ns]':
+        dates = pd.to_datetime(pd.Series(values, dtype=object), format='ISO8601')
+        return dates.to_numpy(dtype='datetime64[ns]')
+    if dtype == 'category':
+        return pd.Categorical(pd.array(values, dtype=STRING_DTYPE))
+    return pd.array(values, dtype=dtype)
+
+def apply_schema(frame):
+    """Cast a frame's columns (and a named index) to their ``FRAME_SCHEMA`` dtypes
+
+    Categorical columns keep their categories when they already are
+    categoricals; anything else (e.g. object columns left by a concat of
+    categoricals with different categories) is re-encoded.
+    """
+    dtypes = {name: FRAME_SCHEMA[name] for name in frame.columns if name in FRAME_SCHEMA}
+    frame = frame.astype(dtypes)
+    if frame.index.name in FRAME_SCHEMA:
+        frame.index = frame.index.astype(FRAME_SCHEMA[frame.index.name])
+    return frame
+
+def contains_text(values, text):
+    """Case-insensitive literal substring match over a column
+
+    For categoricals the match runs once per distinct value and is mapped to
+    the rows through the category codes, instead of lowercasing every row.
+
+    Args:
+        values: Series or Index of strings (missing values never match)
+        text: Substring to look for
+
+    Returns:
+        Boolean numpy array aligned with ``values``
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categorical = values.array
+        categories = pd.Series(categorical.categories).astype(STRING_DTYPE)
+        matches = categories.str.contains(text, case=False, regex=False, na=False).to_numpy(dtype=bool)
+        # Code -1 marks a missing value; it indexes the appended False
+        return np.append(matches, False)[categorical.codes]
+    strings = pd.Series(values).astype(STRING_DTYPE)
+    return strings.str.contains(text, case=False, regex=False, na=False).to_numpy(dtype=bool)
+
+def frame_memory(frame):
+    """Bytes held by a frame's index and columns, counting string contents"""
+    return int(frame.memory_usage(deep=True, index=True).sum())
@@ -0,0 +1,229 @@
+"""
+Status history: append-only status events and the daily pipeline rollups built from them
+
+Every status change (a sync moving an application from SAVED to APPLIED, an
+edit in the dashboard) appends a row to ``status_events`` and adds its counts
+to ``status_rollups``, one row per (company, day, status). The Pipeline view
+reads the rollups only, so its cost grows with the number of days shown, not
+with the number of applications.
+"""
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from job_tracker.models import JobApplication, StatusEvent, StatusRollup
+
+# Funnel stages in order; reaching a stage implies having passed the earlier ones
+PIPELINE_STAGES = ['SAVED', 'APPLIED', 'SCREEN', 'INTERVIEW', 'OFFER']
+
+# Furthest funnel stage implied by statuses outside the funnel (other statuses imply the first stage)
+STATUS_STAGES = {
+    'REJECTED': 'APPLIED',
+    'WITHDRAWN': 'APPLIED',
+    'GHOSTED': 'APPLIED',
+    'ACCEPTED': 'OFFER',
+    'DECLINED': 'OFFER',
+}
+
+# Rollup company key holding the totals over all companies
+ALL_COMPANIES = ''
+
+# Counters kept per rollup row
+ROLLUP_COUNTERS = ['entered', 'reached', 'exited', 'timed_exits', 'stage_seconds']
+
+# Columns of the event frames passed to ``record_status_events``
+EVENT_COLUMNS = ['application_id', 'company_name', 'from_status', 'to_status', 'event_date', 'stage_started']
+
+def stage_rank(statuses):
+    """Funnel position implied by each status: -1 for no status, 0 for unknown ones"""
+    ranks = {stage: rank for rank, stage in enumerate(PIPELINE_STAGES)}
+    ranks.update({status: ranks[stage] for status, stage in STATUS_STAGES.items()})
+    return statuses.map(ranks).where(statuses.notna(), -1).fillna(0).astype(int)
+
+def rollup_deltas(events):
+    """Aggregate status events into rollup counter increments
+
+    Args:
+        events: DataFrame with ``EVENT_COLUMNS``; ``stage_started`` is when the
+            application entered ``from_status`` (NaT when unknown)
+
+    Returns:
+        DataFrame indexed by (company_name, day, status) with ``ROLLUP_COUNTERS``,
+        including the all-company totals under ``ALL_COMPANIES``
+    """
+    events = events.assign(day=pd.to_datetime(events['event_date']).dt.normalize())
+    keys = ['company_name', 'day', 'status']
+    parts = [events.rename(columns={'to_status': 'status'}).groupby(keys).size().rename('entered')]
+
+    exits = events[events['from_status'].notna()].rename(columns={'from_status': 'status'})
+    seconds = (pd.to_datetime(exits['event_date']) - pd.to_datetime(exits['stage_started'])).dt.total_seconds()
+    timed = seconds.notna() & (seconds >= 0)
+    exits = exits.assign(exited=1, timed_exits=timed.astype(int), stage_seconds=seconds.where(timed, 0.0))
+    parts.append(exits.groupby(keys)[['exited', 'timed_exits', 'stage_seconds']].sum())
+
+    # An advance from rank a to rank b reaches every stage after a up to b
+    from_rank, to_rank = stage_rank(events['from_status']), stage_rank(events['to_status'])
+    advanced = [
+        events[(from_rank < rank) & (to_rank >= rank)].assign(status=stage)
+        for rank, stage in enumerate(PIPELINE_STAGES)
+    ]
+    parts.append(pd.concat(advanced).groupby(keys).size().rename('reached'))
+
+    deltas = pd.concat(parts, axis=1).fillna(0)
+    totals = deltas.groupby(level=['day', 'status']).sum()
+    totals = pd.concat({ALL_COMPANIES: totals}, names=['company_name'])
+    deltas = pd.concat([deltas, totals]).reindex(columns=ROLLUP_COUNTERS, fill_value=0)
+    return deltas.astype({counter: int for counter in ROLLUP_COUNTERS if counter != 'stage_seconds'})
+
+def write_rollups(executor, dialect, deltas):
+    """Add counter increments to the rollup rows, creating missing rows
+
+    Args:
+        executor: Session or Connection to execute on
+        dialect: Name of the database dialect
+        deltas: Frame returned by ``rollup_deltas``
+    """
+    if deltas.empty:
+        return
+
+    table = StatusRollup.__table__
+    frame = deltas.reset_index()
+    frame['day'] = frame['day'].dt.date
+    records = frame.to_dict('records')
+    if dialect in ('sqlite', 'postgresql'):
+        dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['company_name', 'day', 'status'],
+            set_={counter: table.c[counter] + stmt.excluded[counter] for counter in ROLLUP_COUNTERS},
+        )
+        executor.execute(stmt, records)
+    else:
+        for record in records:
+            key = (table.c.company_name == record['company_name']) & (table.c.day == record['day']) & (table.c.status == record['status'])
+            increments = {counter: table.c[counter] + record[counter] for counter in ROLLUP_COUNTERS}
+            if executor.execute(update(table).where(key).values(increments)).rowcount == 0:
+                executor.execute(insert(table).values(record))
+
+def record_status_events(executor, dialect, events, source):
+    """Append status events and fold them into the daily rollups
+
+    Args:
+        executor: Session or Connection to execute on (the caller commits)
+        dialect: Name of the database dialect
+        events: DataFrame with ``EVENT_COLUMNS``, one row per status change
+        source: What recorded the events: 'sync', 'edit' or 'backfill'
+
+    Returns:
+        Number of events recorded
+    """
+    events = events[events['to_status'].notna()]
+    if events.empty:
+        return 0
+
+    events = events.assign(event_date=pd.to_datetime(events['event_date']).fillna(pd.Timestamp(datetime.utcnow())))
+    columns = events[EVENT_COLUMNS[:-1]].astype({'application_id': int}).astype(object)
+    columns = columns.where(columns.notna(), None)
+    executor.execute(insert(StatusEvent.__table__), [dict(record, source=source) for record in columns.to_dict('records')])
+    write_rollups(executor, dialect, rollup_deltas(events))
+    return len(events.index)
+
+def rebuild_rollups(connection):
+    """Recompute every rollup row from the event log
+
+    Returns:
+        Number of events replayed
+    """
+    connection.execute(delete(StatusRollup))
+    rows = connection.execute(
+        select(
+            StatusEvent.application_id,
+            StatusEvent.company_name,
+            StatusEvent.from_status,
+            StatusEvent.to_status,
+            StatusEvent.event_date,
+        ).order_by(StatusEvent.application_id, StatusEvent.event_date, StatusEvent.id)
+    ).all()
+    events = pd.DataFrame(rows, columns=EVENT_COLUMNS[:-1])
+    if events.empty:
+        return 0
+
+    # Each event's stage started at the application's previous event
+    events['event_date'] = pd.to_datetime(events['event_date'])
+    events['stage_started'] = events.groupby('application_id')['event_date'].shift()
+    write_rollups(connection, connection.dialect.name, rollup_deltas(events))
+    return len(events.index)
+
+def backfill_status_events(connection):
+    """Seed one event per stored application whose history is not tracked yet
+
+    Databases synced before the event log existed only know each
+    application's current status; it is recorded as entered on its status
+    date so the Pipeline view starts from the current state.
+
+    Returns:
+        Number of events written
+    """
+    tracked = select(StatusEvent.application_id)
+    rows = connection.execute(
+        select(
+            JobApplication.id,
+            JobApplication.company_name,
+            JobApplication.status,
+            func.coalesce(JobApplication.status_date, JobApplication.applied_date),
+        ).where(JobApplication.status.isnot(None), JobApplication.id.not_in(tracked))
+    ).all()
+    events = pd.DataFrame(rows, columns=['application_id', 'company_name', 'to_status', 'event_date'])
+    events = events.assign(from_status=None, stage_started=pd.NaT)[EVENT_COLUMNS]
+    return record_status_events(connection, connection.dialect.name, events, 'backfill')
+
+def _rollup_totals(session, group_by, company=None, since=None):
+    """Summed rollup counters grouped by the given rollup columns"""
+    stmt = (
+        select(*group_by, *[func.sum(StatusRollup.__table__.c[counter]).label(counter) for counter in ROLLUP_COUNTERS])
+        .where(StatusRollup.company_name == (company if company else ALL_COMPANIES))
+        .group_by(*group_by)
+    )
+    if since is not None:
+        stmt = stmt.where(StatusRollup.day >= since)
+    rows = session.execute(stmt).all()
+    return pd.DataFrame(rows, columns=[column.key for column in group_by] + ROLLUP_COUNTERS)
+
+def get_pipeline_funnel(session, company=None, since=None):
+    """Funnel conversion and time in stage, read from the rollups
+
+    Args:
+        session: SQLAlchemy session
+        company: Optional exact company name (defaults to all companies)
+        since: Optional first day to include
+
+    Returns:
+        DataFrame indexed by pipeline stage with Reached, Conversion (share
+        of the previous stage that reached this one), Currently In (entered
+        minus exited in the period) and Avg Days In Stage columns
+    """
+    totals = _rollup_totals(session, [StatusRollup.status], company, since).set_index('status')
+    totals = totals.reindex(PIPELINE_STAGES, fill_value=0)
+
+    funnel = pd.DataFrame(index=pd.Index(PIPELINE_STAGES, name='Stage'))
+    funnel['Reached'] = totals['reached'].astype(int)
+    previous = funnel['Reached'].shift()
+    funnel['Conversion'] = (funnel['Reached'] / previous.where(previous > 0)).astype(float)
+    funnel['Currently In'] = (totals['entered'] - totals['exited']).astype(int)
+    days = totals['stage_seconds'] / totals['timed_exits'].where(totals['timed_exits'] > 0) / 86400
+    funnel['Avg Days In Stage'] = days.astype(float).round(1)
+    return funnel
+
+def get_status_activity(session, company=None, since=None):
+    """Applications entering each status per day, read from the rollups
+
+    Returns:
+        DataFrame indexed by day (datetime64) with one column per status
+    """
+    totals = _rollup_totals(session, [StatusRollup.day, StatusRollup.status], company, since)
+    activity = totals.pivot_table(index='day', columns='status', values='entered', aggfunc='sum', fill_value=0)
+    activity.index = pd.to_datetime(activity.index)
+    activity.columns.name = None
+    return activity.astype(int)
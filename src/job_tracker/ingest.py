@@ -0,0 +1,652 @@
+"""
+Ingest pipeline for Simplify.jobs CSV exports
+"""
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import String, delete, insert, select, type_coerce, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from job_tracker.cache import data_cache
+from job_tracker.companies import canonical_keys, refresh_companies
+from job_tracker.history import record_status_events
+from job_tracker.instrumentation import span, timed_iter
+from job_tracker.models import JobApplication, SyncCheckpoint, SyncLedger
+
+# Keep IN (...) lists well under SQLite's bound parameter limit (999 on older builds)
+LOOKUP_CHUNK_SIZE = 500
+
+# Rows read, normalized and committed per transaction by sync_csv_stream
+STREAM_CHUNK_SIZE = 50_000
+
+# Fields hashed into generated IDs, in the order generate_unique_id joins them
+ID_KEY_COLUMNS = ['Company Name', 'Job Title', 'Job URL', 'Applied Date']
+
+# Below this many rows, process start-up costs more than hashing in one loop
+PARALLEL_ID_MIN_ROWS = 500_000
+
+# Simplify export columns and the JobApplication columns they load into
+TEXT_COLUMNS = {
+    'Job Title': 'job_title',
+    'Company Name': 'company_name',
+    'Job URL': 'job_url',
+    'Status': 'status',
+    'Notes': 'notes',
+}
+DATE_COLUMNS = {
+    'Applied Date': 'applied_date',
+    'Status Date': 'status_date',
+    'Date Archived': 'date_archived',
+}
+
+# Simplify writes dates as YYYY-MM-DD; ISO8601 also accepts full timestamps
+DATE_FORMAT = 'ISO8601'
+
+# Spellings the export (or a hand-edited copy) uses for "no value"
+MISSING_VALUES = ['N/A', 'n/a', 'NA']
+
+# Fields fingerprinted by content_hashes; a change to any of them updates the stored row
+HASH_COLUMNS = [*TEXT_COLUMNS.values(), *DATE_COLUMNS.values(), 'archived']
+
+# Separates fields in a fingerprinted row and stands in for a missing value
+HASH_SEPARATOR = '\x1f'
+HASH_MISSING = '\x00'
+
+# Lookup table for the Archived column; anything else is treated as False
+BOOLEAN_VALUES = {
+    'true': True,
+    'yes': True,
+    'y': True,
+    '1': True,
+    'false': False,
+    'no': False,
+    'n': False,
+    '0': False,
+}
+
+def clean_value(value):
+    """Clean a value from the DataFrame, handling NaN and None"""
+    if pd.isna(value) or value is None:
+        return None
+    return str(value)
+
+def parse_date(date_str):
+    """Parse a date string, returning None if invalid"""
+    if pd.isna(date_str):
+        return None
+    try:
+        return pd.to_datetime(date_str)
+    except (ValueError, TypeError):
+        return None
+
+def generate_unique_id(row):
+    """Generate a consistent unique ID for a row using a hash of key fields
+
+    Creates a SHA-256 hash of company name, job title, and URL to ensure uniqueness
+    while maintaining consistency for the same job data.
+    """
+    # Collect key fields that identify a unique job
+    key_fields = [
+        clean_value(row.get('Company Name', '')),
+        clean_value(row.get('Job Title', '')),
+        clean_value(row.get('Job URL', '')),
+        clean_value(row.get('Applied Date', '')),  # Include date to differentiate repostings
+    ]
+
+    # Create a string from non-None values
+    unique_str = '_'.join([str(field) for field in key_fields if field is not None])
+
+    # Generate SHA-256 hash
+    hash_obj = hashlib.sha256(unique_str.encode())
+    # Take first 12 characters of the hex digest for a shorter but still unique ID
+    return f"gen_{hash_obj.hexdigest()[:12]}"
+
+def _hash_keys(keys):
+    """Hash key strings the same way generate_unique_id does"""
+    sha256 = hashlib.sha256
+    return [f"gen_{sha256(key.encode()).hexdigest()[:12]}" for key in keys]
+
+def _id_key_strings(df):
+    """Build the generate_unique_id key string of every row, column by column
+
+    Mirrors the scalar function exactly: an absent column contributes an empty
+    field, a missing value is skipped, and everything else goes through str().
+    """
+    n = len(df.index)
+    keys = np.full(n, '', dtype=object)
+    has_field = np.zeros(n, dtype=bool)
+
+    for column in ID_KEY_COLUMNS:
+        if column in df.columns:
+            values = df[column].astype(object)
+            present = values.notna().to_numpy()
+            field = values.astype(str).to_numpy(dtype=object)
+        else:
+            present = np.ones(n, dtype=bool)
+            field = np.full(n, '', dtype=object)
+
+        # Join with '_' where a previous field exists, otherwise start the key
+        append = has_field & present
+        keys[append] = keys[append] + '_' + field[append]
+        start = present & ~has_field
+        keys[start] = field[start]
+        has_field |= present
+
+    return keys.tolist()
+
+def generate_unique_ids(df, processes=None):
+    """Generate ``generate_unique_id`` values for every row of a DataFrame
+
+    Produces the same IDs as calling ``generate_unique_id`` row by row, so
+    databases synced with either keep deduplicating against each other.
+
+    Args:
+        df: pandas DataFrame containing job application data
+        processes: Worker processes used for hashing. ``None`` hashes in-process
+            below PARALLEL_ID_MIN_ROWS rows and uses every CPU above it.
+
+    Returns:
+        Series of ``gen_...`` IDs aligned with ``df.index``
+    """
+    keys = _id_key_strings(df)
+
+    if processes is None:
+        processes = (os.cpu_count() or 1) if len(keys) >= PARALLEL_ID_MIN_ROWS else 1
+
+    if processes > 1 and len(keys) > processes:
+        chunk_size = -(-len(keys) // processes)
+        chunks = [keys[start:start + chunk_size] for start in range(0, len(keys), chunk_size)]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            ids = [value for chunk in executor.map(_hash_keys, chunks) for value in chunk]
+    else:
+        ids = _hash_keys(keys)
+
+    return pd.Series(ids, index=df.index, dtype=object)
+
+def compute_simplify_ids(df):
+    """Compute the simplify_id for every row of an export in one pass
+
+    Rows with an ``id`` value keep it; the rest get ``generate_unique_ids``.
+
+    Args:
+        df: pandas DataFrame containing job application data
+
+    Returns:
+        Series of string IDs aligned with ``df.index``
+    """
+    if 'id' in df.columns:
+        ids = df['id'].map(clean_value).astype(object)
+    else:
+        ids = pd.Series(None, index=df.index, dtype=object)
+
+    missing = ids.isna()
+    if missing.any():
+        ids[missing] = generate_unique_ids(df[missing])
+    return ids
+
+def fetch_existing_ids(session, simplify_ids, chunk_size=LOOKUP_CHUNK_SIZE):
+    """Return the subset of ``simplify_ids`` already stored in the database
+
+    Args:
+        session: SQLAlchemy session
+        simplify_ids: Iterable of simplify_id strings
+        chunk_size: Maximum number of IDs bound into a single IN clause
+
+    Returns:
+        Set of IDs that already exist
+    """
+    ids = list(simplify_ids)
+    existing = set()
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        rows = session.execute(
+            select(JobApplication.simplify_id).where(JobApplication.simplify_id.in_(chunk))
+        )
+        existing.update(row[0] for row in rows)
+    return existing
+
+def insert_ignore_duplicates(session, records):
+    """Bulk insert application records, skipping rows whose simplify_id already exists
+
+    Uses ``INSERT ... ON CONFLICT DO NOTHING`` on SQLite and PostgreSQL so a row
+    inserted by a concurrent sync between lookup and insert is not an error.
+    Other dialects get a plain bulk ``INSERT``.
+    """
+    if not records:
+        return
+
+    table = JobApplication.__table__
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        stmt = sqlite.insert(table).on_conflict_do_nothing(index_elements=['simplify_id'])
+    elif dialect == 'postgresql':
+        stmt = postgresql.insert(table).on_conflict_do_nothing(index_elements=['simplify_id'])
+    else:
+        stmt = insert(table)
+    session.execute(stmt, records)
+
+def _text_column(values):
+    """Convert a column to strings, with None for missing values"""
+    values = values.astype(object)
+    missing = (values.isna() | values.isin(MISSING_VALUES)).to_numpy()
+    text = values.astype(str).astype(object)
+    text[missing] = None
+    return text
+
+def _date_column(values):
+    """Parse a column of date strings in one pass, with NaT for missing or invalid values
+
+    Values with a UTC offset (``2025-03-31T10:00:00Z``) are converted to UTC;
+    the stored dates are naive, like the plain dates that make up the export.
+    """
+    values = values.astype(object).mask(values.isin(MISSING_VALUES))
+    # utc=True lets naive and offset values share one column instead of raising
+    dates = pd.to_datetime(values, format=DATE_FORMAT, errors='coerce', utc=True)
+
+    # Retry the (rare) non-ISO values with per-element format inference
+    retry = dates.isna() & values.notna()
+    if retry.any():
+        dates[retry] = pd.to_datetime(values[retry], format='mixed', errors='coerce', utc=True)
+    return dates.dt.tz_localize(None).astype('datetime64[ns]')
+
+def _boolean_column(values):
+    """Map the Archived spellings (Yes/No, True/False, ...) to booleans"""
+    keys = values.astype(object).astype(str).str.strip().str.lower()
+    return keys.map(BOOLEAN_VALUES).fillna(False).astype(bool)
+
+def normalize_simplify_frame(df):
+    """Normalize a raw Simplify export column by column
+
+    Args:
+        df: pandas DataFrame as read from the export CSV
+
+    Returns:
+        DataFrame indexed like ``df`` with one column per JobApplication field:
+        strings (None when missing), datetime64 dates (NaT when missing or
+        invalid), a bool ``archived`` column and the row's ``simplify_id``
+    """
+    with span('sync.normalize', rows=len(df.index)):
+        frame = pd.DataFrame(index=df.index)
+        empty = pd.Series([None] * len(df.index), index=df.index, dtype=object)
+
+        for source, column in TEXT_COLUMNS.items():
+            frame[column] = _text_column(df[source]) if source in df.columns else empty
+        for source, column in DATE_COLUMNS.items():
+            frame[column] = _date_column(df[source] if source in df.columns else empty)
+        frame['archived'] = _boolean_column(df['Archived']) if 'Archived' in df.columns else False
+
+    # IDs hash the raw export values, so they are computed before any cleaning
+    with span('sync.ids', rows=len(df.index)):
+        frame['simplify_id'] = compute_simplify_ids(df)
+    return frame
+
+def frame_to_records(frame):
+    """Convert a normalized frame into column dictionaries for a Core insert"""
+    columns = {}
+    for column in frame.columns:
+        values = frame[column]
+        if column in DATE_COLUMNS.values():
+            values = values.astype(object).where(values.notna(), None)
+        columns[column] = values.tolist()
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+@dataclass
+class SyncSummary:
+    """What a sync changed, by simplify_id"""
+    inserted: list = field(default_factory=list)  # Applications that were not stored yet
+    updated: list = field(default_factory=list)  # Stored applications whose exported fields changed
+    unchanged: int = 0  # Rows identical to what is stored
+    rows: int = 0  # Export rows read, including repeats of the same application
+
+    @property
+    def changed(self):
+        """Whether the sync wrote anything"""
+        return bool(self.inserted or self.updated)
+
+    def merge(self, other):
+        """Add the outcome of another (chunk) sync to this one"""
+        self.inserted.extend(other.inserted)
+        self.updated.extend(other.updated)
+        self.unchanged += other.unchanged
+        self.rows += other.rows
+        return self
+
+def content_hashes(frame):
+    """Fingerprint the exported fields of every row of a normalized frame
+
+    Two rows get the same hash exactly when all HASH_COLUMNS hold the same
+    values, so a re-uploaded export can be compared with the ledger without
+    reading the stored applications.
+
+    Args:
+        frame: DataFrame with the HASH_COLUMNS of ``normalize_simplify_frame``
+
+    Returns:
+        Series of 32-character hex digests aligned with ``frame.index``
+    """
+    n = len(frame.index)
+    keys = None
+    for column in HASH_COLUMNS:
+        values = frame[column]
+        missing = values.isna().to_numpy()
+        if column in DATE_COLUMNS.values():
+            # Nanosecond timestamps as integers; far cheaper than formatting dates
+            text = values.to_numpy(dtype='datetime64[ns]').view('int64').astype(str).astype(object)
+        elif column == 'archived':
+            text = np.where(values.to_numpy(dtype=bool), '1', '0').astype(object)
+        else:
+            text = values.to_numpy(dtype=object, na_value=None)
+        if missing.any():
+            text = text.copy()
+            text[missing] = HASH_MISSING
+        keys = text if keys is None else keys + HASH_SEPARATOR + text
+
+    blake2b = hashlib.blake2b
+    digests = [blake2b(key.encode(), digest_size=16).hexdigest() for key in keys] if n else []
+    return pd.Series(digests, index=frame.index, dtype=object)
+
+def fetch_sync_state(session, simplify_ids, chunk_size=LOOKUP_CHUNK_SIZE):
+    """Look up the stored application and ledger hash for each simplify_id
+
+    Args:
+        session: SQLAlchemy session
+        simplify_ids: Iterable of simplify_id strings
+        chunk_size: Maximum number of IDs bound into a single IN clause
+
+    Returns:
+        DataFrame indexed by the simplify_ids already stored, with the
+        application ``id``, its stored ``status`` and ``status_date`` (as
+        stored, unparsed), its row ``version``, and its
+        ledger ``content_hash`` (None when the application has no ledger entry yet)
+    """
+    ids = list(simplify_ids)
+    rows = []
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        stmt = (
+            select(
+                JobApplication.simplify_id,
+                JobApplication.id,
+                JobApplication.status,
+                # Raw stored text; only the few status changes need it parsed
+                type_coerce(JobApplication.status_date, String).label('status_date'),
+                JobApplication.version,
+                SyncLedger.content_hash,
+            )
+            .outerjoin(SyncLedger, SyncLedger.simplify_id == JobApplication.simplify_id)
+            .where(JobApplication.simplify_id.in_(chunk))
+        )
+        rows.extend(session.execute(stmt).all())
+    state = pd.DataFrame(rows, columns=['simplify_id', 'id', 'status', 'status_date', 'version', 'content_hash'], dtype=object)
+    return state.set_index('simplify_id')
+
+def write_ledger(executor, dialect, entries):
+    """Insert or replace ledger entries (``simplify_id``/``content_hash`` dicts)
+
+    Args:
+        executor: Session or Connection to execute on
+        dialect: Name of the database dialect
+        entries: List of ledger column dictionaries
+    """
+    if not entries:
+        return
+
+    table = SyncLedger.__table__
+    now = datetime.utcnow()
+    entries = [dict(entry, synced_at=now) for entry in entries]
+    if dialect in ('sqlite', 'postgresql'):
+        dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['simplify_id'],
+            set_={'content_hash': stmt.excluded.content_hash, 'synced_at': stmt.excluded.synced_at},
+        )
+        executor.execute(stmt, entries)
+    else:
+        simplify_ids = [entry['simplify_id'] for entry in entries]
+        for start in range(0, len(simplify_ids), LOOKUP_CHUNK_SIZE):
+            chunk = simplify_ids[start:start + LOOKUP_CHUNK_SIZE]
+            executor.execute(delete(table).where(table.c.simplify_id.in_(chunk)))
+        executor.execute(insert(table), entries)
+
+def sync_frame(session, frame):
+    """Insert new applications and update changed ones from a normalized frame
+
+    Every row is classified in one pass by comparing its content hash with the
+    sync ledger: new rows are bulk inserted, rows whose exported fields changed
+    (e.g. a status moving from SAVED to APPLIED) are bulk updated by primary
+    key, and unchanged rows are skipped, so database writes scale with the
+    number of changes rather than the size of the export. Rows repeated within
+    ``frame`` keep the first one. New applications and status changes are
+    appended to the status history (see ``record_status_events``), and the
+    companies they belong to are refreshed (see ``refresh_companies``).
+
+    Args:
+        session: SQLAlchemy session
+        frame: DataFrame produced by ``normalize_simplify_frame``
+
+    Returns:
+        SyncSummary of the inserted, updated and unchanged applications
+    """
+    rows = len(frame.index)
+
+    # Drop repeats inside the upload before touching the database
+    frame = frame[~frame['simplify_id'].duplicated()]
+    with span('sync.canonicalize', rows=len(frame.index)):
+        frame = frame.assign(company_key=canonical_keys(session, frame['company_name']))
+    simplify_ids = frame['simplify_id']
+    with span('sync.hash', rows=len(frame.index)):
+        hashes = content_hashes(frame)
+
+    with span('sync.lookup', rows=len(frame.index)):
+        state = fetch_sync_state(session, simplify_ids)
+    stored_ids = simplify_ids.map(state['id'])
+    stored_hashes = simplify_ids.map(state['content_hash'])
+
+    new_rows = stored_ids.isna()
+    unchanged_rows = ~new_rows & (stored_hashes == hashes)
+    changed_rows = ~new_rows & ~unchanged_rows
+
+    with span('sync.insert', rows=int(new_rows.sum())):
+        insert_ignore_duplicates(session, frame_to_records(frame[new_rows]))
+
+    with span('sync.update', rows=int(changed_rows.sum())):
+        changes = frame_to_records(frame[changed_rows].drop(columns='simplify_id'))
+        if changes:
+            versions = simplify_ids[changed_rows].map(state['version'])
+            for record, application_id, version in zip(changes, stored_ids[changed_rows], versions):
+                record['id'] = int(application_id)
+                record['version'] = int(version) + 1  # Pending dashboard edits of this row become conflicts
+            session.execute(update(JobApplication), changes)
+
+    # Status history: each new application's first status, and every status change
+    with span('sync.history'):
+        inserted_ids = fetch_sync_state(session, simplify_ids[new_rows])['id'] if new_rows.any() else pd.Series(dtype=object)
+        stored_status = simplify_ids.map(state['status'])
+        moved = changed_rows & (frame['status'].fillna('') != stored_status.fillna(''))
+        started = new_rows & simplify_ids.isin(inserted_ids.index)
+        events = pd.DataFrame({
+            'application_id': stored_ids.where(~started, simplify_ids.map(inserted_ids)),
+            'company_name': frame['company_name'],
+            'from_status': stored_status,
+            'to_status': frame['status'],
+            'event_date': frame['status_date'],
+        })[started | moved]
+        events['stage_started'] = pd.to_datetime(simplify_ids[started | moved].map(state['status_date']), format='ISO8601')
+        record_status_events(session, session.get_bind().dialect.name, events, 'sync')
+
+    written = new_rows | changed_rows
+    with span('sync.companies'):
+        refresh_companies(session, frame.loc[written, 'company_key'].unique())
+    with span('sync.ledger', rows=int(written.sum())):
+        write_ledger(session, session.get_bind().dialect.name, [
+            {'simplify_id': simplify_id, 'content_hash': content_hash}
+            for simplify_id, content_hash in zip(simplify_ids[written], hashes[written])
+        ])
+
+    return SyncSummary(
+        inserted=simplify_ids[new_rows].tolist(),
+        updated=simplify_ids[changed_rows].tolist(),
+        unchanged=int(unchanged_rows.sum()),
+        rows=rows,
+    )
+
+def sync_applications(session, df):
+    """Normalize a raw export and sync it into the database
+
+    Args:
+        session: SQLAlchemy session
+        df: pandas DataFrame containing job application data
+
+    Returns:
+        SyncSummary of the inserted, updated and unchanged applications
+    """
+    return sync_frame(session, normalize_simplify_frame(df))
+
+def backfill_sync_ledger(connection, chunk_size=STREAM_CHUNK_SIZE):
+    """Fingerprint stored applications that have no ledger entry yet
+
+    Databases synced before the ledger existed would otherwise see every row
+    of their next upload as changed.
+
+    Returns:
+        Number of ledger entries written
+    """
+    columns = [JobApplication.__table__.c[column] for column in HASH_COLUMNS]
+    stmt = (
+        select(JobApplication.simplify_id, *columns)
+        .outerjoin(SyncLedger, SyncLedger.simplify_id == JobApplication.simplify_id)
+        .where(JobApplication.simplify_id.isnot(None), SyncLedger.id.is_(None))
+    )
+    result = connection.execute(stmt.execution_options(yield_per=chunk_size))
+
+    written = 0
+    for rows in result.partitions():
+        frame = pd.DataFrame(rows, columns=['simplify_id', *HASH_COLUMNS], dtype=object)
+        for column in DATE_COLUMNS.values():
+            frame[column] = pd.to_datetime(frame[column]).astype('datetime64[ns]')
+        frame['archived'] = frame['archived'].fillna(False).astype(bool)
+        entries = [
+            {'simplify_id': simplify_id, 'content_hash': content_hash}
+            for simplify_id, content_hash in zip(frame['simplify_id'], content_hashes(frame))
+        ]
+        write_ledger(connection, connection.dialect.name, entries)
+        written += len(entries)
+    return written
+
+def _source_size(handle):
+    """Total size in bytes of a seekable file object, or None"""
+    try:
+        position = handle.tell()
+        size = handle.seek(0, os.SEEK_END)
+        handle.seek(position)
+        return size
+    except (AttributeError, OSError, ValueError):
+        return None
+
+def _source_position(handle):
+    """Current read position of a file object (the parser reads ahead in blocks)"""
+    try:
+        return handle.tell()
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+def _default_source_key(source):
+    """Resume key for a file path: path, size and modification time"""
+    if isinstance(source, (str, os.PathLike)):
+        stat = os.stat(source)
+        return f"{os.path.abspath(source)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return None
+
+def _load_checkpoint(session, source_key):
+    """Fetch or create the checkpoint for ``source_key``; finished ones start over"""
+    checkpoint = session.query(SyncCheckpoint).filter_by(source_key=source_key).first()
+    if checkpoint is None:
+        checkpoint = SyncCheckpoint(source_key=source_key, rows_committed=0, completed=False)
+        session.add(checkpoint)
+    elif checkpoint.completed:
+        checkpoint.rows_committed = 0
+        checkpoint.completed = False
+    session.commit()
+    return checkpoint
+
+def sync_csv_stream(session, source, chunksize=STREAM_CHUNK_SIZE, progress=None, source_key=None):
+    """Sync an export chunk by chunk, committing each chunk in its own transaction
+
+    Memory stays bounded by ``chunksize`` regardless of file size, and a
+    failure only rolls back the chunk being written. When a ``source_key`` is
+    known (file paths get one automatically) the number of committed rows is
+    checkpointed alongside each chunk, so re-running after a failure skips
+    straight past the work already committed.
+
+    Args:
+        session: SQLAlchemy session
+        source: CSV path, binary/text file object, or an iterable of DataFrames
+        chunksize: Rows per chunk when reading a CSV
+        progress: Optional callback ``progress(rows_processed, fraction)``; fraction
+            is the share of the file consumed, or None when the size is unknown
+        source_key: Stable identifier of the source used for resuming
+
+    Returns:
+        SyncSummary of the inserted, updated and unchanged applications
+    """
+    source_key = source_key or _default_source_key(source)
+    checkpoint = _load_checkpoint(session, source_key) if source_key else None
+    resume_from = checkpoint.rows_committed if checkpoint else 0
+
+    handle = None
+    if isinstance(source, (str, os.PathLike)):
+        handle = open(source, 'rb')
+    elif hasattr(source, 'read'):
+        handle = source
+    size = _source_size(handle) if handle is not None else None
+
+    try:
+        chunks = pd.read_csv(handle, chunksize=chunksize) if handle is not None else iter(source)
+        chunks = timed_iter('sync.parse', chunks)  # Reading the next chunk parses it
+
+        rows_seen = 0
+        summary = SyncSummary()
+        for chunk in chunks:
+            chunk_start = rows_seen
+            rows_seen += len(chunk)
+            if rows_seen <= resume_from:
+                continue  # Already committed by an earlier run
+            if chunk_start < resume_from:
+                chunk = chunk.iloc[resume_from - chunk_start:]
+
+            try:
+                chunk_summary = sync_applications(session, chunk)
+                if checkpoint is not None:
+                    checkpoint.rows_committed = rows_seen
+                with span('sync.commit'):
+                    session.commit()
+            except Exception as e:
+                session.rollback()
+                raise e
+
+            if chunk_summary.changed:
+                data_cache.bump()
+            summary.merge(chunk_summary)
+
+            if progress is not None:
+                fraction = None
+                if size:
+                    fraction = min(_source_position(handle) / size, 1.0)
+                progress(rows_seen, fraction)
+
+        if checkpoint is not None:
+            checkpoint.completed = True
+            session.commit()
+    finally:
+        if handle is not None and handle is not source:
+            handle.close()
+
+    if progress is not None and size:
+        progress(rows_seen, 1.0)
+    return summary
@@ -0,0 +1,287 @@
+"""
+Timing spans, query counters and opt-in profiling for one unit of work
+
+A unit of work (a Streamlit rerun, a command line sync) runs inside
+``record_run``, which makes a ``RunRecorder`` current for the thread. Hot
+paths mark their stages with ``span``; SQLAlchemy cursor events installed by
+``instrument_engine`` count the statements, parameter sets and affected rows
+of each stage. Outside ``record_run`` a span is a no-op, so the library pays
+one context variable lookup per stage when nothing is recording.
+
+The open spans are kept in a context variable too, so work handed to
+``asyncio.to_thread`` or another task nests under the span that started it
+without sharing a stack with the caller.
+
+Finished runs are written as one JSON line to the ``job_tracker.perf``
+logger; set ``JOB_TRACKER_PERF_LOG`` to a file path to append them there.
+"""
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import event
+
+# Environment variable naming a file that receives one JSON line per recorded run
+PERF_LOG_ENV = 'JOB_TRACKER_PERF_LOG'
+
+# Functions listed in a captured cProfile report, by cumulative time
+PROFILE_TOP_FUNCTIONS = 30
+
+# Profilers accepted by ``record_run``; pyinstrument is optional
+PROFILERS = ['cprofile', 'pyinstrument']
+
+logger = logging.getLogger('job_tracker.perf')
+
+_current = contextvars.ContextVar('job_tracker_run', default=None)
+_open_spans = contextvars.ContextVar('job_tracker_spans', default=())  # Tuple of SpanStats, outermost first
+_log_lock = threading.Lock()
+_log_path = None
+
+class SpanStats:
+    """Totals of every span with one name within a run"""
+
+    def __init__(self, name, depth):
+        self.name = name
+        self.depth = depth  # Nesting depth of the first occurrence, for display
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.queries = 0
+        self.rows = 0
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'depth': self.depth,
+            'calls': self.calls,
+            'ms': round(self.seconds * 1000, 3),
+            'max_ms': round(self.max_seconds * 1000, 3),
+            'queries': self.queries,
+            'rows': self.rows,
+        }
+
+class RunRecorder:
+    """Spans and query counters of one unit of work"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.utcnow()
+        self.seconds = None
+        self.spans = {}  # Span name -> SpanStats, in order of first use
+        self.statements = {}  # Statement keyword (SELECT, INSERT, ...) -> count
+        self.parameter_sets = 0
+        self.rows_written = 0
+        self.query_seconds = 0.0
+        self.profile = None  # Text report when profiling was requested
+        self._lock = threading.Lock()  # Spans and statements may be counted from several threads
+
+    @property
+    def queries(self):
+        return sum(self.statements.values())
+
+    def _open(self, name, depth):
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = SpanStats(name, depth)
+        return stats
+
+    def _close(self, stats, seconds, rows):
+        with self._lock:
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.rows += rows
+
+    def count_statement(self, statement, parameter_sets, rows, seconds):
+        """Add one executed statement to the run and the open spans"""
+        keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'OTHER'
+        with self._lock:
+            self.statements[keyword] = self.statements.get(keyword, 0) + 1
+            self.parameter_sets += parameter_sets
+            self.query_seconds += seconds
+            if rows > 0 and keyword != 'SELECT':
+                self.rows_written += rows
+            for stats in _open_spans.get():
+                stats.queries += 1
+
+    def to_dict(self):
+        """JSON-ready summary of the run"""
+        return {
+            'run': self.name,
+            'started_at': self.started_at.isoformat(),
+            'ms': round((self.seconds or 0.0) * 1000, 3),
+            'queries': self.queries,
+            'statements': dict(self.statements),
+            'parameter_sets': self.parameter_sets,
+            'rows_written': self.rows_written,
+            'query_ms': round(self.query_seconds * 1000, 3),
+            'spans': [stats.to_dict() for stats in self.spans.values()],
+        }
+
+class Span:
+    """Context manager timing one stage of the current run (see ``span``)"""
+
+    __slots__ = ('name', 'rows', '_run', '_stats', '_parents', '_start')
+
+    def __init__(self, name, rows=0):
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self._run = _current.get()
+        if self._run is not None:
+            self._parents = _open_spans.get()
+            self._stats = self._run._open(self.name, len(self._parents))
+            _open_spans.set(self._parents + (self._stats,))
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._run is not None:
+            # Restore rather than reset a token: a generator's span may close in another context
+            _open_spans.set(self._parents)
+            self._run._close(self._stats, time.perf_counter() - self._start, self.rows)
+        return False
+
+def span(name, rows=0):
+    """Time a stage of the current run; a no-op when no run is recording
+
+    Args:
+        name: Stage name, e.g. ``'sync.lookup'``
+        rows: Optional number of rows the stage produced or consumed; can
+            also be set on the returned Span inside the block
+
+    Returns:
+        Span to use in a ``with`` statement
+    """
+    return Span(name, rows)
+
+def timed_iter(name, iterable):
+    """Yield from ``iterable``, timing each step (e.g. reading the next CSV chunk) as span ``name``"""
+    iterator = iter(iterable)
+    while True:
+        with span(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+def current_run():
+    """The recorder of the run in progress in this thread, or None"""
+    return _current.get()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault('job_tracker_query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    run = _current.get()
+    if run is None:
+        return
+    starts = conn.info.get('job_tracker_query_start')
+    seconds = time.perf_counter() - starts.pop() if starts else 0.0
+    parameter_sets = len(parameters) if executemany else 1
+    run.count_statement(statement, parameter_sets, max(cursor.rowcount, 0), seconds)
+
+def instrument_engine(engine):
+    """Count the statements executed through ``engine`` into the current run (idempotent)"""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    return engine
+
+def _profile_report(profiler, kind):
+    """Text report of a stopped profiler"""
+    if kind == 'pyinstrument':
+        return profiler.output_text(unicode=True, color=False)
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+    return stream.getvalue()
+
+def _start_profiler(kind):
+    """Start a profiler of the requested kind; pyinstrument falls back to cProfile when missing"""
+    if kind == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            kind = 'cprofile'
+        else:
+            profiler = Profiler()
+            profiler.start()
+            return profiler, kind
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler, kind
+
+def _stop_profiler(profiler, kind):
+    if kind == 'pyinstrument':
+        profiler.stop()
+    else:
+        profiler.disable()
+
+def log_run(run):
+    """Write a finished run as one JSON line to the ``job_tracker.perf`` logger"""
+    _configure_log_file()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(run.to_dict()))
+
+def _configure_log_file():
+    """Attach a file handler for ``JOB_TRACKER_PERF_LOG`` the first time it is seen"""
+    global _log_path
+    path = os.environ.get(PERF_LOG_ENV)
+    if not path or path == _log_path:
+        return
+    with _log_lock:
+        if path == _log_path:
+            return
+        handler = logging.FileHandler(path, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        for old in [h for h in logger.handlers if getattr(h, 'job_tracker_perf', False)]:
+            logger.removeHandler(old)
+            old.close()
+        handler.job_tracker_perf = True
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        _log_path = path
+
+@contextmanager
+def record_run(name, profile=None):
+    """Record spans and queries of the block as one run, then log it
+
+    Args:
+        name: Run name written to the log, e.g. ``'rerun'`` or ``'sync'``
+        profile: Optional profiler to run around the block: 'cprofile' or
+            'pyinstrument' (cProfile is used when pyinstrument is missing)
+
+    Yields:
+        The RunRecorder; its totals and ``profile`` report are complete after the block
+    """
+    if profile is not None and profile not in PROFILERS:
+        raise ValueError(f"Unknown profiler: {profile}")
+    run = RunRecorder(name)
+    token = _current.set(run)
+    spans_token = _open_spans.set(())
+    profiler = None
+    if profile is not None:
+        profiler, profile = _start_profiler(profile)
+    start = time.perf_counter()
+    try:
+        yield run
+    finally:
+        run.seconds = time.perf_counter() - start
+        if profiler is not None:
+            _stop_profiler(profiler, profile)
+            run.profile = _profile_report(profiler, profile)
+        _open_spans.reset(spans_token)
+        _current.reset(token)
+        log_run(run)
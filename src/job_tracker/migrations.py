@@ -0,0 +1,190 @@
+"""
+Schema migrations for databases created by earlier versions
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select, update
+from sqlalchemy.schema import CreateIndex
+
+from job_tracker.models import Company, CompanyAlias, CompanyStatus, JobApplication, StatusEvent, StatusRollup, SyncLedger, TableCount
+
+metadata = MetaData()
+
+# One row per applied migration
+schema_migrations = Table(
+    'schema_migrations',
+    metadata,
+    Column('version', Integer, primary_key=True),
+    Column('name', String(255), nullable=False),
+    Column('applied_at', DateTime, default=datetime.utcnow),
+)
+
+def _create_indexes(connection, table, names):
+    """Create the named indexes declared on ``table`` if they do not exist yet"""
+    for index in table.indexes:
+        if index.name in names:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
+def add_job_application_indexes(connection):
+    """Index the columns used by the company stats, status filters and date ordering"""
+    _create_indexes(connection, JobApplication.__table__, {
+        'ix_job_applications_company_name',
+        'ix_job_applications_status',
+        'ix_job_applications_applied_date',
+        'ix_job_applications_archived_status_date',
+        'ix_job_applications_company_key',
+    })
+
+def add_search_index(connection):
+    """Mirror the searchable text into an FTS5 table on SQLite builds that support it"""
+    from job_tracker.search import fts5_available, install_fts5_index
+
+    if fts5_available(connection):
+        install_fts5_index(connection)
+
+def add_sync_ledger(connection):
+    """Create the sync ledger and fingerprint the applications already stored"""
+    from job_tracker.ingest import backfill_sync_ledger
+
+    SyncLedger.__table__.create(connection, checkfirst=True)
+    backfill_sync_ledger(connection)
+
+def add_updated_at(connection):
+    """Track when each application was last written, for incremental snapshot rebuilds"""
+    table = JobApplication.__table__
+    columns = {column['name'] for column in inspect(connection).get_columns(table.name)}
+    if 'updated_at' not in columns:
+        connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN updated_at DATETIME")
+        connection.execute(update(table).values(updated_at=datetime.utcnow()))
+    _create_indexes(connection, table, {'ix_job_applications_updated_at'})
+
+def add_status_history(connection):
+    """Create the status event log and rollups, seeded with each application's current status"""
+    from job_tracker.history import backfill_status_events
+
+    StatusEvent.__table__.create(connection, checkfirst=True)
+    StatusRollup.__table__.create(connection, checkfirst=True)
+    backfill_status_events(connection)
+
+def add_companies(connection):
+    """Key applications by normalized company name and build the company table"""
+    from job_tracker.companies import rebuild_companies
+
+    table = JobApplication.__table__
+    columns = {column['name'] for column in inspect(connection).get_columns(table.name)}
+    if 'company_key' not in columns:
+        connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN company_key VARCHAR(255)")
+    _create_indexes(connection, table, {'ix_job_applications_company_key_date'})
+    Company.__table__.create(connection, checkfirst=True)
+    CompanyStatus.__table__.create(connection, checkfirst=True)
+    CompanyAlias.__table__.create(connection, checkfirst=True)  # Used by rebuild_companies since version 7
+    rebuild_companies(connection)
+
+def add_company_aliases(connection):
+    """Merge fuzzy company name variants, persisting the alias decisions"""
+    from job_tracker.companies import rebuild_companies
+
+    CompanyAlias.__table__.create(connection, checkfirst=True)
+    rebuild_companies(connection)
+
+def add_row_version(connection):
+    """Add the row version checked by dashboard edits (optimistic concurrency)"""
+    table = JobApplication.__table__
+    columns = {column['name'] for column in inspect(connection).get_columns(table.name)}
+    if 'version' not in columns:
+        connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+def add_table_counts(connection):
+    """Keep the application count in a row maintained by triggers, so reading it scans nothing
+
+    Only SQLite gets the triggers; elsewhere ``snapshot.table_version`` counts
+    the table instead.
+    """
+    TableCount.__table__.create(connection, checkfirst=True)
+    if connection.dialect.name != 'sqlite':
+        return
+    table = JobApplication.__table__.name
+    for event, change in [('INSERT', '+ 1'), ('DELETE', '- 1')]:
+        connection.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_count_{event.lower()} AFTER {event} ON {table} BEGIN "
+            f"UPDATE table_counts SET rows = rows {change} WHERE name = '{table}'; END"
+        )
+    rows = connection.execute(select(func.count()).select_from(JobApplication.__table__)).scalar()
+    connection.execute(TableCount.__table__.delete().where(TableCount.name == table))
+    connection.execute(TableCount.__table__.insert().values(name=table, rows=rows))
+
+def rematch_company_aliases(connection):
+    """Match company names again, undoing merges of distinct employers made before the first-word check"""
+    from job_tracker.companies import rebuild_companies
+
+    rebuild_companies(connection)
+
+def recount_companies(connection):
+    """Recompute the company table without applications that have no applied date"""
+    from job_tracker.companies import refresh_companies
+
+    keys = connection.execute(select(JobApplication.company_key).distinct()).scalars().all()
+    refresh_companies(connection, keys)
+
+# Ordered list of (version, migration); append new migrations, never reorder
+MIGRATIONS = [
+    (1, add_job_application_indexes),
+    (2, add_search_index),
+    (3, add_sync_ledger),
+    (4, add_updated_at),
+    (5, add_status_history),
+    (6, add_companies),
+    (7, add_company_aliases),
+    (8, add_row_version),
+    (9, add_table_counts),
+    (10, rematch_company_aliases),
+    (11, recount_companies),
+]
+
+def current_version(connection):
+    """Return the highest applied migration version (0 for a fresh database)"""
+    metadata.create_all(connection)
+    versions = connection.execute(select(schema_migrations.c.version)).scalars().all()
+    return max(versions, default=0)
+
+def _apply(connection, number, migration):
+    """Run one migration and record its version"""
+    migration(connection)
+    connection.execute(schema_migrations.insert().values(version=number, name=migration.__name__))
+
+def migrate(engine):
+    """Apply pending migrations, each in its own transaction
+
+    Migrations must be idempotent: a database built by ``create_all`` already
+    has the current schema and only needs its versions recorded.
+
+    Returns:
+        List of versions applied by this call
+    """
+    with engine.begin() as connection:
+        version = current_version(connection)
+
+    applied = []
+    for number, migration in MIGRATIONS:
+        if number <= version:
+            continue
+        with engine.begin() as connection:
+            _apply(connection, number, migration)
+        applied.append(number)
+    return applied
+
+def migrate_connection(connection):
+    """Apply pending migrations on an open connection, inside the caller's transaction
+
+    Used where only a connection is available, e.g. ``AsyncConnection.run_sync``.
+
+    Returns:
+        List of versions applied by this call
+    """
+    version = current_version(connection)
+    applied = []
+    for number, migration in MIGRATIONS:
+        if number > version:
+            _apply(connection, number, migration)
+            applied.append(number)
+    return applied
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime, Integer, String, Text, Boolean, create_engine, ForeignKey
+from sqlalchemy import Column, Date, DateTime, Float, Integer, String, Text, Boolean, Index, ForeignKey, func
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 
 Base = declarative_base()
@@ -18,10 +18,28 @@ class JobApplication(Base):
     date_archived = Column(DateTime)
     notes = Column(Text)
     simplify_id = Column(String(255), unique=True)  # To prevent duplicates
+    company_key = Column(String(255))  # Normalized company name, the key of the companies table
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Last insert or update
+    version = Column(Integer, nullable=False, default=1, server_default='1')  # Incremented by every sync update and edit
+
+
+    __table_args__ = (
+        # Company lookups and the per-company stats (count + latest applied date) read this index only
+        Index('ix_job_applications_company_name', 'company_name', 'applied_date'),
+        Index('ix_job_applications_status', 'status'),
+        Index('ix_job_applications_applied_date', 'applied_date'),
+        Index('ix_job_applications_archived_status_date', 'archived', 'status_date'),
+        Index('ix_job_applications_updated_at', 'updated_at'),
+        # Refreshing a company's row aggregates only its applications
+        Index('ix_job_applications_company_key_date', 'company_key', 'applied_date'),
+    )
 
     def __repr__(self):
         return f"<JobApplication(company='{self.company_name}', position='{self.job_title}')>"
 
+# Case-folded company key for case-insensitive company lookups
+Index('ix_job_applications_company_key', func.lower(JobApplication.company_name))
+
 class UserPreferences(Base):
     __tablename__ = 'user_preferences'
 
@@ -92,9 +110,139 @@ class UserPreferences(Base):
         session.commit()
         return prefs
 
+class SyncCheckpoint(Base):
+    __tablename__ = 'sync_checkpoints'
+
+    id = Column(Integer, primary_key=True)
+    source_key = Column(String(512), unique=True, nullable=False)  # Identifies the file being synced
+    rows_committed = Column(Integer, default=0, nullable=False)  # Rows covered by committed chunks
+    completed = Column(Boolean, default=False, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SyncCheckpoint(source='{self.source_key}', rows={self.rows_committed})>"
+
+class SyncLedger(Base):
+    __tablename__ = 'sync_ledger'
+
+    id = Column(Integer, primary_key=True)
+    simplify_id = Column(String(255), unique=True, nullable=False)  # Matches JobApplication.simplify_id
+    content_hash = Column(String(32), nullable=False)  # Fingerprint of the exported field values
+    synced_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SyncLedger(simplify_id='{self.simplify_id}', hash='{self.content_hash}')>"
+
+class SyncRun(Base):
+    __tablename__ = 'sync_runs'
+
+    id = Column(Integer, primary_key=True)
+    file_hash = Column(String(64), unique=True, nullable=False)  # SHA-256 of the uploaded bytes
+    size = Column(Integer, nullable=False)  # File size in bytes
+    base_run_id = Column(Integer, ForeignKey('sync_runs.id'))  # Earlier upload this file extends, if any
+    rows = Column(Integer, default=0, nullable=False)  # Rows parsed (only the tail for an extension)
+    inserted = Column(Integer, default=0, nullable=False)
+    updated = Column(Integer, default=0, nullable=False)
+    unchanged = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SyncRun(hash='{self.file_hash[:12]}', size={self.size}, rows={self.rows})>"
+
+class TableCount(Base):
+    __tablename__ = 'table_counts'
+
+    name = Column(String(64), primary_key=True)  # Counted table
+    rows = Column(Integer, default=0, nullable=False)  # Kept current by triggers (see migrations.add_table_counts)
+
+    def __repr__(self):
+        return f"<TableCount(name='{self.name}', rows={self.rows})>"
+
+class Company(Base):
+    __tablename__ = 'companies'
+
+    key = Column(String(255), primary_key=True)  # Normalized name (see job_tracker.companies.company_keys)
+    name = Column(String(255), nullable=False)  # Most common spelling among the company's applications
+    applications = Column(Integer, default=0, nullable=False)
+    latest_applied = Column(DateTime)  # Most recent applied date, if any application has one
+
+    def __repr__(self):
+        return f"<Company(key='{self.key}', applications={self.applications})>"
+
+# The Company Statistics panel reads companies in this order straight from the index
+Index('ix_companies_applications', Company.applications.desc(), Company.key)
+
+class CompanyAlias(Base):
+    __tablename__ = 'company_aliases'
+
+    alias_key = Column(String(255), primary_key=True)  # A normalized company key as seen in an export
+    canonical_key = Column(String(255), nullable=False)  # Key it was merged into (itself if canonical)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_company_aliases_canonical_key', 'canonical_key'),
+    )
+
+    def __repr__(self):
+        return f"<CompanyAlias('{self.alias_key}' -> '{self.canonical_key}')>"
+
+class CompanyStatus(Base):
+    __tablename__ = 'company_statuses'
+
+    company_key = Column(String(255), ForeignKey('companies.key'), primary_key=True)
+    status = Column(String(50), primary_key=True)
+    applications = Column(Integer, default=0, nullable=False)  # The company's applications in this status
+
+    def __repr__(self):
+        return f"<CompanyStatus(company='{self.company_key}', status='{self.status}', applications={self.applications})>"
+
+class StatusEvent(Base):
+    __tablename__ = 'status_events'
+
+    id = Column(Integer, primary_key=True)
+    application_id = Column(Integer, ForeignKey('job_applications.id'), nullable=False)
+    company_name = Column(String(255), nullable=False)  # Company at the time of the change
+    from_status = Column(String(50))  # None for the application's first status
+    to_status = Column(String(50), nullable=False)
+    event_date = Column(DateTime, nullable=False)  # When the status changed (the export's status date)
+    source = Column(String(20), nullable=False)  # What recorded it: 'sync', 'edit' or 'backfill'
+    recorded_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_status_events_application_id', 'application_id', 'event_date'),
+    )
+
+    def __repr__(self):
+        return f"<StatusEvent(application={self.application_id}, {self.from_status} -> {self.to_status})>"
+
+class StatusRollup(Base):
+    __tablename__ = 'status_rollups'
+
+    # Company-first key: one company's or all companies' days are a single range scan
+    company_name = Column(String(255), primary_key=True)  # '' holds the totals over all companies
+    day = Column(Date, primary_key=True)
+    status = Column(String(50), primary_key=True)
+    entered = Column(Integer, default=0, nullable=False)  # Applications moved into this status
+    reached = Column(Integer, default=0, nullable=False)  # Applications that first reached this pipeline stage
+    exited = Column(Integer, default=0, nullable=False)  # Applications moved out of this status
+    timed_exits = Column(Integer, default=0, nullable=False)  # Exits whose time in the status is known
+    stage_seconds = Column(Float, default=0.0, nullable=False)  # Total time in the status of the timed exits
+
+    def __repr__(self):
+        return f"<StatusRollup(company='{self.company_name}', day={self.day}, status='{self.status}')>"
+
 # Create database engine and session
-def init_db(db_url="sqlite:///job_tracker.db"):
-    engine = create_engine(db_url)
+def init_engine(db_url="sqlite:///job_tracker.db", **pool_options):
+    """Create a pooled engine (see ``create_db_engine``) with an up-to-date schema"""
+    from job_tracker.database import create_db_engine
+    from job_tracker.migrations import migrate
+
+    engine = create_db_engine(db_url, **pool_options)
     Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    return Session() 
\ No newline at end of file
+    # create_all skips tables that already exist, so upgrades go through migrations
+    migrate(engine)
+    return engine
+
+def init_db(db_url="sqlite:///job_tracker.db"):
+    Session = sessionmaker(bind=init_engine(db_url))
+    return Session()
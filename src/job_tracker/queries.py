@@ -0,0 +1,199 @@
+"""
+Read queries for the dashboard, evaluated in the database
+"""
+import pandas as pd
+from sqlalchemy import Boolean, DateTime, Integer, String, func, select, tuple_, type_coerce
+
+from job_tracker.frames import apply_schema, contains_text, typed_array
+from job_tracker.instrumentation import span
+from job_tracker.models import JobApplication
+
+COMPANY_STATS_COLUMNS = ['Company', 'Applications', 'Most Recent']
+
+# Rows per page of the applications table
+DEFAULT_PAGE_SIZE = 100
+
+# Applications table columns as displayed, and the model attributes behind them
+DISPLAY_COLUMNS = {
+    'Job Title': 'job_title',
+    'Company': 'company_name',
+    'Status': 'status',
+    'Applied Date': 'applied_date',
+    'Status Date': 'status_date',
+    'Archived': 'archived',
+    'Date Archived': 'date_archived',
+    'Notes': 'notes',
+    'Job URL': 'job_url',
+}
+
+def company_stats_query(search=None):
+    """Build the per-company aggregation: application count and latest applied date
+
+    Args:
+        search: Optional case-insensitive substring the company name must contain
+    """
+    applications = func.count().label('Applications')
+    stmt = (
+        select(
+            JobApplication.company_name.label('Company'),
+            applications,
+            func.max(JobApplication.applied_date).label('Most Recent'),
+        )
+        .where(JobApplication.applied_date.isnot(None))
+        .group_by(JobApplication.company_name)
+        .order_by(applications.desc(), JobApplication.company_name)
+    )
+    if search:
+        # Literal substring match; % and _ in the search text are escaped
+        stmt = stmt.where(func.lower(JobApplication.company_name).contains(search.lower(), autoescape=True))
+    return stmt
+
+def get_company_stats(session, search=None):
+    """Calculate statistics for each company
+    
+    Args:
+        session: SQLAlchemy session
+        search: Optional company name filter (case-insensitive substring)
+        
+    Returns:
+        DataFrame indexed by company (categorical) with Applications, Most
+        Recent and Days Since Last columns, sorted by number of applications
+    """
+    with span('company_stats'):
+        return company_stats_frame(session.execute(company_stats_query(search)).all())
+
+def company_stats_frame(rows):
+    """Build the company stats frame from ``company_stats_query`` rows"""
+    stats = pd.DataFrame(rows, columns=COMPANY_STATS_COLUMNS)
+    stats['Most Recent'] = pd.to_datetime(stats['Most Recent'])
+    stats = apply_schema(stats.set_index('Company'))
+    
+    # Calculate days since last application
+    today = pd.Timestamp.now()
+    stats['Days Since Last'] = (today - stats['Most Recent']).dt.days
+    
+    return stats
+
+def filter_company_stats(stats, search=None):
+    """Filter a ``get_company_stats`` frame in memory, like its ``search`` argument
+
+    Matches the categorical company index once per distinct name, so a
+    cached all-companies frame can serve every search without a query.
+    """
+    if not search:
+        return stats
+    return stats[contains_text(stats.index, search)]
+
+def _raw_column(column):
+    """Select a column without per-value result processing
+
+    SQLite stores dates as ISO strings and booleans as 0/1; fetching them raw
+    and converting whole columns afterwards avoids one Python call per value.
+    """
+    if isinstance(column.type, DateTime):
+        return type_coerce(column, String).label(column.key)
+    if isinstance(column.type, Boolean):
+        return type_coerce(column, Integer).label(column.key)
+    return column
+
+def _display_columns(columns):
+    """Display names and table columns to load, in display order"""
+    names = [name for name in DISPLAY_COLUMNS if columns is None or name in columns]
+    return names, [JobApplication.__table__.c[DISPLAY_COLUMNS[name]] for name in names]
+
+def _rows_to_frame(names, rows):
+    """Transpose ``(id, *values)`` rows into a DataFrame indexed by id, typed by ``FRAME_SCHEMA``"""
+    with span('frame.build', rows=len(rows)):
+        ids, *arrays = zip(*rows) if rows else [()] * (len(names) + 1)
+        return pd.DataFrame(
+            {name: typed_array(name, values) for name, values in zip(names, arrays)},
+            index=pd.Index(ids, dtype='int64', name='id'),
+            columns=names,
+        )
+
+def load_applications_frame(session, columns=None, where=None):
+    """Load applications into a DataFrame straight from a Core select
+
+    Reads rows as tuples and transposes them into column arrays, skipping ORM
+    object hydration entirely.
+
+    Args:
+        session: SQLAlchemy session
+        columns: Display column names to load (defaults to all of DISPLAY_COLUMNS)
+        where: Optional SQL criterion restricting which applications are loaded
+
+    Returns:
+        DataFrame indexed by application id with the ``FRAME_SCHEMA`` dtypes:
+        categorical Company and Status, Arrow string text columns,
+        datetime64 dates and a nullable boolean Archived column
+    """
+    names, table_columns = _display_columns(columns)
+    stmt = select(JobApplication.id, *[_raw_column(column) for column in table_columns]).order_by(JobApplication.id)
+    if where is not None:
+        stmt = stmt.where(where)
+    # Core execution on the session's connection: plain tuples, no ORM row handling
+    rows = session.connection().execute(stmt).fetchall()
+    return _rows_to_frame(names, rows)
+
+def count_applications(session):
+    """Total number of stored applications"""
+    return session.execute(select(func.count()).select_from(JobApplication)).scalar_one()
+
+def load_applications_page(session, columns=None, page_size=DEFAULT_PAGE_SIZE, after=None):
+    """Load one page of applications, newest applied date first
+
+    Uses keyset pagination on ``(applied_date, id)``: each page continues
+    strictly after the previous page's last row, so the cost of a page depends
+    on ``page_size`` only (an index range scan), never on how deep the page is.
+    Applications without an applied date come last, newest id first.
+
+    Args:
+        session: SQLAlchemy session
+        columns: Display column names to load (defaults to all of DISPLAY_COLUMNS)
+        page_size: Maximum number of rows in the page
+        after: Cursor returned with the previous page, or None for the first page
+
+    Returns:
+        ``(frame, next_cursor)``; ``next_cursor`` is None on the last page
+    """
+    names, table_columns = _display_columns(columns)
+    applied = type_coerce(JobApplication.applied_date, String)  # Cursor values compare in stored form
+    connection = session.connection()
+    stmt = select(JobApplication.id, applied, *[_raw_column(column) for column in table_columns])
+    limit = page_size + 1  # One extra row tells whether another page follows
+
+    rows = []
+    if after is None or after[0] is not None:
+        dated = stmt.where(JobApplication.applied_date.isnot(None))
+        if after is not None:
+            dated = dated.where(tuple_(applied, JobApplication.id) < tuple_(*after))
+        dated = dated.order_by(JobApplication.applied_date.desc(), JobApplication.id.desc()).limit(limit)
+        rows = connection.execute(dated).fetchall()
+
+    if len(rows) < limit:
+        undated = stmt.where(JobApplication.applied_date.is_(None))
+        if after is not None and after[0] is None:
+            undated = undated.where(JobApplication.id < after[1])
+        undated = undated.order_by(JobApplication.id.desc()).limit(limit - len(rows))
+        rows += connection.execute(undated).fetchall()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = (rows[-1][1], rows[-1][0])
+
+    frame = _rows_to_frame(names, [(row[0], *row[2:]) for row in rows])
+    return frame, next_cursor
+
+def load_applications_by_ids(session, ids, columns=None):
+    """Load the given applications, keeping the order of ``ids`` (e.g. a search ranking)"""
+    names, table_columns = _display_columns(columns)
+    stmt = select(JobApplication.id, *[_raw_column(column) for column in table_columns]).where(JobApplication.id.in_(ids))
+    rows = session.connection().execute(stmt).fetchall()
+    frame = _rows_to_frame(names, rows)
+    return frame.reindex(pd.Index(ids, dtype='int64', name='id').intersection(frame.index, sort=False))
+
+def load_row_versions(session, ids):
+    """Row version of each of the given applications, for version-checked edits (see ``job_tracker.edits``)"""
+    stmt = select(JobApplication.id, JobApplication.version).where(JobApplication.id.in_([int(i) for i in ids]))
+    return dict(session.execute(stmt).all())
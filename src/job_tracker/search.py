@@ -0,0 +1,280 @@
+"""
+Full-text search over job titles, company names and notes
+"""
+import bisect
+import itertools
+import math
+import re
+from collections import defaultdict
+
+from sqlalchemy import select, text
+
+from job_tracker.cache import data_cache
+from job_tracker.instrumentation import span
+from job_tracker.models import JobApplication
+
+FTS_TABLE = 'job_applications_fts'
+
+# Indexed columns and their BM25 weights (a title hit outranks a notes hit)
+SEARCH_FIELDS = {
+    'job_title': 10.0,
+    'company_name': 5.0,
+    'notes': 1.0,
+}
+
+# Ranking every match costs a few microseconds each; broader queries with a
+# result limit return the newest matches instead of BM25 order
+RANK_MAX_MATCHES = 5000
+
+# Same word definition as FTS5's unicode61 tokenizer: runs of letters and digits
+WORD = re.compile(r'[^\W_]+')
+
+# A quoted phrase or a bare word (which may itself contain punctuation)
+QUERY_PART = re.compile(r'"([^"]*)"\*?|(\S+)')
+
+def tokenize(value):
+    """Split text into lowercase search tokens"""
+    return WORD.findall(value.lower()) if value else []
+
+def parse_query(query):
+    """Parse a search box query into clauses that must all match
+
+    Bare words match as prefixes so results update while typing, a trailing
+    ``*`` does the same explicitly, and ``"quoted text"`` matches an exact
+    phrase. Punctuation never has special meaning: ``c++`` searches for ``c``
+    and ``e-commerce`` for the phrase ``e commerce``.
+
+    Returns:
+        List of ``(tokens, prefix)`` tuples; ``prefix`` applies to the last token
+    """
+    clauses = []
+    for match in QUERY_PART.finditer(query or ''):
+        phrase, word = match.groups()
+        if phrase is not None:
+            tokens = tokenize(phrase)
+            prefix = match.group(0).endswith('*')
+        else:
+            tokens = tokenize(word)
+            prefix = True
+        if tokens:
+            clauses.append((tokens, prefix))
+    return clauses
+
+def fts5_expression(clauses):
+    """Render parsed clauses as an FTS5 MATCH expression"""
+    parts = []
+    for tokens, prefix in clauses:
+        parts.append('"' + ' '.join(tokens) + '"' + ('*' if prefix else ''))
+    return ' AND '.join(parts)
+
+def fts5_available(connection):
+    """Whether the connection is SQLite with the FTS5 extension compiled in"""
+    if connection.dialect.name != 'sqlite':
+        return False
+    options = {row[0] for row in connection.execute(text("PRAGMA compile_options"))}
+    return 'ENABLE_FTS5' in options
+
+def has_fts5_index(connection):
+    """Whether the FTS5 mirror of job_applications exists in this database"""
+    if connection.dialect.name != 'sqlite':
+        return False
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': FTS_TABLE},
+    ).first() is not None
+
+def install_fts5_index(connection):
+    """Create the FTS5 table mirroring job_applications, its sync triggers, and fill it
+
+    The table uses job_applications as external content, so the text is not
+    stored twice; the triggers keep the index in step with every insert,
+    update and delete, including bulk Core statements.
+    """
+    columns = ', '.join(SEARCH_FIELDS)
+    new_values = ', '.join(f'new.{column}' for column in SEARCH_FIELDS)
+    old_values = ', '.join(f'old.{column}' for column in SEARCH_FIELDS)
+    statements = [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {columns}, content='job_applications', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON job_applications BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON job_applications BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON job_applications BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});
+        END""",
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+    ]
+    for statement in statements:
+        connection.execute(text(statement))
+
+class InvertedIndex:
+    """In-memory inverted index with BM25 ranking, for databases without FTS5
+
+    Postings keep token positions per application so phrases can be checked;
+    each field's positions are offset so a phrase never spans two fields.
+    """
+
+    FIELD_GAP = 1_000_000
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, rows):
+        """Build the index from ``(id, job_title, company_name, notes)`` rows"""
+        weights = list(SEARCH_FIELDS.values())
+        self.postings = defaultdict(dict)  # token -> {id: [positions]}
+        self.weighted_tf = defaultdict(dict)  # token -> {id: field-weighted term frequency}
+        self.doc_lengths = {}
+
+        for row in rows:
+            doc_id, fields = row[0], row[1:]
+            length = 0
+            for field_number, (value, weight) in enumerate(zip(fields, weights)):
+                tokens = tokenize(value)
+                length += len(tokens)
+                offset = field_number * self.FIELD_GAP
+                for position, token in enumerate(tokens):
+                    self.postings[token].setdefault(doc_id, []).append(offset + position)
+                    self.weighted_tf[token][doc_id] = self.weighted_tf[token].get(doc_id, 0.0) + weight
+            self.doc_lengths[doc_id] = length
+
+        self.vocabulary = sorted(self.postings)
+        self.average_length = (sum(self.doc_lengths.values()) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+
+    def _expand(self, token, prefix):
+        """Vocabulary tokens matching ``token`` (every completion when ``prefix``)"""
+        if not prefix:
+            return [token] if token in self.postings else []
+        start = bisect.bisect_left(self.vocabulary, token)
+        end = bisect.bisect_left(self.vocabulary, token + '\U0010ffff')
+        return self.vocabulary[start:end]
+
+    def _docs(self, tokens):
+        """Applications containing any of the alternative ``tokens``"""
+        if len(tokens) == 1:
+            return self.postings[tokens[0]].keys()
+        return set().union(*(self.postings[token] for token in tokens))
+
+    def _has_phrase(self, doc_id, alternatives):
+        """Whether the alternatives occur at consecutive positions in one field"""
+        positions = [
+            set().union(*(self.postings[token].get(doc_id, ()) for token in options))
+            for options in alternatives
+        ]
+        return any(
+            all(start + i in positions[i] for i in range(1, len(positions)))
+            for start in positions[0]
+        )
+
+    def search(self, clauses, limit=None):
+        """Return application ids matching every clause, best BM25 score first"""
+        if not clauses:
+            return []
+
+        candidates = None
+        phrases = []
+        scored_tokens = []
+        for tokens, prefix in clauses:
+            alternatives = [self._expand(token, prefix and i == len(tokens) - 1) for i, token in enumerate(tokens)]
+            if not all(alternatives):
+                return []
+            for options in alternatives:
+                docs = self._docs(options)
+                candidates = set(docs) if candidates is None else candidates.intersection(docs)
+            if len(tokens) > 1:
+                phrases.append(alternatives)
+            scored_tokens.extend(token for options in alternatives for token in options)
+            if not candidates:
+                return []
+
+        def has_phrases(doc_id):
+            return all(self._has_phrase(doc_id, alternatives) for alternatives in phrases)
+
+        if limit is not None and len(candidates) > RANK_MAX_MATCHES:
+            # Broad query: newest matches first, checking phrases only until the limit is reached
+            newest = (doc_id for doc_id in sorted(candidates, reverse=True) if has_phrases(doc_id))
+            return list(itertools.islice(newest, limit))
+
+        matched = {doc_id for doc_id in candidates if has_phrases(doc_id)} if phrases else candidates
+        total = len(self.doc_lengths)
+        scores = dict.fromkeys(matched, 0.0)
+        for token in set(scored_tokens):
+            frequencies = self.weighted_tf[token]
+            idf = math.log(1 + (total - len(frequencies) + 0.5) / (len(frequencies) + 0.5))
+            for doc_id in matched.intersection(frequencies):
+                tf = frequencies[doc_id]
+                norm = self.K1 * (1 - self.B + self.B * self.doc_lengths[doc_id] / (self.average_length or 1))
+                scores[doc_id] += idf * tf * (self.K1 + 1) / (tf + norm)
+
+        ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+        return ranked[:limit] if limit is not None else ranked
+
+def build_inverted_index(session):
+    """Build an InvertedIndex over every application in the database
+
+    Next to a SQLite file the rows come from the columnar snapshot (see
+    ``job_tracker.snapshot``), which is only refreshed here, when the index is
+    rebuilt after the data changed; otherwise the table is scanned.
+    """
+    from job_tracker.queries import DISPLAY_COLUMNS
+    from job_tracker.snapshot import snapshot_path, snapshot_rows
+
+    path = snapshot_path(session.get_bind())
+    if path is not None:
+        names = {attribute: name for name, attribute in DISPLAY_COLUMNS.items()}
+        return InvertedIndex(snapshot_rows(session, path, [names[field] for field in SEARCH_FIELDS]))
+
+    columns = [JobApplication.__table__.c[name] for name in SEARCH_FIELDS]
+    rows = session.connection().execute(select(JobApplication.id, *columns))
+    return InvertedIndex(rows)
+
+def _fts5_search(connection, expression, limit):
+    """Run a MATCH query, ranking by BM25 unless a limited query matches too much"""
+    match = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :expression"
+    params = {'expression': expression, 'limit': limit}
+
+    if limit is not None:
+        # Unranked rowid scans are cheap; probe whether ranking stays affordable
+        probe = connection.execute(text(f"{match} LIMIT {RANK_MAX_MATCHES + 1}"), params).fetchall()
+        if len(probe) > RANK_MAX_MATCHES:
+            rows = connection.execute(text(f"{match} ORDER BY rowid DESC LIMIT :limit"), params)
+            return [row[0] for row in rows]
+
+    weights = ', '.join(str(weight) for weight in SEARCH_FIELDS.values())
+    statement = f"{match} ORDER BY bm25({FTS_TABLE}, {weights}), rowid"
+    if limit is not None:
+        statement += " LIMIT :limit"
+    return [row[0] for row in connection.execute(text(statement), params)]
+
+def search_application_ids(session, query, limit=None):
+    """Search applications by job title, company name and notes
+
+    Uses the FTS5 index when the database has one, otherwise an in-memory
+    inverted index that is built once per data version. Results are ranked by
+    BM25; when ``limit`` is set and more than RANK_MAX_MATCHES applications
+    match, the newest matches are returned instead so broad queries stay fast.
+
+    Args:
+        session: SQLAlchemy session
+        query: Search box text (see ``parse_query`` for the syntax)
+        limit: Maximum number of ids to return
+
+    Returns:
+        List of matching application ids, most relevant first
+    """
+    with span('search'):
+        clauses = parse_query(query)
+        if not clauses:
+            return []
+
+        connection = session.connection()
+        if has_fts5_index(connection):
+            return _fts5_search(connection, fts5_expression(clauses), limit)
+
+        index = data_cache.get_or_compute(('inverted_index',), lambda: build_inverted_index(session))
+        return index.search(clauses, limit=limit)
@@ -0,0 +1,174 @@
+"""
+Columnar snapshot of job_applications for fast whole-table loads
+
+The snapshot is an Arrow IPC file next to the SQLite database. The database
+stays the source of truth: the file records the table version it was built
+from and is refreshed, incrementally where possible, when it is read after
+that version changed. Writes never touch it, so a sync or a cell edit costs
+no file rewrite; only the whole-table readers pay for bringing it up to
+date: the dashboard's "Download all applications" (``load_snapshot_frame``)
+and the search index built without FTS5 (``snapshot_rows``).
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import func, or_, select
+
+from job_tracker.frames import CATEGORICAL_COLUMNS, apply_schema
+from job_tracker.models import JobApplication, TableCount
+from job_tracker.queries import DISPLAY_COLUMNS, load_applications_frame
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+except ImportError:  # Snapshots are optional; loads fall back to SQL
+    pa = None
+
+# Bump when the snapshot layout changes so older files are rebuilt
+SNAPSHOT_FORMAT = 1
+
+# Schema metadata key holding the snapshot's format and table version
+METADATA_KEY = b'job_tracker.snapshot'
+
+def snapshot_path(engine):
+    """Snapshot file next to a SQLite database file
+
+    Returns None for other databases, or when pyarrow is not installed.
+    """
+    url = engine.url
+    if pa is None or url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        return None
+    return Path(url.database).with_suffix('.snapshot.arrow')
+
+def table_version(session):
+    """Fingerprint of job_applications: row count, highest id and latest write time
+
+    Each part is its own statement: SQLite answers a lone ``max()`` from the
+    end of an index, but scans the whole index when aggregates are combined.
+    The row count comes from the trigger-maintained ``table_counts`` row, or
+    from counting the table where there is none (databases other than SQLite).
+    """
+    max_id = session.execute(select(func.max(JobApplication.id))).scalar()
+    updated_at = session.execute(select(func.max(JobApplication.updated_at))).scalar()
+    rows = session.execute(
+        select(TableCount.rows).where(TableCount.name == JobApplication.__tablename__)
+    ).scalar()
+    if rows is None:
+        rows = session.execute(select(func.count()).select_from(JobApplication)).scalar()
+    return {
+        'rows': rows,
+        'max_id': max_id,
+        'updated_at': updated_at.isoformat() if updated_at else None,
+    }
+
+def read_snapshot_version(path):
+    """Table version recorded in a snapshot, or None if it is missing, unreadable or outdated"""
+    try:
+        with pa.memory_map(str(path)) as source:
+            schema = pa.ipc.open_file(source).schema
+    except (OSError, pa.ArrowInvalid):
+        return None
+    info = json.loads((schema.metadata or {}).get(METADATA_KEY, b'{}'))
+    if info.pop('format', None) != SNAPSHOT_FORMAT:
+        return None
+    return info
+
+def read_snapshot(path, columns=None):
+    """Load a snapshot through a memory map
+
+    Args:
+        path: Snapshot file
+        columns: Display column names to load (defaults to all of DISPLAY_COLUMNS)
+
+    Returns:
+        DataFrame indexed by application id with the same dtypes as
+        ``load_applications_frame``
+    """
+    names = [name for name in DISPLAY_COLUMNS if columns is None or name in columns]
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+        return apply_schema(table.select(['id', *names]).to_pandas())
+
+def write_snapshot(path, frame, version):
+    """Write a frame and the table version it reflects, replacing the file atomically"""
+    frame = frame.sort_index()
+    for column in CATEGORICAL_COLUMNS:
+        if column in frame.columns:
+            frame[column] = frame[column].astype('category')
+
+    table = pa.Table.from_pandas(frame, preserve_index=True)
+    metadata = dict(table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps({'format': SNAPSHOT_FORMAT, **version}).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    # Unique per writer: two sessions may refresh the same snapshot at once
+    partial = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    with pa.OSFile(str(partial), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(partial, path)
+
+def refresh_snapshot(session, path):
+    """Bring a snapshot up to date with the database
+
+    Only applications written since the snapshot's version (by ``updated_at``
+    or a higher id) are read and merged in; a missing or outdated file, or a
+    row count that no longer matches (deleted rows), rebuilds it in full.
+
+    Returns:
+        True if the snapshot was rewritten
+    """
+    version = table_version(session)
+    stored = read_snapshot_version(path)
+    if stored == version:
+        return False
+
+    frame = None
+    if stored is not None and stored['updated_at'] is not None:
+        since = datetime.fromisoformat(stored['updated_at'])
+        changed = load_applications_frame(
+            session,
+            where=or_(JobApplication.updated_at >= since, JobApplication.id > stored['max_id']),
+        )
+        previous = read_snapshot(path)
+        # Categoricals with different categories concat to object; re-encode them
+        frame = apply_schema(pd.concat([previous.drop(changed.index, errors='ignore'), changed]))
+        if len(frame.index) != version['rows']:
+            frame = None
+
+    if frame is None:
+        frame = load_applications_frame(session)
+    write_snapshot(path, frame, version)
+    return True
+
+def snapshot_rows(session, path, columns):
+    """``(id, *values)`` tuples of display columns, refreshing the snapshot first if stale
+
+    Values are converted one record batch at a time straight from the mapped
+    Arrow buffers; no DataFrame is built.
+
+    Args:
+        session: SQLAlchemy session
+        path: Snapshot file (see ``snapshot_path``)
+        columns: Display column names, in tuple order
+    """
+    refresh_snapshot(session, path)
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for number in range(reader.num_record_batches):
+            batch = reader.get_batch(number)
+            yield from zip(*(batch.column(name).to_pylist() for name in ['id', *columns]))
+
+def load_snapshot_frame(session, path, columns=None):
+    """Load the applications frame from the snapshot, refreshing it first if stale
+
+    Falls back to ``load_applications_frame`` when there is no snapshot
+    location (see ``snapshot_path``).
+    """
+    if path is None:
+        return load_applications_frame(session, columns)
+    refresh_snapshot(session, path)
+    return read_snapshot(path, columns)
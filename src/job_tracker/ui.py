@@ -0,0 +1,422 @@
+"""
+Streamlit dashboard: upload, company statistics, the editable applications table and the Pipeline view
+
+Rendered by ``streamlit run src/job_tracker/app.py``; only this module
+imports Streamlit, so the core package stays cheap to import for tests,
+tasks and the command line.
+"""
+import os
+
+import pandas as pd
+import streamlit as st
+
+from job_tracker.app import get_session_registry
+from job_tracker.cache import data_cache
+from job_tracker.companies import get_company_table
+from job_tracker.edits import EDIT_DEBOUNCE_SECONDS, EditBuffer, save_edits
+from job_tracker.history import get_pipeline_funnel, get_status_activity
+from job_tracker.instrumentation import PROFILERS, record_run, span
+from job_tracker.models import UserPreferences
+from job_tracker.queries import (
+    DEFAULT_PAGE_SIZE,
+    count_applications,
+    filter_company_stats,
+    get_company_stats,
+    load_applications_by_ids,
+    load_applications_page,
+    load_row_versions,
+)
+from job_tracker.search import search_application_ids
+from job_tracker.snapshot import load_snapshot_frame, snapshot_path, table_version
+from job_tracker.uploads import sync_upload
+
+# Most relevant search matches shown in the applications table
+SEARCH_RESULT_LIMIT = 1000
+
+# Page sizes offered for the applications table
+PAGE_SIZE_OPTIONS = [25, 50, 100, 250, 500]
+
+# Pixel height of an applications table row (the header is one too); the table stops growing at the maximum
+TABLE_ROW_HEIGHT = 35
+TABLE_MAX_HEIGHT = 1000
+
+# Widget keys of the applications table editor start with this; the rest identifies the page shown
+EDITOR_KEY_PREFIX = "applications_editor_"
+
+# Dashboard views selectable in the sidebar
+VIEWS = ["Applications", "Pipeline"]
+
+# The debug panel is hidden unless the URL has ?debug=1 or JOB_TRACKER_DEBUG=1 is set
+DEBUG_QUERY_PARAM = "debug"
+DEBUG_ENV = "JOB_TRACKER_DEBUG"
+
+def load_preferences(session):
+    """Load the column visibility preferences, creating the defaults if needed"""
+    prefs = session.query(UserPreferences).first()
+    if not prefs:
+        prefs = UserPreferences.from_dict(session, UserPreferences.get_default_preferences())
+    return prefs.to_dict()
+
+def get_visible_columns(session=None):
+    """Get the list of columns to display based on user preferences"""
+    db_session = session or get_session_registry()()
+    st.sidebar.header("Column Visibility")
+    
+    # Get preferences from database or use defaults
+    preferences_dict = data_cache.get_or_compute(('preferences',), lambda: load_preferences(db_session))
+    
+    # Create checkboxes for each column
+    visible_columns = {}
+    changed = False
+    
+    for col, default_visible in preferences_dict.items():
+        # Ensure we're using a boolean value
+        current_value = bool(default_visible)
+        new_value = st.sidebar.checkbox(f"Show {col}", value=current_value)
+        visible_columns[col] = new_value
+        
+        if current_value != new_value:
+            changed = True
+    
+    # Save preferences and rerun if they've changed
+    if changed:
+        UserPreferences.from_dict(db_session, visible_columns)
+        data_cache.bump()
+        st.rerun()
+    
+    # Return list of columns that are checked
+    return [col for col, is_visible in visible_columns.items() if is_visible]
+
+def format_job_url(url):
+    """Format job URL as a clickable link if it exists"""
+    if pd.isna(url) or not url:
+        return ""  # Return empty string instead of None for better display
+    return f'<a href="{url}" target="_blank">View Job</a>'
+
+def get_page_cursors(view):
+    """Cursor stack for paging the applications table
+
+    The last entry is the cursor of the current page (None for the first
+    page). The stack is reset when ``view`` (search, page size or columns)
+    changes; writes keep it, so saving an edit stays on the same page.
+    """
+    navigation = st.session_state.setdefault('page_navigation', {'view': None, 'cursors': [None]})
+    if navigation['view'] != view:
+        navigation['view'] = view
+        navigation['cursors'] = [None]
+    return navigation['cursors']
+
+def applications_csv(columns):
+    """Every application's ``columns`` as CSV, loaded from the memory-mapped snapshot
+
+    Streamlit calls it on a thread of its own when the download button is
+    clicked, so it takes its own session from the registry.
+    """
+    Session = get_session_registry()
+    try:
+        db = Session()
+        return load_snapshot_frame(db, snapshot_path(db.get_bind()), columns)[columns].to_csv()
+    finally:
+        Session.remove()
+
+def render_page_controls(db, cursors, next_cursor):
+    """Previous/next buttons for the applications table; pending edits are saved before leaving the page"""
+    previous_col, page_col, next_col = st.columns([1, 4, 1])
+    if previous_col.button("Previous", disabled=len(cursors) == 1):
+        flush_edits(db)
+        cursors.pop()
+        st.rerun()
+    page_col.caption(f"Page {len(cursors)}")
+    if next_col.button("Next", disabled=next_cursor is None):
+        flush_edits(db)
+        cursors.append(next_cursor)
+        st.rerun()
+
+def discard_editor_state(keep=None):
+    """Drop the widget state of the applications table editors, except the one keyed ``keep``"""
+    for key in [key for key in st.session_state if str(key).startswith(EDITOR_KEY_PREFIX) and key != keep]:
+        del st.session_state[key]
+
+def get_edit_buffer():
+    """This browser session's pending table edits"""
+    return st.session_state.setdefault('edit_buffer', EditBuffer())
+
+def flush_edits(db):
+    """Write the pending table edits in one transaction, reporting the outcome on the next run
+
+    Returns:
+        EditResult, or None when no edits were pending
+    """
+    buffer = get_edit_buffer()
+    if not len(buffer):
+        return None
+    result = save_edits(db, buffer.take())
+    notice = f"Saved changes to {len(result.saved)} application(s)."
+    if result.conflicts:
+        # save_edits dropped the cached page and row versions; the editor's edited
+        # cells go too, or the next rerun would stage the rejected edits again
+        discard_editor_state()
+        notice += f" {len(result.conflicts)} application(s) changed since you edited them and were reloaded instead."
+    st.session_state['edit_notice'] = notice
+    return result
+
+@st.fragment(run_every=EDIT_DEBOUNCE_SECONDS)
+def render_edit_status():
+    """Pending edit count and save button; re-checked on a timer so debounced edits are written without a click"""
+    buffer = get_edit_buffer()
+    if not len(buffer):
+        return
+    status_col, save_col = st.columns([4, 1])
+    status_col.caption(f"{len(buffer)} edited application(s) not saved yet")
+    if save_col.button("Save changes") or buffer.due():
+        try:
+            flush_edits(get_session_registry()())
+        except Exception as e:
+            st.error(f"Error saving changes: {str(e)}")
+            return
+        st.rerun()
+
+def render_applications(db):
+    """Company statistics and the paged applications table"""
+    try:
+        # Get visible columns from sidebar
+        visible_columns = get_visible_columns(db)
+        page_size = st.sidebar.selectbox(
+            "Rows per page",
+            PAGE_SIZE_OPTIONS,
+            index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+        )
+        
+        total = data_cache.get_or_compute(('application_count',), lambda: count_applications(db))
+        
+        if total:
+            # Display company statistics
+            st.subheader("Company Statistics")
+            
+            # Add search functionality for company stats
+            company_search = st.text_input("Search companies", key="company_search")
+            
+            # Read the company table once per data version; searches filter the cached frame's company categories
+            company_table = data_cache.get_or_compute(('company_table',), lambda: get_company_table(db))
+            company_stats = filter_company_stats(company_table, company_search)
+            
+            st.dataframe(
+                company_stats,
+                use_container_width=True,
+                height=300
+            )
+            
+            # Display data table
+            st.subheader("Your Applications")
+            if 'edit_notice' in st.session_state:
+                st.success(st.session_state.pop('edit_notice'))
+            
+            # Add search functionality
+            search_term = st.text_input("Search applications", "")
+            
+            # Navigation restarts at the first page whenever the view changes
+            view = (search_term, page_size, tuple(visible_columns))
+            cursors = get_page_cursors(view)
+            
+            if search_term:
+                # Page through the ranked matches, most relevant first
+                matches = data_cache.get_or_compute(
+                    ('search', search_term),
+                    lambda: search_application_ids(db, search_term, limit=SEARCH_RESULT_LIMIT),
+                )
+                offset = cursors[-1] or 0
+                page_ids = matches[offset:offset + page_size]
+                df_page = data_cache.get_or_compute(
+                    ('search_page', tuple(page_ids), tuple(visible_columns)),
+                    lambda: load_applications_by_ids(db, page_ids, columns=visible_columns),
+                )
+                next_cursor = offset + page_size if offset + page_size < len(matches) else None
+                if len(matches) == SEARCH_RESULT_LIMIT:
+                    st.caption(f"Showing the {SEARCH_RESULT_LIMIT:,} most relevant matches")
+            else:
+                # Keyset pages: each rerun only reads and sends one page of rows
+                df_page, next_cursor = data_cache.get_or_compute(
+                    ('page', tuple(visible_columns), page_size, cursors[-1]),
+                    lambda: load_applications_page(db, columns=visible_columns, page_size=page_size, after=cursors[-1]),
+                )
+            
+            if not df_page.empty:
+                # Configure column settings
+                kwargs = {}
+                if 'Job URL' in df_page.columns and 'Job URL' in visible_columns:
+                    kwargs['column_config'] = {
+                        'Job URL': st.column_config.LinkColumn(
+                            display_text='🔗 View Job',
+                            width='small'
+                        )
+                    }
+                    # Ensure Job URL appears first in the column order
+                    kwargs['column_order'] = ['Job URL'] + [col for col in visible_columns if col != 'Job URL']
+                
+                # Versions of the rows as shown, checked when their edits are written
+                versions = data_cache.get_or_compute(('versions', tuple(df_page.index)), lambda: load_row_versions(db, df_page.index))
+                
+                # Display DataFrame with styled columns; the key is stable while the page
+                # and data are unchanged, so Streamlit updates the widget in place and its
+                # edited rows keep pointing at the rows shown. Any other page's or data
+                # version's editor state is dropped, so only one is ever kept
+                editor_key = f"{EDITOR_KEY_PREFIX}{hash((view, cursors[-1], data_cache.version)):x}"
+                discard_editor_state(keep=editor_key)
+                st.data_editor(
+                    df_page[visible_columns],
+                    key=editor_key,
+                    use_container_width=True,
+                    # Sized to the page, so short pages show no empty grid with its own scroll bar
+                    height=min(TABLE_MAX_HEIGHT, TABLE_ROW_HEIGHT * (len(df_page.index) + 1) + 3),
+                    **kwargs
+                )
+                
+                # Only the delta of edited cells is staged; writes are debounced across reruns
+                get_edit_buffer().stage(df_page.index, versions, st.session_state[editor_key]['edited_rows'])
+                render_edit_status()
+                render_page_controls(db, cursors, next_cursor)
+                st.download_button(
+                    "Download all applications (CSV)",
+                    data=lambda: applications_csv(visible_columns),
+                    file_name="applications.csv",
+                    mime="text/csv",
+                    on_click="ignore",
+                )
+            else:
+                st.info("No applications found matching your search.")
+        else:
+            st.info("No applications found. Upload a CSV file to get started!")
+    except Exception as e:
+        st.error(f"Error displaying applications: {str(e)}")
+        db.rollback()
+
+def render_pipeline(db):
+    """Funnel conversion, time in stage and daily status changes, read from the status rollups"""
+    st.subheader("Pipeline")
+    try:
+        company_stats = data_cache.get_or_compute(('company_stats',), lambda: get_company_stats(db))
+        company = st.selectbox(
+            "Company",
+            [None, *company_stats.index],
+            format_func=lambda name: "All companies" if name is None else name,
+            key="pipeline_company",
+        )
+        since = st.date_input("Since", value=None, key="pipeline_since")
+        
+        funnel = data_cache.get_or_compute(
+            ('pipeline_funnel', company, since),
+            lambda: get_pipeline_funnel(db, company=company, since=since),
+        )
+        if not funnel['Reached'].any():
+            st.info("No status history yet. Sync an export to start tracking your pipeline.")
+            return
+        
+        st.bar_chart(funnel['Reached'], sort=False, horizontal=True)
+        st.dataframe(
+            funnel,
+            use_container_width=True,
+            column_config={
+                'Conversion': st.column_config.NumberColumn(format='percent'),
+                'Avg Days In Stage': st.column_config.NumberColumn(format='%.1f'),
+            },
+        )
+        
+        st.subheader("Status Changes per Day")
+        activity = data_cache.get_or_compute(
+            ('status_activity', company, since),
+            lambda: get_status_activity(db, company=company, since=since),
+        )
+        st.line_chart(activity)
+    except Exception as e:
+        st.error(f"Error displaying pipeline: {str(e)}")
+        db.rollback()
+
+def debug_enabled():
+    """Whether this session shows the debug panel"""
+    return st.query_params.get(DEBUG_QUERY_PARAM) == "1" or os.environ.get(DEBUG_ENV) == "1"
+
+def render_debug_panel(run):
+    """Timings, query counts and the optional profile of the rerun that just finished"""
+    with st.sidebar.expander("Debug", expanded=True):
+        st.caption(
+            f"Last rerun: {run.seconds * 1000:.1f} ms, {run.queries} queries "
+            f"({run.query_seconds * 1000:.1f} ms), {run.rows_written} rows written"
+        )
+        spans = pd.DataFrame([stats.to_dict() for stats in run.spans.values()])
+        if not spans.empty:
+            # Indent nested stages under the stage that opened them
+            spans['name'] = ["  " * depth + name for depth, name in zip(spans.pop('depth'), spans['name'])]
+            st.dataframe(spans.set_index('name'), use_container_width=True)
+        st.json(run.statements, expanded=False)
+        st.selectbox(
+            "Profile reruns",
+            [None, *PROFILERS],
+            format_func=lambda profiler: "Off" if profiler is None else profiler,
+            key="debug_profiler",
+        )
+        if run.profile:
+            st.code(run.profile, language=None)
+
+def main():
+    debug = debug_enabled()
+    profiler = st.session_state.get("debug_profiler") if debug else None
+    # Every rerun is recorded: its spans and queries go to the perf log and the debug panel
+    with record_run("rerun", profile=profiler) as run:
+        try:
+            db = get_session_registry()()
+            # Writes by other processes (the CLI, batch imports, another dashboard) only show in the database
+            with span("data_version"):
+                data_cache.observe(table_version(db))
+            render(db)
+        finally:
+            # Return this run's connection to the pool; the next run starts a fresh session
+            get_session_registry().remove()
+    if debug:
+        render_debug_panel(run)
+
+def render(db):
+    """Render the app with the session of the current script run"""
+    st.title("Job Application Tracker")
+    st.write("Upload your Simplify.jobs CSV file to sync your applications")
+
+    # File uploader
+    uploaded_file = st.file_uploader("Choose a CSV file", type=['csv'])
+    
+    if uploaded_file is not None:
+        try:
+            st.success("File uploaded successfully!")
+            
+            if st.button("Sync Data"):
+                progress_bar = st.progress(0.0, text="Syncing data...")
+                
+                def report_progress(rows, fraction):
+                    progress_bar.progress(fraction or 0.0, text=f"Syncing data... {rows:,} rows processed")
+                
+                # Identical re-uploads are skipped and appended exports only sync their new rows
+                with st.spinner("Syncing data..."), span("sync"):
+                    run, summary = sync_upload(db, uploaded_file, progress=report_progress)
+                if summary is None:
+                    progress_bar.progress(1.0, text="Nothing to sync")
+                    st.info(f"This file was already synced on {run.created_at:%Y-%m-%d %H:%M}; nothing changed.")
+                else:
+                    if run.base_run_id is not None:
+                        st.caption(f"Only the {summary.rows:,} rows added since an earlier upload were read.")
+                    st.success(
+                        f"Data synced successfully! {len(summary.inserted)} new applications added, "
+                        f"{len(summary.updated)} updated, {summary.unchanged} unchanged."
+                    )
+        except Exception as e:
+            st.error(f"Error processing file: {str(e)}")
+
+    view = st.sidebar.radio("View", VIEWS)
+    with span(f"render.{view.lower()}"):
+        if view == "Pipeline":
+            render_pipeline(db)
+        else:
+            render_applications(db)
+    
+    cache_stats = data_cache.stats()
+    st.sidebar.caption(
+        f"Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+        f"(data version {cache_stats['version']})"
+    )
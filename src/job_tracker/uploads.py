@@ -0,0 +1,132 @@
+"""
+Whole-file deduplication of uploaded Simplify exports
+"""
+import hashlib
+import io
+import os
+
+from job_tracker.ingest import STREAM_CHUNK_SIZE, sync_csv_stream
+from job_tracker.models import SyncRun
+
+# Bytes hashed per read when fingerprinting an upload
+HASH_BLOCK_SIZE = 1 << 20
+
+def file_fingerprints(handle, prefix_sizes=()):
+    """Hash a file's bytes, and each of the given prefixes, in one pass
+
+    Args:
+        handle: Seekable binary file object
+        prefix_sizes: Byte lengths of prefixes to fingerprint as well
+
+    Returns:
+        ``(file_hash, prefixes)`` where ``prefixes`` maps each size within the
+        file to ``(sha256 hex digest, number of double quotes)`` of that prefix
+    """
+    sizes = sorted(set(prefix_sizes))
+    digest = hashlib.sha256()
+    quotes = 0
+    prefixes = {}
+    position = 0
+
+    handle.seek(0)
+    while True:
+        block = handle.read(HASH_BLOCK_SIZE)
+        if not block:
+            break
+        end = position + len(block)
+        # Snapshot the running hash at every prefix that ends inside this block
+        while sizes and sizes[0] <= end:
+            size = sizes.pop(0)
+            head = block[:size - position]
+            snapshot = digest.copy()
+            snapshot.update(head)
+            prefixes[size] = (snapshot.hexdigest(), quotes + head.count(b'"'))
+        digest.update(block)
+        quotes += block.count(b'"')
+        position = end
+    return digest.hexdigest(), prefixes
+
+def _ends_record(handle, size, quotes):
+    """Whether the first ``size`` bytes end on a line break outside any quoted field"""
+    handle.seek(size - 1)
+    return handle.read(1) == b'\n' and quotes % 2 == 0
+
+def _tail_source(handle, offset):
+    """The file's header line followed by everything after ``offset``, as a CSV"""
+    handle.seek(0)
+    header = handle.readline()
+    handle.seek(offset)
+    return io.BytesIO(header + handle.read())
+
+def find_base_run(session, handle, size, prefixes):
+    """The longest previously synced upload that this file extends, if any
+
+    Args:
+        session: SQLAlchemy session
+        handle: Seekable binary file object
+        size: Size of the file in bytes
+        prefixes: Prefix fingerprints from ``file_fingerprints``
+
+    Returns:
+        SyncRun whose bytes are a prefix of the file and end on a record boundary, or None
+    """
+    candidates = session.query(SyncRun).filter(SyncRun.size < size).order_by(SyncRun.size.desc())
+    for run in candidates:
+        prefix_hash, quotes = prefixes.get(run.size, (None, 0))
+        if prefix_hash == run.file_hash and _ends_record(handle, run.size, quotes):
+            return run
+    return None
+
+def sync_upload(session, handle, progress=None, chunksize=STREAM_CHUNK_SIZE):
+    """Sync an uploaded export, skipping work already done for earlier uploads
+
+    Each synced file is recorded in ``sync_runs`` by the SHA-256 of its
+    bytes. Uploading identical bytes again returns the recorded run without
+    parsing anything. A file that extends an earlier upload (a newer export
+    with rows appended) only has its new tail parsed and synced.
+
+    Args:
+        session: SQLAlchemy session
+        handle: Seekable binary file object, e.g. Streamlit's UploadedFile
+        progress: Optional callback passed on to ``sync_csv_stream``
+        chunksize: Rows per chunk when reading the CSV
+
+    Returns:
+        ``(run, summary)``: the SyncRun for these bytes and the SyncSummary
+        of this sync, or None as the summary when the file was already synced
+    """
+    size = handle.seek(0, os.SEEK_END)
+    candidate_sizes = [size for (size,) in session.query(SyncRun.size).filter(SyncRun.size < size)]
+    file_hash, prefixes = file_fingerprints(handle, candidate_sizes)
+
+    previous = session.query(SyncRun).filter_by(file_hash=file_hash).first()
+    if previous is not None:
+        return previous, None
+
+    base = find_base_run(session, handle, size, prefixes)
+    if base is None:
+        handle.seek(0)
+        source = handle
+    else:
+        source = _tail_source(handle, base.size)
+
+    summary = sync_csv_stream(
+        session,
+        source,
+        chunksize=chunksize,
+        progress=progress,
+        source_key=f"sha256:{file_hash}:{base.size if base else 0}",
+    )
+
+    run = SyncRun(
+        file_hash=file_hash,
+        size=size,
+        base_run_id=base.id if base else None,
+        rows=summary.rows,
+        inserted=len(summary.inserted),
+        updated=len(summary.updated),
+        unchanged=summary.unchanged,
+    )
+    session.add(run)
+    session.commit()
+    return run, summary
@@ -14,12 +14,31 @@ def run(ctx):
 
 @task
 def test(ctx, coverage=True):
-    """Run the test suite"""
+    """Check the import-time budget, then run the test suite"""
+    ctx.run("python benchmarks/bench_imports.py --check --top 3")
     cmd = "python -m pytest tests/"
     if coverage:
         cmd += " -v --cov=src/job_tracker"
     ctx.run(cmd)
 
+@task(help={
+    "rows": "Comma-separated synthetic export sizes, e.g. 1000,100000,1000000; sample is the shipped export x1000",
+    "baseline": "Store this run as the baseline instead of comparing against it",
+    "threshold": "Allowed slowdown of a benchmark's median over the baseline, in percent",
+})
+def bench(ctx, rows="10000", baseline=False, threshold=25):
+    """Run the benchmark suite, failing on regressions against the stored baseline"""
+    # benchmark_*.py files are only collected here, never by the test suite
+    cmd = (
+        "python -m pytest benchmarks -o python_files='benchmark_*.py' "
+        "--benchmark-only --benchmark-storage=.benchmarks"
+    )
+    if baseline:
+        cmd += " --benchmark-save=baseline"
+    else:
+        cmd += f" --benchmark-compare --benchmark-compare-fail=median:{threshold}%"
+    ctx.run(cmd, env={"BENCH_ROWS": rows}, pty=False)
+
 @task
 def format(ctx):
     """Format code using black and isort"""
@@ -71,6 +90,30 @@ def setup(ctx):
     
     print("Setup complete!")
 
+@task(iterable=['path'])
+def batch_import(ctx, path, processes=0, split_mb=64):
+    """Import many Simplify exports at once, parsing them in parallel processes"""
+    from job_tracker.batch import import_files
+    from job_tracker.models import init_db
+
+    if not path:
+        print("Pass one or more --path values (files, directories or glob patterns)")
+        return
+
+    session = init_db()
+    summary = import_files(
+        session,
+        path,
+        processes=processes or None,
+        split_bytes=split_mb * 1024 * 1024,
+        progress=lambda done, total: print(f"Parsed {done}/{total} parts"),
+    )
+    session.close()
+    print(
+        f"Imported {summary.rows:,} rows: {len(summary.inserted):,} new, "
+        f"{len(summary.updated):,} updated, {summary.unchanged:,} unchanged"
+    )
+
 @task
 def db(ctx, action="show"):
     """Database management commands"""
@@ -80,12 +123,37 @@ def db(ctx, action="show"):
             print(f"Database exists: job_tracker.db ({size} bytes)")
         else:
             print("No database file found")
+    elif action == "migrate":
+        from job_tracker.database import create_db_engine
+        from job_tracker.migrations import migrate
+        from job_tracker.models import Base
+
+        engine = create_db_engine("sqlite:///job_tracker.db")
+        Base.metadata.create_all(engine)
+        applied = migrate(engine)
+        print(f"Applied migrations: {applied}" if applied else "Database is up to date")
+    elif action == "companies":
+        from job_tracker.companies import rebuild_companies
+        from job_tracker.models import init_engine
+
+        with init_engine().begin() as connection:
+            companies = rebuild_companies(connection)
+        print(f"Rebuilt the company table: {companies} companies")
+    elif action == "rollups":
+        from job_tracker.history import rebuild_rollups
+        from job_tracker.models import init_engine
+
+        with init_engine().begin() as connection:
+            events = rebuild_rollups(connection)
+        print(f"Rebuilt status rollups from {events} events")
     elif action == "reset":
         if os.path.exists("job_tracker.db"):
             os.remove("job_tracker.db")
+            if os.path.exists("job_tracker.snapshot.arrow"):
+                os.remove("job_tracker.snapshot.arrow")
             print("Database reset")
         else:
             print("No database file to reset")
     else:
         print(f"Unknown action: {action}")
-        print("Available actions: show, reset") 
\ No newline at end of file
+        print("Available actions: show, migrate, companies, rollups, reset") 
\ No newline at end of file
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('aiosqlite')
+
+from src.job_tracker.aio import (
+    async_url,
+    count_applications_async,
+    create_async_session_factory,
+    get_company_stats_async,
+    init_async_engine,
+    load_applications_page_async,
+    process_csv_async,
+    search_application_ids_async,
+)
+from src.job_tracker.ingest import compute_simplify_ids, sync_csv_stream
+from src.job_tracker.models import init_db
+from src.job_tracker.queries import get_company_stats, load_applications_page
+from src.job_tracker.search import search_application_ids
+
+SAMPLE_CSV = Path(__file__).resolve().parent.parent / 'Simplify_Tracked_Jobs_2025-03-31.csv'
+
+def scaled_chunks(copies, delay=0.0):
+    """Distinct copies of the sample export, optionally delayed like a slow upload"""
+    export = pd.read_csv(SAMPLE_CSV)
+    for i in range(copies):
+        time.sleep(delay)
+        chunk = export.copy()
+        chunk['Job URL'] = chunk['Job URL'].fillna('https://example.com/job') + f"#copy-{i}"
+        yield chunk
+
+async def sync_async(db_url, source, **options):
+    """Run process_csv_async against a fresh async engine"""
+    engine = await init_async_engine(db_url)
+    Session = create_async_session_factory(engine)
+    try:
+        async with Session() as session:
+            return await process_csv_async(session, source, **options)
+    finally:
+        await engine.dispose()
+
+def test_async_url():
+    """Test that synchronous URLs are switched to their async drivers"""
+    assert async_url('sqlite:///job_tracker.db').drivername == 'sqlite+aiosqlite'
+    assert async_url('postgresql://localhost/jobs').drivername == 'postgresql+asyncpg'
+    assert async_url('sqlite+aiosqlite://').drivername == 'sqlite+aiosqlite'
+
+def test_process_csv_async_matches_sync(tmp_path, test_db):
+    """Test that the async sync stores the same applications as the streaming sync"""
+    db_url = f"sqlite:///{tmp_path / 'async.db'}"
+    summary = asyncio.run(sync_async(db_url, SAMPLE_CSV, chunksize=50))
+    expected = sync_csv_stream(test_db, SAMPLE_CSV, chunksize=50)
+
+    assert summary.rows == 323
+    assert sorted(summary.inserted) == sorted(expected.inserted)
+    assert len(summary.inserted) == compute_simplify_ids(pd.read_csv(SAMPLE_CSV)).nunique()
+
+    again = asyncio.run(sync_async(db_url, pd.read_csv(SAMPLE_CSV), chunksize=100))
+    assert not again.changed
+    assert again.unchanged == len(summary.inserted)
+
+def test_async_queries_match_sync(tmp_path):
+    """Test that the async stats, search and paging return what the sync queries do"""
+    db_url = f"sqlite:///{tmp_path / 'async.db'}"
+    asyncio.run(sync_async(db_url, SAMPLE_CSV))
+    session = init_db(db_url)
+
+    async def run_queries():
+        engine = await init_async_engine(db_url)
+        try:
+            async with create_async_session_factory(engine)() as async_session:
+                return (
+                    await get_company_stats_async(async_session, search='a'),
+                    await search_application_ids_async(async_session, 'engineer', limit=20),
+                    await count_applications_async(async_session),
+                    await load_applications_page_async(async_session, columns=['Company'], page_size=10),
+                )
+        finally:
+            await engine.dispose()
+
+    stats, ids, count, (page, cursor) = asyncio.run(run_queries())
+    expected_page, expected_cursor = load_applications_page(session, columns=['Company'], page_size=10)
+
+    pd.testing.assert_frame_equal(stats, get_company_stats(session, search='a'), check_exact=False, atol=1)
+    assert ids == search_application_ids(session, 'engineer', limit=20)
+    assert count == 319
+    pd.testing.assert_frame_equal(page, expected_page)
+    assert cursor == expected_cursor
+    session.close()
+
+def test_async_sync_reads_ahead_of_writes(tmp_path):
+    """Test that the next chunk is read while the current one is written
+
+    The source sleeps before each chunk like a slow disk or network upload.
+    How much sooner that finishes than the streaming sync is measured by
+    benchmarks/benchmark_aio.py.
+    """
+    copies, delay = 8, 0.05
+
+    reads, writes = [], []
+    def source():
+        for chunk in scaled_chunks(copies, delay):
+            yield chunk
+            reads.append(time.perf_counter())  # Resumed: the next read has started
+    overlapped = asyncio.run(sync_async(
+        f"sqlite:///{tmp_path / 'async.db'}",
+        source(),
+        progress=lambda rows: writes.append(time.perf_counter()),
+    ))
+
+    assert len(overlapped.inserted) == copies * 319
+    assert len(reads) == len(writes) == copies
+    # Every chunk but the last was still being written when the next read began
+    assert all(read < write for read, write in zip(reads, writes[:-1]))
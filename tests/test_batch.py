@@ -0,0 +1,89 @@
+import io
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from src.job_tracker.batch import expand_paths, import_files, parse_range, split_byte_ranges
+from src.job_tracker.ingest import compute_simplify_ids
+from src.job_tracker.models import JobApplication
+
+SAMPLE_CSV = Path(__file__).resolve().parent.parent / 'Simplify_Tracked_Jobs_2025-03-31.csv'
+
+@pytest.fixture
+def quoted_csv(tmp_path):
+    """An export whose notes contain quoted commas, quotes and line breaks"""
+    rows = []
+    for i in range(40):
+        note = f'line one\nline "two", part {i}\r\nend' if i % 3 == 0 else f'note {i}'
+        rows.append({'Job Title': f'Engineer {i}', 'Company Name': f'Co {i % 7}', 'Notes': note})
+    path = tmp_path / 'quoted.csv'
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+def test_split_byte_ranges_respects_quoted_fields(quoted_csv):
+    """Test that ranges cover the file exactly and only split between records"""
+    content = quoted_csv.read_bytes()
+    header, ranges = split_byte_ranges(quoted_csv, target_size=50)
+
+    assert len(ranges) > 5
+    assert header + b''.join(content[start:end] for start, end in ranges) == content
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+
+    parts = [pd.read_csv(io.BytesIO(header + content[start:end])) for start, end in ranges]
+    pd.testing.assert_frame_equal(pd.concat(parts, ignore_index=True), pd.read_csv(quoted_csv))
+
+def test_split_byte_ranges_small_file(tmp_path):
+    """Test files smaller than the target, without a final newline, and empty files"""
+    path = tmp_path / 'small.csv'
+    path.write_bytes(b'Company Name,Job Title\nAcme,Engineer')
+    assert split_byte_ranges(path) == (b'Company Name,Job Title\n', [(23, 36)])
+
+    empty = tmp_path / 'empty.csv'
+    empty.write_bytes(b'')
+    assert split_byte_ranges(empty) == (b'', [])
+
+def test_parse_range_returns_typed_arrays(quoted_csv):
+    """Test that workers return plain numpy arrays with the normalized dtypes"""
+    header, ranges = split_byte_ranges(quoted_csv)
+    rows, arrays = parse_range((str(quoted_csv), header, *ranges[0]))
+
+    assert rows == 40
+    assert arrays['applied_date'].dtype == 'datetime64[ns]'
+    assert arrays['archived'].dtype == bool
+    assert arrays['notes'][0] == 'line one\nline "two", part 0\r\nend'
+
+def test_import_files_split_matches_whole_file(test_db):
+    """Test that byte-range splits of one file import the same applications"""
+    summary = import_files(test_db, [str(SAMPLE_CSV)], processes=1, split_bytes=2000)
+
+    expected = set(compute_simplify_ids(pd.read_csv(SAMPLE_CSV)))
+    stored = {simplify_id for (simplify_id,) in test_db.query(JobApplication.simplify_id)}
+    assert stored == expected
+    assert summary.rows == 323
+    assert len(summary.inserted) == len(expected)
+
+def test_import_files_parallel_dedupes_across_files(test_db, tmp_path):
+    """Test a multi-file import in worker processes, keeping the first copy of shared rows"""
+    export = pd.read_csv(SAMPLE_CSV)
+    first = export.iloc[:200]
+    second = export.iloc[150:].astype({'Notes': object})
+    second.loc[second.index[0], 'Notes'] = 'edited in the second file'
+    first.to_csv(tmp_path / 'a.csv', index=False)
+    second.to_csv(tmp_path / 'b.csv', index=False)
+
+    summary = import_files(test_db, [str(tmp_path)], processes=2)
+
+    assert summary.rows == 200 + len(second)
+    assert test_db.query(JobApplication).count() == compute_simplify_ids(export).nunique()
+    shared_id = compute_simplify_ids(export.iloc[[150]]).iloc[0]
+    assert test_db.query(JobApplication).filter_by(simplify_id=shared_id).one().notes is None
+
+    again = import_files(test_db, [str(tmp_path / '*.csv')], processes=2)
+    assert not again.changed
+
+def test_expand_paths(tmp_path):
+    """Test that directories and globs expand to sorted CSV paths without repeats"""
+    for name in ['b.csv', 'a.csv', 'notes.txt']:
+        (tmp_path / name).write_text('x')
+    expanded = expand_paths([str(tmp_path), str(tmp_path / 'a.csv')])
+    assert expanded == [str(tmp_path / 'a.csv'), str(tmp_path / 'b.csv')]
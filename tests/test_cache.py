@@ -0,0 +1,77 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from src.job_tracker.app import data_cache, process_csv
+from src.job_tracker.cache import DataCache
+from src.job_tracker.ingest import sync_applications
+from src.job_tracker.models import JobApplication, init_engine
+from src.job_tracker.snapshot import table_version
+
+def test_cache_hits_until_bumped():
+    """Test that values are reused until the data version changes"""
+    cache = DataCache()
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+
+    assert cache.get_or_compute(('stats',), compute) == 1
+    assert cache.get_or_compute(('stats',), compute) == 1
+    assert cache.stats() == {'version': 0, 'hits': 1, 'misses': 1, 'entries': 1}
+
+    cache.bump()
+    assert cache.get_or_compute(('stats',), compute) == 2
+    assert cache.stats()['version'] == 1
+    assert cache.stats()['misses'] == 2
+
+def test_cache_evicts_least_recently_used():
+    """Test that the cache stays within maxsize, dropping the oldest key"""
+    cache = DataCache(maxsize=2)
+    cache.get_or_compute('a', lambda: 'a')
+    cache.get_or_compute('b', lambda: 'b')
+    cache.get_or_compute('a', lambda: 'a')
+    cache.get_or_compute('c', lambda: 'c')
+
+    assert cache.get_or_compute('a', lambda: 'recomputed') == 'a'
+    assert cache.get_or_compute('b', lambda: 'recomputed') == 'recomputed'
+
+def test_cache_discards_value_computed_across_a_bump():
+    """Test that a value computed while the data changed is not stored"""
+    cache = DataCache()
+
+    def compute():
+        cache.bump()
+        return 'stale'
+
+    assert cache.get_or_compute('frame', compute) == 'stale'
+    assert cache.get_or_compute('frame', lambda: 'fresh') == 'fresh'
+
+def test_process_csv_bumps_data_version(test_db, sample_csv_data):
+    """Test that a sync invalidates cached frames only when it adds rows"""
+    version = data_cache.stats()['version']
+
+    process_csv(sample_csv_data, session=test_db)
+    assert data_cache.stats()['version'] == version + 1
+
+    process_csv(sample_csv_data, session=test_db)  # Nothing new
+    assert data_cache.stats()['version'] == version + 1
+
+def test_observe_bumps_on_external_writes(tmp_path, sample_csv_data):
+    """Test that writes made through another connection (another process) invalidate the cache"""
+    engine = init_engine(f"sqlite:///{tmp_path / 'tracker.db'}")
+    cache = DataCache()
+    with Session(engine) as dashboard:
+        assert not cache.observe(table_version(dashboard))  # First fingerprint is only recorded
+        cache.get_or_compute('frame', lambda: 'empty')
+
+        with Session(engine) as other:
+            sync_applications(other, sample_csv_data)
+            other.commit()
+        dashboard.rollback()  # A new rerun starts a new transaction
+        assert cache.observe(table_version(dashboard))
+        assert cache.get_or_compute('frame', lambda: 'synced') == 'synced'
+        assert not cache.observe(table_version(dashboard))
+
+        with Session(engine) as other:
+            other.execute(update(JobApplication).where(JobApplication.id == 1).values(notes='Edited elsewhere'))
+            other.commit()
+        dashboard.rollback()
+        assert cache.observe(table_version(dashboard))
+    assert cache.stats()['version'] == 2
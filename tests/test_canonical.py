@@ -0,0 +1,126 @@
+import random
+import string
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from src.job_tracker.canonical import (
+    CompanyMatcher,
+    canonical_company_keys,
+    jaccard,
+    minhash_signatures,
+    shingles,
+)
+from src.job_tracker.ingest import compute_simplify_ids, sync_applications
+from src.job_tracker.models import Company, CompanyAlias
+
+def random_names(count, seed=7):
+    """Distinct random company keys of two words"""
+    rng = random.Random(seed)
+    word = lambda: ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+    return list(dict.fromkeys(f'{word()} {word()}' for _ in range(count)))
+
+def test_shingles_and_jaccard():
+    """Test that spacing is ignored and one-letter typos stay similar"""
+    assert shingles('jp morgan chase') == shingles('jpmorgan chase')
+    assert jaccard(shingles('goldman sachs'), shingles('goldmann sachs')) >= 0.75
+    assert jaccard(shingles('citadel'), shingles('citadel securities')) < 0.5
+
+def test_minhash_estimates_jaccard():
+    """Test that the share of equal signature positions tracks the Jaccard similarity"""
+    left, right = shingles('capital one financial services'), shingles('capital one financial service')
+    signatures = minhash_signatures([left, right, left])
+    assert signatures.shape == (3, 64)
+    assert np.array_equal(signatures[0], signatures[2])
+    assert abs((signatures[0] == signatures[1]).mean() - jaccard(left, right)) < 0.2
+
+def test_matcher_merges_variants(test_db):
+    """Test that near-duplicates map to the first key seen and distinct names do not"""
+    keys = ['capital one financial', 'capital one finacial', 'capitalize', 'goldman sachs', 'goldmann sachs', 'meta', 'metal']
+    mapping = CompanyMatcher().canonicalize(test_db, keys)
+    assert mapping == {
+        'capital one financial': 'capital one financial',
+        'capital one finacial': 'capital one financial',
+        'capitalize': 'capitalize',
+        'goldman sachs': 'goldman sachs',
+        'goldmann sachs': 'goldman sachs',
+        'meta': 'meta',
+        'metal': 'metal',
+    }
+    stored = dict(test_db.execute(select(CompanyAlias.alias_key, CompanyAlias.canonical_key)).all())
+    assert stored == mapping
+
+def test_matcher_keeps_similar_distinct_employers_apart(test_db):
+    """Test that a different first word or number keeps high-similarity names separate"""
+    keys = ['bell technologies', 'dell technologies', 'morgan stanley', 'jpmorgan stanley', 'acme capital', 'acme capital 1']
+    mapping = CompanyMatcher().canonicalize(test_db, keys)
+    assert mapping == {key: key for key in keys}
+
+def test_matcher_merges_spacing_and_first_word_typos(test_db):
+    """Test that the first-word check still allows one typo and spacing differences"""
+    mapping = CompanyMatcher().canonicalize(test_db, ['jpmorgan chase', 'jp morgan chase', 'goldman sachs', 'goldmann sachs'])
+    assert mapping['jp morgan chase'] == 'jpmorgan chase'
+    assert mapping['goldmann sachs'] == 'goldman sachs'
+
+def test_matcher_reuses_stored_aliases(test_db):
+    """Test that a new matcher resolves known keys from the alias table, then from its LRU"""
+    CompanyMatcher().canonicalize(test_db, ['goldman sachs', 'goldmann sachs'])
+
+    matcher = CompanyMatcher(cache_size=1)
+    assert matcher.canonicalize(test_db, ['goldmann sachs']) == {'goldmann sachs': 'goldman sachs'}
+    assert matcher.comparisons == 0
+    assert matcher.canonicalize(test_db, ['goldman sachs', 'goldmans sachs'])['goldmans sachs'] == 'goldman sachs'
+    assert len(matcher._cache) == 1
+
+def test_matcher_blocking_avoids_pairwise_comparisons(test_db):
+    """Test that LSH blocking verifies far fewer pairs than comparing every pair"""
+    names = random_names(2000)
+    matcher = CompanyMatcher()
+    mapping = matcher.canonicalize(test_db, names + [name[:-1] + 'x' for name in names[:50]])
+
+    assert matcher.comparisons < len(names) * 2  # Pairwise would be about 2,000,000
+    assert sum(mapping[name] == name for name in names) >= len(names) - 5
+
+def test_canonical_company_keys_aligns_with_input(test_db):
+    """Test the Series helper, including repeats and missing keys"""
+    keys = pd.Series(['goldman sachs', None, 'goldmann sachs', 'goldman sachs'], index=[10, 11, 12, 13])
+    result = canonical_company_keys(test_db, keys)
+    assert list(result.index) == [10, 11, 12, 13]
+    assert result.tolist()[0] == result.tolist()[2] == result.tolist()[3] == 'goldman sachs'
+    assert pd.isna(result[11])
+
+def test_sync_merges_fuzzy_company_variants(test_db):
+    """Test that variants share a company row while keeping their own application IDs"""
+    export = pd.DataFrame({
+        'Company Name': ['Goldman Sachs', 'Goldmann Sachs & Co.', 'Citadel'],
+        'Job Title': ['Engineer', 'Engineer', 'Engineer'],
+        'Job URL': ['https://example.com/1', 'https://example.com/1', 'https://example.com/2'],
+        'Applied Date': ['2025-03-01', '2025-03-02', '2025-03-03'],
+    })
+    summary = sync_applications(test_db, export)
+    test_db.commit()
+
+    assert sorted(summary.inserted) == sorted(compute_simplify_ids(export))
+    assert len(set(summary.inserted)) == 3
+    companies = dict(test_db.execute(select(Company.key, Company.applications)).all())
+    assert companies == {'goldman sachs': 2, 'citadel': 1}
+
+def test_rolled_back_decisions_are_not_cached(test_db):
+    """Test that a rolled-back sync leaves no cached mapping without its alias row"""
+    export = pd.DataFrame({'Company Name': ['Goldman Sachs', 'Goldmann Sachs'], 'Job Title': ['Engineer', 'Analyst']})
+    sync_applications(test_db, export)
+    test_db.rollback()
+    assert test_db.execute(select(CompanyAlias)).all() == []
+
+    sync_applications(test_db, export)
+    test_db.commit()
+    aliases = dict(test_db.execute(select(CompanyAlias.alias_key, CompanyAlias.canonical_key)).all())
+    assert aliases == {'goldman sachs': 'goldman sachs', 'goldmann sachs': 'goldman sachs'}
+
+    # Committed decisions are served from the cache and index afterwards
+    matcher = CompanyMatcher()
+    matcher.canonicalize(test_db, ['capital one financial'])
+    assert matcher._cache == {}
+    test_db.commit()
+    assert matcher._cache == {'capital one financial': 'capital one financial'}
+    assert matcher.canonicalize(test_db, ['capital one finacial']) == {'capital one finacial': 'capital one financial'}
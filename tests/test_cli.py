@@ -0,0 +1,76 @@
+import io
+import json
+import subprocess
+import sys
+
+import pyarrow.parquet as pq
+import pytest
+from click.testing import CliRunner
+from src.job_tracker.cli import cli
+
+@pytest.fixture
+def synced(tmp_path, sample_csv_data):
+    """Run CLI commands against a database the sample export was synced into"""
+    export = tmp_path / 'export.csv'
+    sample_csv_data.to_csv(export, index=False)
+    db_url = f"sqlite:///{tmp_path / 'cli.db'}"
+    runner = CliRunner()
+
+    def invoke(*args):
+        result = runner.invoke(cli, ['--db', db_url, *args], catch_exceptions=False)
+        assert result.exit_code == 0, result.output
+        return result
+
+    assert 'Synced 2 rows: 2 new, 0 updated, 0 unchanged' in invoke('sync', str(export)).stdout
+    return invoke
+
+def test_sync_is_idempotent(synced, tmp_path):
+    """Test that syncing the same export again changes nothing"""
+    result = synced('sync', str(tmp_path / 'export.csv'))
+    assert 'Synced 2 rows: 0 new, 0 updated, 2 unchanged' in result.stdout
+
+def test_export_formats(synced):
+    """Test that export writes the same rows as CSV, JSON Lines and Parquet"""
+    lines = synced('export').stdout.splitlines()
+    assert lines[0].startswith('id,job_title,company_name')
+    assert len(lines) == 3
+
+    records = [json.loads(line) for line in synced('export', '--format', 'json').stdout.splitlines()]
+    assert [record['company_name'] for record in records] == ['Test Company', 'Another Company']
+    assert records[0]['applied_date'] == '2025-03-31T00:00:00' and records[1]['applied_date'] is None
+
+    table = pq.read_table(io.BytesIO(synced('export', '--format', 'parquet').stdout_bytes))
+    assert table.num_rows == 2
+    assert str(table.schema.field('applied_date').type) == 'timestamp[us]'
+    assert table.column('archived').to_pylist() == [False, True]
+
+def test_export_filters(synced):
+    """Test the status and archived filters of export"""
+    records = [json.loads(line) for line in synced('export', '--status', 'saved', '-f', 'json').stdout.splitlines()]
+    assert [record['status'] for record in records] == ['SAVED']
+    assert len(synced('export', '--exclude-archived').stdout.splitlines()) == 2
+
+def test_stats(synced):
+    """Test the per-company and per-status aggregations"""
+    companies = synced('stats').stdout.splitlines()
+    # The saved job has no applied date, so its company is not counted
+    assert companies == ['company,applications,most_recent,APPLIED', 'Test Company,1,2025-03-31 00:00:00,1']
+
+    statuses = [json.loads(line) for line in synced('stats', '--by', 'status', '-f', 'json').stdout.splitlines()]
+    assert {row['status']: row['applications'] for row in statuses} == {'APPLIED': 1, 'SAVED': 1}
+
+def test_search(synced):
+    """Test that search writes the matching applications"""
+    records = [json.loads(line) for line in synced('search', 'senior', '-f', 'json').stdout.splitlines()]
+    assert [record['job_title'] for record in records] == ['Senior Developer']
+    assert synced('search', 'nothing-matches').stdout.splitlines() == ['id,job_title,company_name,job_url,applied_date,status,status_date,archived,date_archived,notes,simplify_id,updated_at']
+
+def test_reports_do_not_import_pandas(synced, tmp_path):
+    """Test that report commands on an up-to-date database run without pandas"""
+    code = (
+        "import sys; from job_tracker.cli import cli; "
+        f"cli(['--db', 'sqlite:///{tmp_path / 'cli.db'}', 'stats', '--by', 'status'], standalone_mode=False); "
+        "print('pandas' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines()[-1] == 'False'
@@ -0,0 +1,111 @@
+import pandas as pd
+import pytest
+from sqlalchemy import select, text
+from src.job_tracker.companies import company_keys, get_company_table, normalize_company_name, rebuild_companies
+from src.job_tracker.ingest import sync_applications
+from src.job_tracker.models import Company, CompanyStatus, JobApplication
+from src.job_tracker.queries import get_company_stats
+
+def export(rows):
+    """A raw export with stable ids from ``(id, company, status, applied date)`` tuples"""
+    return pd.DataFrame([
+        {'id': simplify_id, 'Company Name': company, 'Job Title': 'Engineer', 'Status': status, 'Applied Date': applied}
+        for simplify_id, company, status, applied in rows
+    ])
+
+def company_rows(session):
+    """The company table and status breakdown as comparable tuples"""
+    return (
+        sorted(session.execute(select(Company.key, Company.name, Company.applications, Company.latest_applied)).all()),
+        sorted(session.execute(select(CompanyStatus.company_key, CompanyStatus.status, CompanyStatus.applications)).all()),
+    )
+
+@pytest.fixture
+def companies_db(test_db):
+    """Applications under several spellings of the same companies, and a saved job with no applied date"""
+    sync_applications(test_db, export([
+        ('a', 'Acme Inc', 'APPLIED', '2025-03-01'),
+        ('b', 'ACME, Inc.', 'REJECTED', '2025-03-10'),
+        ('c', 'Acme Inc', 'APPLIED', '2025-01-15'),
+        ('d', 'Globex Corporation', 'SAVED', '2025-02-01'),
+        ('e', 'Acme Inc', 'SAVED', None),
+    ]))
+    test_db.commit()
+    return test_db
+
+@pytest.mark.parametrize('name, key', [
+    ('Acme Inc', 'acme'),
+    ('ACME, Inc.', 'acme'),
+    ('  acme   INC ', 'acme'),
+    ('Acme L.L.C.', 'acme'),
+    ('Acme Holdings Co. Ltd', 'acme holdings'),
+    ('AT&T', 'at t'),
+    ('Company', 'company'),
+    ('Coca-Cola', 'coca cola'),
+    ('0090 CORP-Corporate Office', '0090'),
+    ('The Home Depot', 'home depot'),
+    ('Office Depot', 'office depot'),
+    ('Capital One Careers', 'capital one'),
+])
+def test_company_keys(name, key):
+    """Test that case, punctuation, whitespace and legal suffixes are folded"""
+    assert normalize_company_name(name) == key
+    assert company_keys(pd.Series([name, None])).tolist() == [key, '']
+
+def test_sync_maintains_company_table(companies_db):
+    """Test counts, latest date, spelling and status breakdown after a sync, without the undated saved job"""
+    companies, statuses = company_rows(companies_db)
+    assert companies == [
+        ('acme', 'Acme Inc', 3, pd.Timestamp('2025-03-10')),
+        ('globex', 'Globex Corporation', 1, pd.Timestamp('2025-02-01')),
+    ]
+    assert statuses == [('acme', 'APPLIED', 2), ('acme', 'REJECTED', 1), ('globex', 'SAVED', 1)]
+
+def test_sync_refreshes_touched_companies(companies_db):
+    """Test that a status change moves the breakdown and leaves other companies alone"""
+    sync_applications(companies_db, export([('d', 'Globex Corporation', 'APPLIED', '2025-02-01')]))
+    companies_db.commit()
+
+    companies, statuses = company_rows(companies_db)
+    assert ('globex', 'APPLIED', 1) in statuses and ('globex', 'SAVED', 1) not in statuses
+    assert companies[0] == ('acme', 'Acme Inc', 3, pd.Timestamp('2025-03-10'))
+
+def test_get_company_table(companies_db):
+    """Test the panel frame: ordering, status columns and the name filter"""
+    table = get_company_table(companies_db)
+    assert list(table.index) == ['Acme Inc', 'Globex Corporation']
+    assert list(table.columns) == ['Applications', 'Most Recent', 'Days Since Last', 'APPLIED', 'REJECTED', 'SAVED']
+    assert table.loc['Acme Inc', 'APPLIED'] == 2 and table.loc['Globex Corporation', 'APPLIED'] == 0
+    assert list(get_company_table(companies_db, search='GLOB').index) == ['Globex Corporation']
+    assert get_company_table(companies_db, search='%').empty
+
+def test_company_table_matches_company_stats(test_db):
+    """Test that the company table and the SQL company stats count the same applications"""
+    sync_applications(test_db, export([
+        ('a', 'Acme', 'APPLIED', '2025-03-01'),
+        ('b', 'Acme', 'SAVED', None),
+        ('c', 'Globex', 'APPLIED', '2025-02-01'),
+        ('d', 'Globex', 'REJECTED', '2025-02-10'),
+        ('e', 'Initech', 'SAVED', None),
+    ]))
+    test_db.commit()
+
+    columns = ['Applications', 'Most Recent']
+    table = get_company_table(test_db)[columns]
+    stats = get_company_stats(test_db)[columns]
+    assert list(table.index) == list(stats.index) == ['Globex', 'Acme']
+    pd.testing.assert_frame_equal(table.reset_index(drop=True), stats.reset_index(drop=True), check_dtype=False)
+
+def test_rebuild_companies_matches_incremental(companies_db):
+    """Test that a full rebuild, including re-keying applications, gives the same table"""
+    incremental = company_rows(companies_db)
+    companies_db.execute(JobApplication.__table__.update().values(company_key=None))
+    assert rebuild_companies(companies_db.connection()) == 2
+    assert company_rows(companies_db) == incremental
+
+def test_company_table_read_uses_index(companies_db):
+    """Test that the panel's ordered read needs no sort step"""
+    compiled = select(Company.key).order_by(Company.applications.desc(), Company.key).compile(companies_db.get_bind())
+    plan = ' | '.join(row[3] for row in companies_db.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    assert 'ix_companies_applications' in plan
+    assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,119 @@
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from src.job_tracker.database import create_db_engine, create_session_registry, session_scope
+from src.job_tracker.ingest import sync_csv_stream
+from src.job_tracker.models import JobApplication, init_engine
+from src.job_tracker.queries import count_applications, get_company_stats
+
+SAMPLE_CSV = Path(__file__).resolve().parent.parent / 'Simplify_Tracked_Jobs_2025-03-31.csv'
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """A pooled engine on a SQLite file with the current schema"""
+    engine = init_engine(f"sqlite:///{tmp_path / 'tracker.db'}")
+    yield engine
+    engine.dispose()
+
+def test_sqlite_connections_use_wal(file_engine):
+    """Test that every pooled connection is configured by the connect event"""
+    with file_engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == 'wal'
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    assert file_engine.pool.size() == 5
+
+def test_memory_engine_keeps_default_pool():
+    """Test that in-memory databases are not given a pool they cannot share"""
+    engine = create_db_engine('sqlite://')
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+
+def test_session_scope_commits_and_rolls_back(file_engine):
+    """Test that a unit of work is committed, and discarded when it raises"""
+    Session = create_session_registry(file_engine)
+    with session_scope(Session) as session:
+        session.add(JobApplication(company_name='Kept', simplify_id='kept'))
+
+    with pytest.raises(RuntimeError):
+        with session_scope(Session) as session:
+            session.add(JobApplication(company_name='Dropped', simplify_id='dropped'))
+            session.flush()
+            raise RuntimeError('boom')
+
+    with session_scope(Session) as session:
+        assert [app.simplify_id for app in session.query(JobApplication)] == ['kept']
+
+def test_session_registry_is_per_thread(file_engine):
+    """Test that each thread gets its own session and reuses it until removed"""
+    Session = create_session_registry(file_engine)
+    main_session = Session()
+    assert Session() is main_session
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(Session()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_session
+
+    Session.remove()
+    assert Session() is not main_session
+
+def test_concurrent_readers_during_sync(file_engine):
+    """Load test: readers keep getting consistent answers while a sync writes"""
+    export = pd.read_csv(SAMPLE_CSV)
+    chunks = []
+    for i in range(8):
+        chunk = export.copy()
+        chunk['Job URL'] = chunk['Job URL'].fillna('https://example.com/job') + f"#copy-{i}"
+        chunks.append(chunk)
+
+    Session = create_session_registry(file_engine)
+    writing = threading.Event()
+    done = threading.Event()
+    errors = []
+    counts = {}
+
+    def write():
+        try:
+            with session_scope(Session) as session:
+                writing.set()
+                sync_csv_stream(session, iter(chunks))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            writing.set()
+            done.set()
+            Session.remove()
+
+    def read(reader):
+        seen = counts.setdefault(reader, [])
+        writing.wait()
+        try:
+            while True:
+                finished = done.is_set()
+                with session_scope(Session) as session:
+                    seen.append(count_applications(session))
+                    get_company_stats(session)
+                if finished:
+                    break
+        except Exception as e:
+            errors.append(e)
+        finally:
+            Session.remove()
+
+    threads = [threading.Thread(target=read, args=(reader,)) for reader in range(4)]
+    threads.append(threading.Thread(target=write))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert errors == []
+    for seen in counts.values():
+        assert seen == sorted(seen)  # Committed chunks only ever add rows
+        assert all(count % 319 == 0 for count in seen)  # Never a half-written chunk
+    with session_scope(Session) as session:
+        assert count_applications(session) == 8 * 319
@@ -0,0 +1,161 @@
+import pandas as pd
+import pytest
+from sqlalchemy import event, select
+from src.job_tracker.edits import EditBuffer, apply_edits, save_edits
+from src.job_tracker.ingest import sync_applications
+from src.job_tracker.models import Company, JobApplication, StatusEvent
+from src.job_tracker.queries import load_row_versions
+
+@pytest.fixture
+def edits_db(test_db):
+    """Three synced applications at two companies"""
+    sync_applications(test_db, pd.DataFrame([
+        {'id': simplify_id, 'Company Name': company, 'Job Title': 'Engineer', 'Status': 'APPLIED',
+         'Applied Date': '2025-03-01', 'Status Date': '2025-03-01', 'Notes': 'Original'}
+        for simplify_id, company in [('a', 'Acme'), ('b', 'Acme'), ('c', 'Globex')]
+    ]))
+    test_db.commit()
+    return test_db
+
+def application_ids(session):
+    return session.execute(select(JobApplication.id).order_by(JobApplication.id)).scalars().all()
+
+def updates(session):
+    """Record the UPDATE statements sent to the database"""
+    statements = []
+    event.listen(
+        session.get_bind(), 'before_cursor_execute',
+        lambda conn, cursor, statement, *args: statements.append(statement) if statement.startswith('UPDATE') else None,
+    )
+    return statements
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_buffer_debounces_staged_edits():
+    """Test that edits are due only once no new edit arrived for the debounce time"""
+    clock = FakeClock()
+    buffer = EditBuffer(debounce=2.0, clock=clock)
+    ids, versions = [10, 11], {10: 1, 11: 4}
+
+    assert buffer.stage(ids, versions, {0: {'Notes': 'a'}})
+    clock.now = 1.5
+    assert buffer.stage(ids, versions, {0: {'Notes': 'a'}, 1: {'Status': 'SCREEN'}})
+    clock.now = 3.0
+    assert not buffer.due()
+    assert not buffer.stage(ids, versions, {0: {'Notes': 'a'}, 1: {'Status': 'SCREEN'}})  # Same delta on a rerun
+    clock.now = 3.5
+    assert buffer.due()
+
+    assert buffer.take() == {10: (1, {'Notes': 'a'}), 11: (4, {'Status': 'SCREEN'})}
+    assert len(buffer) == 0 and not buffer.due()
+
+def test_apply_edits_writes_only_edited_cells(edits_db):
+    """Test one UPDATE per changed column, the row version bumped once per row"""
+    first, second, third = application_ids(edits_db)
+    versions = load_row_versions(edits_db, [first, second, third])
+    statements = updates(edits_db)
+
+    result = apply_edits(edits_db, {
+        first: (versions[first], {'Notes': 'Called back', 'Job Title': 'Staff Engineer'}),
+        second: (versions[second], {'Notes': 'Referral'}),
+    })
+    edits_db.commit()
+
+    assert result.saved == [first, second] and result.conflicts == []
+    # The version claim, then one statement per edited column
+    assert len([statement for statement in statements if 'job_applications' in statement]) == 3
+    rows = {row.id: row for row in edits_db.execute(select(JobApplication)).scalars()}
+    assert (rows[first].notes, rows[first].job_title) == ('Called back', 'Staff Engineer')
+    assert (rows[second].notes, rows[second].job_title) == ('Referral', 'Engineer')
+    assert rows[third].notes == 'Original'
+    assert load_row_versions(edits_db, [first, second, third]) == {
+        first: versions[first] + 1, second: versions[second] + 1, third: versions[third],
+    }
+
+def test_apply_edits_skips_stale_rows(edits_db):
+    """Test that a row written since it was shown is reported, not overwritten"""
+    first, second, _ = application_ids(edits_db)
+    versions = load_row_versions(edits_db, [first, second])
+    apply_edits(edits_db, {first: (versions[first], {'Notes': 'From another tab'})})
+    edits_db.commit()
+
+    result = save_edits(edits_db, {
+        first: (versions[first], {'Notes': 'Stale'}),
+        second: (versions[second], {'Notes': 'Fresh'}),
+    })
+
+    assert result.saved == [second] and result.conflicts == [first]
+    notes = dict(edits_db.execute(select(JobApplication.id, JobApplication.notes)).all())
+    assert (notes[first], notes[second]) == ('From another tab', 'Fresh')
+
+def test_apply_edits_tracks_status_and_company(edits_db):
+    """Test that status edits are logged and moved applications recounted"""
+    first, _, third = application_ids(edits_db)
+    versions = load_row_versions(edits_db, [first, third])
+
+    apply_edits(edits_db, {
+        first: (versions[first], {'Status': 'INTERVIEW', 'Status Date': '2025-03-11T00:00:00'}),
+        third: (versions[third], {'Company': 'Acme Inc'}),
+    })
+    edits_db.commit()
+
+    logged = edits_db.execute(
+        select(StatusEvent.application_id, StatusEvent.from_status, StatusEvent.to_status, StatusEvent.source)
+        .where(StatusEvent.source == 'edit')
+    ).all()
+    assert logged == [(first, 'APPLIED', 'INTERVIEW', 'edit')]
+    assert edits_db.execute(select(Company.key, Company.applications)).all() == [('acme', 3)]
+
+def test_apply_edits_rejects_clearing_required_columns(edits_db):
+    """Test that an application cannot lose its company name"""
+    first = application_ids(edits_db)[0]
+    with pytest.raises(ValueError):
+        save_edits(edits_db, {first: (1, {'Company': None})})
+    assert edits_db.get(JobApplication, first).company_name == 'Acme'
+
+def test_conflicting_edits_are_flushed_once(edits_db):
+    """Test that edits rejected by the version check are dropped from the page, not retried every rerun"""
+    # The dashboard's own modules, so the cache and session state are the ones it uses
+    import streamlit as st
+    from job_tracker import ui
+    from job_tracker.cache import data_cache
+
+    ids = application_ids(edits_db)
+    editor_key = f"{ui.EDITOR_KEY_PREFIX}test"
+    st.session_state[editor_key] = {'edited_rows': {0: {'Notes': 'Mine'}, 1: {'Notes': 'Mine too'}}}
+    st.session_state['edit_buffer'] = EditBuffer()
+    stale = {application_id: 0 for application_id in ids}
+    ui.get_edit_buffer().stage(ids, stale, st.session_state[editor_key]['edited_rows'])
+
+    version = data_cache.version
+    result = ui.flush_edits(edits_db)
+    assert (result.saved, result.conflicts) == ([], ids[:2])
+    assert data_cache.version > version
+    assert editor_key not in st.session_state
+    assert 'reloaded' in st.session_state.pop('edit_notice')
+
+    # Nothing is left to stage on the next rerun, so the timer's next flush writes nothing
+    statements = updates(edits_db)
+    assert ui.flush_edits(edits_db) is None
+    assert statements == []
+    del st.session_state['edit_buffer']
+
+def test_only_the_current_editor_state_is_kept():
+    """Test that the editors of other pages and data versions leave no widget state behind"""
+    import streamlit as st
+    from job_tracker import ui
+
+    for suffix in ['page1', 'page2', 'page2v2']:
+        st.session_state[f"{ui.EDITOR_KEY_PREFIX}{suffix}"] = {'edited_rows': {}}
+    st.session_state['company_search'] = 'acme'
+
+    ui.discard_editor_state(keep=f"{ui.EDITOR_KEY_PREFIX}page2v2")
+    assert [key for key in st.session_state if key.startswith(ui.EDITOR_KEY_PREFIX)] == [f"{ui.EDITOR_KEY_PREFIX}page2v2"]
+    assert st.session_state.pop('company_search') == 'acme'
+    ui.discard_editor_state()
+    assert not [key for key in st.session_state if key.startswith(ui.EDITOR_KEY_PREFIX)]
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from src.job_tracker.app import search_applications
+from src.job_tracker.frames import FRAME_SCHEMA, apply_schema, contains_text, frame_memory, typed_array
+from src.job_tracker.queries import filter_company_stats, get_company_stats, load_applications_frame
+
+def object_frame(rows):
+    """Applications as the dashboard used to hold them: one Python string per cell"""
+    return pd.DataFrame({
+        'Job Title': pd.array([f'Engineer {i % 50}' for i in range(rows)], dtype=object),
+        'Company': pd.array([f'Company {i % 40}' for i in range(rows)], dtype=object),
+        'Status': pd.array([['APPLIED', 'REJECTED', 'INTERVIEW'][i % 3] for i in range(rows)], dtype=object),
+        'Notes': pd.array([None if i % 4 else f'note {i}' for i in range(rows)], dtype=object),
+        'Job URL': pd.array([f'https://example.com/job/{i}' for i in range(rows)], dtype=object),
+    })
+
+def test_typed_array():
+    """Test that each column gets the dtype its schema entry names"""
+    status = typed_array('Status', ['APPLIED', None, 'APPLIED'])
+    assert isinstance(status.dtype, pd.CategoricalDtype)
+    assert list(status.categories) == ['APPLIED']
+    assert list(status.codes) == [0, -1, 0]
+
+    assert typed_array('Notes', ['note', None]).dtype == FRAME_SCHEMA['Notes']
+    assert typed_array('Archived', [1, 0, None]).dtype == 'boolean'
+    assert typed_array('Applied Date', ['2025-03-31 00:00:00.000000', None]).dtype == 'datetime64[ns]'
+
+def test_load_applications_frame_uses_schema(test_db, sample_job_application):
+    """Test that loaded frames carry categoricals and Arrow strings instead of objects"""
+    test_db.add(sample_job_application)
+    test_db.commit()
+
+    frame = load_applications_frame(test_db)
+    assert isinstance(frame['Company'].dtype, pd.CategoricalDtype)
+    assert isinstance(frame['Status'].dtype, pd.CategoricalDtype)
+    assert frame['Notes'].dtype == FRAME_SCHEMA['Notes']
+    assert frame['Job URL'].dtype == FRAME_SCHEMA['Job URL']
+    assert not (frame.dtypes == object).any()
+
+def test_apply_schema_reencodes_concatenated_categoricals():
+    """Test that frames whose categoricals were widened to object are encoded again"""
+    left = apply_schema(pd.DataFrame({'Company': ['Acme']}))
+    right = apply_schema(pd.DataFrame({'Company': ['Globex', None]}))
+    combined = apply_schema(pd.concat([left, right], ignore_index=True))
+    assert list(combined['Company'].cat.categories) == ['Acme', 'Globex']
+    assert combined['Company'].isna().tolist() == [False, False, True]
+
+def test_contains_text_matches_categories():
+    """Test that categorical matches agree with a row-by-row substring search"""
+    values = pd.Series(['Acme', 'Globex', None, 'ACME Labs', 'Initech'], dtype='category')
+    expected = [isinstance(value, str) and 'acme' in value.lower() for value in values.astype(object)]
+    assert contains_text(values, 'AcMe').tolist() == expected
+    assert contains_text(values.astype(object), 'AcMe').tolist() == expected
+    assert contains_text(pd.CategoricalIndex(values), 'c++').tolist() == [False] * 5
+
+def test_search_applications_on_schema_frame():
+    """Test the DataFrame search over categorical and Arrow string columns"""
+    df = apply_schema(pd.DataFrame({
+        'Job Title': ['C++ Developer', 'Engineer', 'Analyst'],
+        'Company': ['Acme', 'Globex', 'Acme'],
+        'Notes': [None, 'acme referral', None],
+    }))
+    assert list(search_applications(df, 'acme').index) == [0, 1, 2]
+    assert list(search_applications(df, 'c++')['Company']) == ['Acme']
+
+def test_filter_company_stats_matches_sql_filter(test_db, sample_job_application):
+    """Test that filtering the cached stats frame gives what the SQL filter does"""
+    test_db.add(sample_job_application)
+    test_db.commit()
+
+    stats = get_company_stats(test_db)
+    assert isinstance(stats.index.dtype, pd.CategoricalDtype)
+    for search in ['', 'test', 'COMPANY', '%', 'missing']:
+        expected = get_company_stats(test_db, search=search)
+        filtered = filter_company_stats(stats, search)
+        assert list(filtered.index) == list(expected.index)
+        pd.testing.assert_frame_equal(filtered.reset_index(drop=True), expected.reset_index(drop=True))
+
+def test_schema_frame_is_smaller():
+    """Test that the schema dtypes hold repeated strings in a fraction of the memory"""
+    before = object_frame(5000)
+    after = apply_schema(before)
+    assert frame_memory(after) < 0.75 * frame_memory(before)
+    for column in ['Company', 'Status']:
+        assert frame_memory(after[[column]]) < 0.2 * frame_memory(before[[column]])
+    assert np.array_equal(after['Notes'].isna(), before['Notes'].isna())
@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+from sqlalchemy import select
+from src.job_tracker.history import (
+    ALL_COMPANIES,
+    PIPELINE_STAGES,
+    get_pipeline_funnel,
+    get_status_activity,
+    rebuild_rollups,
+    stage_rank,
+)
+from src.job_tracker.ingest import sync_applications
+from src.job_tracker.models import StatusEvent, StatusRollup
+
+def export(rows):
+    """A raw export with stable ids from ``(id, company, status, status date)`` tuples"""
+    return pd.DataFrame([
+        {'id': simplify_id, 'Company Name': company, 'Job Title': 'Engineer', 'Status': status, 'Status Date': date}
+        for simplify_id, company, status, date in rows
+    ])
+
+def rollup_rows(session):
+    """Every rollup row as a comparable tuple"""
+    table = StatusRollup.__table__
+    return sorted(session.execute(select(table)).all())
+
+@pytest.fixture
+def history_db(test_db):
+    """Three applications synced twice: two advance through the pipeline, one is unchanged"""
+    sync_applications(test_db, export([
+        ('a', 'Acme', 'SAVED', '2025-03-01'),
+        ('b', 'Acme', 'APPLIED', '2025-03-02'),
+        ('c', 'Globex', 'APPLIED', '2025-03-02'),
+    ]))
+    sync_applications(test_db, export([
+        ('a', 'Acme', 'APPLIED', '2025-03-05'),
+        ('b', 'Acme', 'INTERVIEW', '2025-03-12'),
+        ('c', 'Globex', 'APPLIED', '2025-03-02'),
+    ]))
+    test_db.commit()
+    return test_db
+
+def test_stage_rank():
+    """Test funnel positions of funnel, outcome, unknown and missing statuses"""
+    statuses = pd.Series(['SAVED', 'INTERVIEW', 'REJECTED', 'SOMETHING ELSE', None])
+    assert stage_rank(statuses).tolist() == [0, 3, 1, 0, -1]
+
+def test_sync_appends_status_events(history_db):
+    """Test that syncs log first statuses and changes, and skip unchanged rows"""
+    events = history_db.execute(
+        select(StatusEvent.company_name, StatusEvent.from_status, StatusEvent.to_status, StatusEvent.source)
+        .order_by(StatusEvent.id)
+    ).all()
+    assert events == [
+        ('Acme', None, 'SAVED', 'sync'),
+        ('Acme', None, 'APPLIED', 'sync'),
+        ('Globex', None, 'APPLIED', 'sync'),
+        ('Acme', 'SAVED', 'APPLIED', 'sync'),
+        ('Acme', 'APPLIED', 'INTERVIEW', 'sync'),
+    ]
+
+    sync_applications(history_db, export([('c', 'Globex', 'APPLIED', '2025-03-02')]))
+    assert history_db.query(StatusEvent).count() == 5
+
+def test_pipeline_funnel(history_db):
+    """Test reached counts, conversion and time in stage from the rollups"""
+    funnel = get_pipeline_funnel(history_db)
+
+    assert list(funnel.index) == PIPELINE_STAGES
+    assert funnel['Reached'].tolist() == [3, 3, 1, 1, 0]
+    assert funnel.loc['SCREEN', 'Conversion'] == pytest.approx(1 / 3)
+    assert funnel['Currently In'].tolist() == [0, 2, 0, 1, 0]
+    # SAVED lasted 4 days; APPLIED lasted 10 days
+    assert funnel.loc['SAVED', 'Avg Days In Stage'] == 4.0
+    assert funnel.loc['APPLIED', 'Avg Days In Stage'] == 10.0
+    assert pd.isna(funnel.loc['INTERVIEW', 'Avg Days In Stage'])
+
+    globex = get_pipeline_funnel(history_db, company='Globex')
+    assert globex['Reached'].tolist() == [1, 1, 0, 0, 0]
+    assert get_pipeline_funnel(history_db, since=pd.Timestamp('2025-03-10').date())['Reached'].tolist() == [0, 0, 1, 1, 0]
+
+def test_status_activity(history_db):
+    """Test the per-day count of applications entering each status"""
+    activity = get_status_activity(history_db)
+    assert activity.loc[pd.Timestamp('2025-03-02'), 'APPLIED'] == 2
+    assert activity.loc[pd.Timestamp('2025-03-12'), 'INTERVIEW'] == 1
+    assert activity.sum().sum() == 5
+
+def test_rebuild_rollups_matches_incremental(history_db):
+    """Test that replaying the event log reproduces the incrementally kept rollups"""
+    incremental = rollup_rows(history_db)
+    assert {row.company_name for row in incremental} == {'Acme', 'Globex', ALL_COMPANIES}
+
+    assert rebuild_rollups(history_db.connection()) == 5
+    assert rollup_rows(history_db) == incremental
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+def run_python(code, cwd):
+    """Run ``code`` in a fresh interpreter and return its stdout"""
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+def test_app_import_is_lightweight(tmp_path):
+    """Test that importing the entry point loads no heavy dependency and opens no database"""
+    loaded = run_python(
+        "import sys, job_tracker.app; "
+        "print(' '.join(m for m in ('streamlit', 'pandas', 'sqlalchemy', 'job_tracker.ui') if m in sys.modules))",
+        tmp_path,
+    )
+    assert loaded == []
+    assert list(tmp_path.iterdir()) == []
+
+def test_core_modules_do_not_import_streamlit(tmp_path):
+    """Test that the models, ingest and query modules work without the UI"""
+    loaded = run_python(
+        "import sys, job_tracker.ingest, job_tracker.queries; print('streamlit' in sys.modules)",
+        tmp_path,
+    )
+    assert loaded == ['False']
+
+def test_lazy_exports_and_engine(tmp_path):
+    """Test that re-exported helpers and the engine are created on first use"""
+    output = run_python(
+        "import sys, job_tracker.app as app; "
+        "print(app.clean_value(None) is None, 'job_tracker.ingest' in sys.modules); "
+        "print(app.get_engine() is app.get_engine())",
+        tmp_path,
+    )
+    assert output == ['True', 'True', 'True']
+    assert (tmp_path / 'job_tracker.db').exists()
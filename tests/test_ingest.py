@@ -0,0 +1,221 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.job_tracker.ingest import (
+    backfill_sync_ledger,
+    compute_simplify_ids,
+    content_hashes,
+    fetch_existing_ids,
+    generate_unique_id,
+    generate_unique_ids,
+    insert_ignore_duplicates,
+    normalize_simplify_frame,
+    sync_applications,
+    sync_csv_stream,
+)
+from src.job_tracker.models import JobApplication, SyncCheckpoint, SyncLedger
+
+SAMPLE_CSV = Path(__file__).resolve().parent.parent / 'Simplify_Tracked_Jobs_2025-03-31.csv'
+
+def test_compute_simplify_ids(sample_csv_data):
+    """Test that explicit IDs are kept and missing ones are generated"""
+    ids = compute_simplify_ids(sample_csv_data)
+    assert ids.iloc[0] == '12345'
+    assert ids.iloc[1] == generate_unique_id(sample_csv_data.iloc[1])
+
+def test_compute_simplify_ids_without_id_column(sample_csv_data):
+    """Test ID generation when the export has no id column"""
+    df = sample_csv_data.drop(columns=['id'])
+    ids = compute_simplify_ids(df)
+    assert list(ids) == [generate_unique_id(row) for _, row in df.iterrows()]
+
+def test_fetch_existing_ids_chunks(test_db, sample_job_application):
+    """Test that lookups spanning several IN chunks find existing IDs"""
+    test_db.add(sample_job_application)
+    test_db.commit()
+
+    candidates = [f'missing-{i}' for i in range(25)] + ['12345']
+    assert fetch_existing_ids(test_db, candidates, chunk_size=10) == {'12345'}
+
+def test_sync_skips_existing_and_repeated_rows(test_db, sample_csv_data):
+    """Test that only rows new to both the upload and the database are inserted"""
+    df = pd.concat([sample_csv_data, sample_csv_data], ignore_index=True)
+    assert len(sync_applications(test_db, df).inserted) == 2
+    test_db.commit()
+
+    extra = sample_csv_data.iloc[[0]].assign(id='67890')
+    assert len(sync_applications(test_db, pd.concat([df, extra])).inserted) == 1
+    test_db.commit()
+    assert test_db.query(JobApplication).count() == 3
+
+def test_insert_ignore_duplicates_on_conflict(test_db, sample_job_application):
+    """Test that a conflicting simplify_id is skipped instead of raising"""
+    test_db.add(sample_job_application)
+    test_db.commit()
+
+    insert_ignore_duplicates(test_db, [
+        {'company_name': 'Race Company', 'simplify_id': '12345'},
+        {'company_name': 'New Company', 'simplify_id': 'abc'},
+    ])
+    test_db.commit()
+
+    assert test_db.query(JobApplication).count() == 2
+    assert test_db.query(JobApplication).filter_by(simplify_id='12345').one().company_name == 'Test Company'
+
+def test_normalize_simplify_frame_export_spellings():
+    """Test N/A dates and Yes/No archived values as written by Simplify"""
+    raw = pd.DataFrame([
+        {'Company Name': 'Acme', 'Applied Date': 'N/A', 'Status Date': '2025-03-19',
+         'Archived': 'Yes', 'Date Archived': '2025-03-20', 'Notes': 'N/A'},
+        {'Company Name': 'Acme', 'Applied Date': '2025-03-18', 'Status Date': 'N/A',
+         'Archived': 'No', 'Date Archived': 'N/A', 'Notes': 'Follow up'},
+    ])
+    frame = normalize_simplify_frame(raw)
+
+    assert list(frame['archived']) == [True, False]
+    assert pd.isna(frame.loc[0, 'applied_date'])
+    assert frame.loc[1, 'applied_date'] == pd.Timestamp('2025-03-18')
+    assert pd.isna(frame.loc[1, 'date_archived'])
+    assert frame.loc[0, 'notes'] is None
+    assert frame.loc[0, 'job_title'] is None  # Column absent from the export
+
+def test_normalize_simplify_frame_dtypes(sample_csv_data):
+    """Test that the normalized frame is typed for direct insertion"""
+    frame = normalize_simplify_frame(sample_csv_data)
+
+    for column in ['applied_date', 'status_date', 'date_archived']:
+        assert frame[column].dtype == 'datetime64[ns]'
+    assert frame['archived'].dtype == bool
+    assert list(frame['simplify_id']) == list(compute_simplify_ids(sample_csv_data))
+
+def test_normalize_simplify_frame_non_iso_dates():
+    """Test that non-ISO dates still parse, matching the scalar parse_date"""
+    raw = pd.DataFrame({'Company Name': ['Acme'] * 3, 'Applied Date': ['03/18/2025', '2025-03-18 09:30', 'soon']})
+    frame = normalize_simplify_frame(raw)
+    assert list(frame['applied_date'][:2]) == [pd.Timestamp('2025-03-18'), pd.Timestamp('2025-03-18 09:30')]
+    assert pd.isna(frame['applied_date'][2])
+
+def test_normalize_simplify_frame_timezone_dates():
+    """Test that offset and Z timestamps are stored as naive UTC next to plain dates"""
+    raw = pd.DataFrame({
+        'Company Name': ['Acme'] * 4,
+        'Applied Date': ['2025-03-31T10:00:00Z', '2025-03-31T10:00:00-04:00', '2025-03-30', '03/18/2025 09:30 +01:00'],
+    })
+    frame = normalize_simplify_frame(raw)
+    assert list(frame['applied_date']) == [
+        pd.Timestamp('2025-03-31 10:00'), pd.Timestamp('2025-03-31 14:00'),
+        pd.Timestamp('2025-03-30'), pd.Timestamp('2025-03-18 08:30'),
+    ]
+    assert frame['applied_date'].dtype == 'datetime64[ns]'
+
+@pytest.mark.parametrize('frame', [
+    pd.DataFrame({
+        'Company Name': ['Acme', 'Acme', None, 'Beta', np.nan],
+        'Job Title': ['Engineer', None, 'Analyst', 123, 'Dev'],
+        'Job URL': ['https://a/1', 'https://a/2', None, None, 'https://e/5'],
+        'Applied Date': ['2025-03-18', np.nan, '2025-01-02', None, 45.5],
+    }),
+    pd.DataFrame({  # Key columns missing entirely
+        'Company Name': ['Acme', None],
+        'Status': ['APPLIED', 'SAVED'],
+    }),
+    pd.DataFrame({  # Already parsed dates and a non-default index
+        'Company Name': ['Acme', 'Beta'],
+        'Job Title': ['Engineer', 'Analyst'],
+        'Job URL': ['https://a/1', 'https://b/1'],
+        'Applied Date': pd.to_datetime(['2025-03-18', None]),
+    }, index=[10, 20]),
+])
+def test_generate_unique_ids_matches_scalar(frame):
+    """Test that batch IDs are byte-identical to generate_unique_id"""
+    expected = [generate_unique_id(row) for _, row in frame.iterrows()]
+    ids = generate_unique_ids(frame)
+    assert list(ids) == expected
+    assert list(ids.index) == list(frame.index)
+
+def test_generate_unique_ids_matches_scalar_on_export():
+    """Test ID parity on the shipped Simplify export"""
+    export = pd.read_csv(SAMPLE_CSV)
+    expected = [generate_unique_id(row) for _, row in export.iterrows()]
+    assert list(generate_unique_ids(export)) == expected
+
+def test_generate_unique_ids_process_pool(sample_csv_data):
+    """Test that hashing in worker processes gives the same IDs"""
+    frame = pd.concat([sample_csv_data] * 4, ignore_index=True)
+    assert list(generate_unique_ids(frame, processes=2)) == list(generate_unique_ids(frame, processes=1))
+
+def test_sync_csv_stream_chunks(test_db):
+    """Test that a streamed sync matches a whole-file sync and reports progress"""
+    updates = []
+    summary = sync_csv_stream(test_db, SAMPLE_CSV, chunksize=50, progress=lambda rows, fraction: updates.append((rows, fraction)))
+    added = len(summary.inserted)
+
+    expected = pd.read_csv(SAMPLE_CSV)
+    assert added == compute_simplify_ids(expected).nunique()
+    assert test_db.query(JobApplication).count() == added
+    assert updates[-1] == (len(expected), 1.0)
+    assert [rows for rows, _ in updates[:-1]] == list(range(50, len(expected), 50)) + [len(expected)]
+
+def test_sync_csv_stream_resumes_after_failure(test_db, sample_csv_data):
+    """Test that a failed chunk keeps earlier chunks and a retry resumes after them"""
+    good = sample_csv_data.iloc[[0]]
+    bad = sample_csv_data.iloc[[1]].assign(**{'Company Name': None})  # company_name is required
+    fixed = sample_csv_data.iloc[[1]]
+
+    with pytest.raises(Exception):
+        sync_csv_stream(test_db, iter([good, bad]), source_key='export.csv')
+    assert test_db.query(JobApplication).count() == 1
+
+    # The first chunk was committed, so a retry must not process it again
+    assert len(sync_csv_stream(test_db, iter([bad, fixed]), source_key='export.csv').inserted) == 1
+    assert test_db.query(JobApplication).count() == 2
+    assert test_db.query(SyncCheckpoint).filter_by(source_key='export.csv').one().completed
+
+def test_content_hashes(sample_csv_data):
+    """Test that hashes follow the exported field values only"""
+    frame = normalize_simplify_frame(sample_csv_data)
+    hashes = content_hashes(frame)
+    assert hashes.str.len().tolist() == [32, 32]
+    assert hashes.is_unique
+    assert content_hashes(frame.assign(simplify_id='other')).equals(hashes)
+
+    changed = frame.copy()
+    changed.loc[0, 'status'] = 'INTERVIEW'
+    changed.loc[1, 'notes'] = ''  # An empty note is not a missing note
+    assert (content_hashes(changed) != hashes).all()
+
+def test_sync_applications_updates_changed_rows(test_db, sample_csv_data):
+    """Test that a re-upload inserts nothing, updates changed rows and skips the rest"""
+    first = sync_applications(test_db, sample_csv_data)
+    assert len(first.inserted) == 2 and first.updated == [] and first.unchanged == 0
+
+    later = sample_csv_data.copy()
+    later.loc[0, 'Status'] = 'INTERVIEW'
+    later.loc[0, 'Status Date'] = '2025-04-10'
+    summary = sync_applications(test_db, later)
+    test_db.commit()
+
+    assert summary.inserted == []
+    assert summary.updated == ['12345']
+    assert summary.unchanged == 1
+    app = test_db.query(JobApplication).filter_by(simplify_id='12345').one()
+    assert app.status == 'INTERVIEW'
+    assert app.status_date == pd.Timestamp('2025-04-10')
+    assert test_db.query(JobApplication).count() == 2
+
+    again = sync_applications(test_db, later)
+    assert not again.changed
+    assert again.unchanged == 2
+    assert test_db.query(SyncLedger).count() == 2
+
+def test_backfill_sync_ledger(test_db, sample_job_application, sample_csv_data):
+    """Test that rows stored before the ledger existed hash like their export rows"""
+    test_db.add(sample_job_application)
+    test_db.commit()
+
+    assert backfill_sync_ledger(test_db.connection()) == 1
+    assert backfill_sync_ledger(test_db.connection()) == 0
+    summary = sync_applications(test_db, sample_csv_data.iloc[[0]])
+    assert summary.unchanged == 1 and not summary.changed
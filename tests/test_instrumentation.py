@@ -0,0 +1,102 @@
+import asyncio
+import json
+import threading
+
+import pandas as pd
+from sqlalchemy import select
+from src.job_tracker.ingest import sync_applications
+from src.job_tracker.models import JobApplication
+from src.job_tracker.queries import load_applications_frame
+
+# The run context must be the one the package's own (absolute) imports see
+from job_tracker import instrumentation
+from job_tracker.instrumentation import PERF_LOG_ENV, current_run, instrument_engine, record_run, span, timed_iter
+
+def test_spans_nest_and_aggregate():
+    """Test that repeated spans are summed under their first position"""
+    with record_run('test') as run:
+        with span('outer'):
+            for rows in (2, 3):
+                with span('inner', rows=rows):
+                    pass
+        assert current_run() is run
+    assert current_run() is None
+
+    spans = {stats['name']: stats for stats in run.to_dict()['spans']}
+    assert (spans['outer']['calls'], spans['outer']['depth']) == (1, 0)
+    assert (spans['inner']['calls'], spans['inner']['depth'], spans['inner']['rows']) == (2, 1, 5)
+    assert run.seconds >= spans['outer']['ms'] / 1000
+
+def test_spans_in_worker_threads_keep_their_parents():
+    """Test that overlapping spans in ``asyncio.to_thread`` workers nest under the span that started them"""
+    workers = 4
+    barrier = threading.Barrier(workers)
+
+    def work():
+        with span('worker'):
+            barrier.wait()  # Every worker has its span open at once
+            with span('step'):
+                barrier.wait()
+
+    async def main():
+        with span('outer'):
+            await asyncio.gather(*(asyncio.to_thread(work) for _ in range(workers)))
+            with span('after'):
+                pass
+
+    with record_run('threads') as run:
+        asyncio.run(main())
+
+    spans = {stats['name']: stats for stats in run.to_dict()['spans']}
+    assert {name: (stats['depth'], stats['calls']) for name, stats in spans.items()} == {
+        'outer': (0, 1), 'worker': (1, workers), 'step': (2, workers), 'after': (1, 1),
+    }
+
+def test_spans_are_noops_outside_runs():
+    """Test that library code can open spans with nothing recording"""
+    with span('idle') as idle:
+        idle.rows = 10
+    assert current_run() is None
+    assert list(timed_iter('idle', [1, 2])) == [1, 2]
+
+def test_sync_stages_and_queries_are_counted(test_db, sample_csv_data):
+    """Test that a sync reports its stages and the statements each ran"""
+    instrument_engine(test_db.get_bind())
+    with record_run('sync') as run:
+        sync_applications(test_db, sample_csv_data)
+        test_db.commit()
+        frame = load_applications_frame(test_db)
+
+    spans = {stats['name']: stats for stats in run.to_dict()['spans']}
+    assert {'sync.normalize', 'sync.ids', 'sync.lookup', 'sync.insert', 'sync.ledger', 'frame.build'} <= set(spans)
+    assert spans['sync.insert']['rows'] == 2 and spans['sync.insert']['queries'] == 1
+    assert spans['frame.build']['rows'] == len(frame.index)
+    assert run.statements['INSERT'] >= 1 and run.statements['SELECT'] >= 1
+    assert run.rows_written >= 2
+
+    # Queries outside a run are not counted anywhere
+    test_db.execute(select(JobApplication.id)).all()
+    assert run.queries == sum(run.statements.values())
+
+def test_runs_are_logged_as_json(tmp_path, monkeypatch):
+    """Test that each finished run appends one JSON line to the perf log"""
+    path = tmp_path / 'perf.jsonl'
+    monkeypatch.setenv(PERF_LOG_ENV, str(path))
+    monkeypatch.setattr(instrumentation, '_log_path', None)
+    for name in ('first', 'second'):
+        with record_run(name):
+            with span('stage'):
+                pass
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line['run'] for line in lines] == ['first', 'second']
+    assert lines[0]['spans'][0]['name'] == 'stage'
+    for handler in list(instrumentation.logger.handlers):
+        instrumentation.logger.removeHandler(handler)
+        handler.close()
+
+def test_profile_capture():
+    """Test that an opt-in profile report is attached to the run"""
+    with record_run('profiled', profile='cprofile') as run:
+        pd.DataFrame({'a': range(1000)}).sum()
+    assert 'cumulative' in run.profile or 'function calls' in run.profile
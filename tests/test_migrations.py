@@ -0,0 +1,160 @@
+import pytest
+from sqlalchemy import create_engine, func, inspect, select, text
+from src.job_tracker.migrations import MIGRATIONS, current_version, migrate
+from src.job_tracker.models import Base, Company, JobApplication, StatusEvent, StatusRollup, TableCount
+from src.job_tracker.queries import company_stats_query
+
+# job_applications as created by the first release, before any indexes
+LEGACY_SCHEMA = """
+CREATE TABLE job_applications (
+    id INTEGER NOT NULL PRIMARY KEY,
+    job_title VARCHAR(255),
+    company_name VARCHAR(255) NOT NULL,
+    job_url VARCHAR(512),
+    applied_date DATETIME,
+    status VARCHAR(50),
+    status_date DATETIME,
+    archived BOOLEAN,
+    date_archived DATETIME,
+    notes TEXT,
+    simplify_id VARCHAR(255) UNIQUE
+)
+"""
+
+@pytest.fixture
+def legacy_engine():
+    """An in-memory database with the pre-migration schema"""
+    engine = create_engine('sqlite:///:memory:')
+    with engine.begin() as connection:
+        connection.execute(text(LEGACY_SCHEMA))
+    return engine
+
+@pytest.fixture
+def indexed_engine():
+    """An in-memory database with the current schema"""
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    migrate(engine)
+    return engine
+
+def index_names(connection):
+    return {row[0] for row in connection.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'job_applications'"
+    ))}
+
+def query_plan(engine, statement):
+    """Return the EXPLAIN QUERY PLAN details for a SQLAlchemy statement"""
+    with engine.connect() as connection:
+        compiled = statement.compile(engine, compile_kwargs={'literal_binds': True})
+        return ' | '.join(row[3] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+
+def test_migrate_adds_indexes_to_existing_table(legacy_engine):
+    """Test that an existing database gains the indexes create_all would skip"""
+    applied = migrate(legacy_engine)
+
+    assert applied == [version for version, _ in MIGRATIONS]
+    with legacy_engine.connect() as connection:
+        assert {
+            'ix_job_applications_company_name',
+            'ix_job_applications_status',
+            'ix_job_applications_applied_date',
+            'ix_job_applications_archived_status_date',
+            'ix_job_applications_company_key',
+        } <= index_names(connection)
+        assert current_version(connection) == MIGRATIONS[-1][0]
+
+def test_migrate_adds_updated_at(legacy_engine):
+    """Test that existing rows get a write time for incremental snapshot refreshes"""
+    with legacy_engine.begin() as connection:
+        connection.execute(text("INSERT INTO job_applications (company_name, simplify_id) VALUES ('Acme', 'a1')"))
+    migrate(legacy_engine)
+
+    with legacy_engine.connect() as connection:
+        assert connection.execute(select(JobApplication.updated_at)).scalar_one() is not None
+        assert 'ix_job_applications_updated_at' in index_names(connection)
+
+def test_migrate_seeds_status_history(legacy_engine):
+    """Test that existing applications start the event log at their current status"""
+    with legacy_engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO job_applications (company_name, simplify_id, status, status_date) "
+            "VALUES ('Acme', 'a1', 'APPLIED', '2025-03-01 00:00:00.000000'), ('Acme', 'a2', NULL, NULL)"
+        ))
+    migrate(legacy_engine)
+
+    with legacy_engine.connect() as connection:
+        event = connection.execute(select(StatusEvent)).one()
+        assert (event.from_status, event.to_status, event.source) == (None, 'APPLIED', 'backfill')
+        rollups = connection.execute(select(StatusRollup.company_name, StatusRollup.status, StatusRollup.entered)).all()
+        assert ('Acme', 'APPLIED', 1) in rollups and ('', 'APPLIED', 1) in rollups
+
+def test_migrate_builds_company_table(legacy_engine):
+    """Test that existing applications are keyed by company and those with an applied date counted"""
+    with legacy_engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO job_applications (company_name, simplify_id, applied_date) VALUES "
+            "('Acme Inc', 'a1', '2025-03-01 00:00:00.000000'), ('ACME, Inc.', 'a2', '2025-03-02 00:00:00.000000'), "
+            "('Acme', 'a3', NULL)"
+        ))
+    migrate(legacy_engine)
+
+    with legacy_engine.connect() as connection:
+        assert set(connection.execute(select(JobApplication.company_key)).scalars()) == {'acme'}
+        assert connection.execute(select(Company.key, Company.applications)).all() == [('acme', 2)]
+
+def test_migrate_adds_row_version(legacy_engine):
+    """Test that existing rows start at version 1"""
+    with legacy_engine.begin() as connection:
+        connection.execute(text("INSERT INTO job_applications (company_name, simplify_id) VALUES ('Acme', 'a1')"))
+    migrate(legacy_engine)
+
+    with legacy_engine.connect() as connection:
+        assert connection.execute(select(JobApplication.version)).scalar_one() == 1
+
+def test_migrate_adds_table_counts(legacy_engine):
+    """Test that the application count is seeded from existing rows and kept current by triggers"""
+    with legacy_engine.begin() as connection:
+        connection.execute(text("INSERT INTO job_applications (company_name, simplify_id) VALUES ('Acme', 'a1'), ('Beta', 'b1')"))
+    migrate(legacy_engine)
+
+    count = select(TableCount.rows).where(TableCount.name == 'job_applications')
+    with legacy_engine.begin() as connection:
+        assert connection.execute(count).scalar_one() == 2
+        connection.execute(text("INSERT INTO job_applications (company_name, simplify_id) VALUES ('Gamma', 'g1')"))
+        connection.execute(text("DELETE FROM job_applications WHERE simplify_id IN ('a1', 'b1')"))
+        assert connection.execute(count).scalar_one() == 1
+
+def test_migrate_is_idempotent(legacy_engine):
+    """Test that running migrations again applies nothing"""
+    migrate(legacy_engine)
+    assert migrate(legacy_engine) == []
+
+def test_migrate_fresh_database():
+    """Test that a create_all database only records the migration versions"""
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    assert migrate(engine) == [version for version, _ in MIGRATIONS]
+    assert 'job_applications' in inspect(engine).get_table_names()
+
+@pytest.mark.parametrize('search', [None, 'acme'])
+def test_company_stats_query_uses_covering_index(indexed_engine, search):
+    """Test that the per-company aggregation reads only the company index"""
+    plan = query_plan(indexed_engine, company_stats_query(search))
+    assert 'COVERING INDEX ix_job_applications_company_name' in plan
+
+@pytest.mark.parametrize('statement, index', [
+    (select(JobApplication).where(JobApplication.status == 'APPLIED'),
+     'ix_job_applications_status'),
+    (select(JobApplication).where(JobApplication.applied_date >= '2025-01-01'),
+     'ix_job_applications_applied_date'),
+    (select(JobApplication).order_by(JobApplication.applied_date.desc()).limit(50),
+     'ix_job_applications_applied_date'),
+    (select(JobApplication).where(JobApplication.archived.is_(False)).order_by(JobApplication.status_date.desc()),
+     'ix_job_applications_archived_status_date'),
+    (select(JobApplication).where(func.lower(JobApplication.company_name) == 'acme'),
+     'ix_job_applications_company_key'),
+])
+def test_filter_queries_use_indexes(indexed_engine, statement, index):
+    """Test that the filter and ordering queries are index searches, not table scans"""
+    plan = query_plan(indexed_engine, statement)
+    assert f'INDEX {index}' in plan
@@ -0,0 +1,128 @@
+import pandas as pd
+import pytest
+from src.job_tracker.models import JobApplication
+from src.job_tracker.queries import (
+    DISPLAY_COLUMNS,
+    count_applications,
+    get_company_stats,
+    load_applications_by_ids,
+    load_applications_frame,
+    load_applications_page,
+)
+
+@pytest.fixture
+def populated_db(test_db):
+    """A database with several applications per company"""
+    rows = [
+        ('Acme', '2025-03-01'),
+        ('Acme', '2025-03-20'),
+        ('Acme', None),
+        ('Beta_Corp', '2025-02-10'),
+        ('100% Co', '2025-01-05'),
+        ('Undated Inc', None),
+    ]
+    for i, (company, applied) in enumerate(rows):
+        test_db.add(JobApplication(
+            company_name=company,
+            applied_date=pd.to_datetime(applied) if applied else None,
+            simplify_id=f'app-{i}',
+        ))
+    test_db.commit()
+    return test_db
+
+def test_get_company_stats(populated_db):
+    """Test counts, latest date and ordering of the SQL aggregation"""
+    stats = get_company_stats(populated_db)
+
+    assert list(stats.columns) == ['Applications', 'Most Recent', 'Days Since Last']
+    assert list(stats.index) == ['Acme', '100% Co', 'Beta_Corp']  # Undated applications are excluded
+    assert stats.loc['Acme', 'Applications'] == 2
+    assert stats.loc['Acme', 'Most Recent'] == pd.Timestamp('2025-03-20')
+    assert stats.loc['Acme', 'Days Since Last'] == (pd.Timestamp.now() - pd.Timestamp('2025-03-20')).days
+
+def test_get_company_stats_search(populated_db):
+    """Test the case-insensitive, literal company filter"""
+    assert list(get_company_stats(populated_db, search='acm').index) == ['Acme']
+    assert list(get_company_stats(populated_db, search='%').index) == ['100% Co']
+    assert list(get_company_stats(populated_db, search='a_c').index) == ['Beta_Corp']
+    assert list(get_company_stats(populated_db, search='(').index) == []
+
+def test_get_company_stats_empty(test_db):
+    """Test that an empty database gives an empty frame with the same columns"""
+    stats = get_company_stats(test_db)
+    assert stats.empty
+    assert list(stats.columns) == ['Applications', 'Most Recent', 'Days Since Last']
+
+def test_load_applications_frame(test_db, sample_job_application):
+    """Test that the columnar loader matches the stored values with typed columns"""
+    test_db.add(sample_job_application)
+    test_db.commit()
+
+    frame = load_applications_frame(test_db)
+
+    assert list(frame.columns) == list(DISPLAY_COLUMNS)
+    assert list(frame.index) == [sample_job_application.id]
+    row = frame.iloc[0]
+    assert row['Company'] == 'Test Company'
+    assert row['Applied Date'] == pd.Timestamp('2025-03-31')
+    assert pd.isna(row['Date Archived'])
+    assert row['Archived'] == False
+    assert frame['Applied Date'].dtype == 'datetime64[ns]'
+    assert frame['Archived'].dtype == 'boolean'
+
+def test_load_applications_frame_selected_columns(populated_db):
+    """Test that only the requested columns are loaded, in display order"""
+    frame = load_applications_frame(populated_db, columns=['Applied Date', 'Company'])
+    assert list(frame.columns) == ['Company', 'Applied Date']
+    assert len(frame) == 6
+
+def test_load_applications_frame_empty(test_db):
+    """Test that an empty table still gives the requested columns"""
+    frame = load_applications_frame(test_db, columns=['Company', 'Status Date'])
+    assert frame.empty
+    assert list(frame.columns) == ['Company', 'Status Date']
+
+@pytest.mark.parametrize('page_size', [1, 2, 4, 6, 10])
+def test_load_applications_page_traversal(populated_db, page_size):
+    """Test that following cursors visits every row once, newest first, undated last"""
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = load_applications_page(populated_db, columns=['Company', 'Applied Date'], page_size=page_size, after=cursor)
+        assert len(page) <= page_size
+        seen.append(page)
+        if cursor is None:
+            break
+
+    frame = pd.concat(seen)
+    assert len(frame) == count_applications(populated_db) == 6
+    assert frame.index.is_unique
+    assert list(frame['Applied Date'].dropna()) == sorted(frame['Applied Date'].dropna(), reverse=True)
+    assert frame['Applied Date'].iloc[-2:].isna().all()
+    assert list(frame.index[-2:]) == sorted(frame.index[-2:], reverse=True)
+
+def test_load_applications_page_same_date(test_db):
+    """Test that rows sharing an applied date are split across pages by id"""
+    for i in range(5):
+        test_db.add(JobApplication(company_name=f'Co {i}', applied_date=pd.Timestamp('2025-03-01'), simplify_id=f's-{i}'))
+    test_db.commit()
+
+    first, cursor = load_applications_page(test_db, columns=['Company'], page_size=3)
+    second, cursor = load_applications_page(test_db, columns=['Company'], page_size=3, after=cursor)
+    assert list(first['Company']) == ['Co 4', 'Co 3', 'Co 2']
+    assert list(second['Company']) == ['Co 1', 'Co 0']
+    assert cursor is None
+
+def test_load_applications_page_empty(test_db):
+    """Test that an empty table gives one empty page"""
+    page, cursor = load_applications_page(test_db, columns=['Company'])
+    assert page.empty
+    assert cursor is None
+
+def test_load_applications_by_ids(populated_db):
+    """Test that rows come back in the requested order, skipping unknown ids"""
+    ids = list(load_applications_frame(populated_db).index)
+    wanted = [ids[3], ids[0], 9999, ids[5]]
+    frame = load_applications_by_ids(populated_db, wanted, columns=['Company'])
+    assert list(frame.index) == [ids[3], ids[0], ids[5]]
+    assert list(frame['Company']) == ['Beta_Corp', 'Acme', 'Undated Inc']
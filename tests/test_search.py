@@ -0,0 +1,125 @@
+import pandas as pd
+import pytest
+from src.job_tracker import search
+from src.job_tracker.app import search_applications
+from src.job_tracker.models import JobApplication
+from src.job_tracker.search import (
+    build_inverted_index,
+    data_cache,
+    fts5_available,
+    install_fts5_index,
+    parse_query,
+    search_application_ids,
+)
+
+APPLICATIONS = [
+    ('Software Engineer', 'Acme', 'Referred by Dana'),
+    ('Senior Software Engineer', 'Globex', None),
+    ('Data Analyst', 'Initech', 'Mentions software engineering culture'),
+    ('C++ Developer', 'Engineer Labs', 'e-commerce platform'),
+    ('Product Manager', 'Acme', None),
+]
+
+QUERIES = [
+    ('engineer', {1, 2, 3, 4}),  # Prefix match in title, company and notes
+    ('software engineer', {1, 2, 3}),  # Every term must match
+    ('"software engineer"', {1, 2}),  # Exact phrase
+    ('"software engineer"*', {1, 2, 3}),  # Phrase with a prefix on its last word
+    ('acme manager', {5}),
+    ('c++', {3, 4}),  # Punctuation is not an operator; 'c' also prefixes 'culture'
+    ('(dana', {1}),
+    ('e-commerce', {4}),
+    ('nothing here', set()),
+]
+
+def add_applications(session):
+    for i, (title, company, notes) in enumerate(APPLICATIONS, start=1):
+        session.add(JobApplication(id=i, job_title=title, company_name=company, notes=notes, simplify_id=f'app-{i}'))
+    session.commit()
+
+@pytest.fixture
+def fts_db(test_db):
+    """A database with the FTS5 mirror installed before any rows exist"""
+    if not fts5_available(test_db.connection()):
+        pytest.skip("SQLite build without FTS5")
+    install_fts5_index(test_db.connection())
+    test_db.commit()
+    add_applications(test_db)
+    return test_db
+
+@pytest.fixture
+def plain_db(test_db):
+    """A database without FTS5, searched through the in-memory index"""
+    add_applications(test_db)
+    data_cache.bump()
+    return test_db
+
+def test_parse_query():
+    """Test prefix, phrase and punctuation handling in the query parser"""
+    assert parse_query('Software eng') == [(['software'], True), (['eng'], True)]
+    assert parse_query('"data analyst"') == [(['data', 'analyst'], False)]
+    assert parse_query('e-commerce c++ (') == [(['e', 'commerce'], True), (['c'], True)]
+    assert parse_query('   ') == []
+
+@pytest.mark.parametrize('query, expected', QUERIES)
+def test_fts5_search(fts_db, query, expected):
+    """Test matching through the FTS5 index"""
+    assert set(search_application_ids(fts_db, query)) == expected
+
+@pytest.mark.parametrize('query, expected', QUERIES)
+def test_inverted_index_search(plain_db, query, expected):
+    """Test that the in-memory fallback matches the same applications"""
+    assert set(search_application_ids(plain_db, query)) == expected
+
+@pytest.mark.parametrize('db_fixture', ['fts_db', 'plain_db'])
+def test_search_ranking(request, db_fixture):
+    """Test that title matches rank above notes-only matches, and limits apply"""
+    session = request.getfixturevalue(db_fixture)
+    ranked = search_application_ids(session, 'software')
+    assert ranked[-1] == 3  # Only mentioned in the notes
+    assert search_application_ids(session, 'software', limit=1) == ranked[:1]
+
+@pytest.mark.parametrize('db_fixture', ['fts_db', 'plain_db'])
+def test_broad_query_returns_newest_matches(request, db_fixture, monkeypatch):
+    """Test that a limited query matching too much skips ranking"""
+    session = request.getfixturevalue(db_fixture)
+    monkeypatch.setattr(search, 'RANK_MAX_MATCHES', 2)
+    assert search_application_ids(session, 'engineer', limit=2) == [4, 3]
+    assert search_application_ids(session, '"software engineer"*', limit=3) == [3, 2, 1]
+
+def test_fts5_triggers_follow_updates_and_deletes(fts_db):
+    """Test that the FTS5 mirror stays in sync with the applications table"""
+    app = fts_db.get(JobApplication, 5)
+    app.notes = 'Recruiter mentioned Kubernetes'
+    fts_db.commit()
+    assert search_application_ids(fts_db, 'kubernetes') == [5]
+
+    fts_db.delete(app)
+    fts_db.commit()
+    assert search_application_ids(fts_db, 'kubernetes') == []
+    assert search_application_ids(fts_db, 'manager') == []
+
+def test_install_fts5_index_indexes_existing_rows(test_db):
+    """Test that installing on a populated database indexes the existing rows"""
+    if not fts5_available(test_db.connection()):
+        pytest.skip("SQLite build without FTS5")
+    add_applications(test_db)
+    install_fts5_index(test_db.connection())
+    test_db.commit()
+    assert set(search_application_ids(test_db, 'acme')) == {1, 5}
+
+def test_build_inverted_index(plain_db):
+    """Test that the fallback index covers every application"""
+    index = build_inverted_index(plain_db)
+    assert set(index.doc_lengths) == {1, 2, 3, 4, 5}
+    assert index.search(parse_query('globex')) == [2]
+
+def test_search_applications_literal():
+    """Test that regex characters in a DataFrame search are matched literally"""
+    df = pd.DataFrame({
+        'Job Title': ['C++ Developer', 'Engineer (Backend)'],
+        'Company': ['Acme', 'Globex'],
+        'Notes': [None, None],
+    })
+    assert list(search_applications(df, 'c++')['Company']) == ['Acme']
+    assert list(search_applications(df, '(backend')['Company']) == ['Globex']
@@ -0,0 +1,156 @@
+import io
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import event
+
+pytest.importorskip('pyarrow')
+
+from src.job_tracker import snapshot
+from src.job_tracker.ingest import sync_applications
+from src.job_tracker.models import JobApplication, init_db
+from src.job_tracker.queries import load_applications_frame
+from src.job_tracker.search import build_inverted_index
+from src.job_tracker.snapshot import (
+    load_snapshot_frame,
+    read_snapshot,
+    read_snapshot_version,
+    refresh_snapshot,
+    snapshot_path,
+    snapshot_rows,
+    table_version,
+)
+
+SAMPLE_CSV = Path(__file__).resolve().parent.parent / 'Simplify_Tracked_Jobs_2025-03-31.csv'
+
+@pytest.fixture
+def file_db(tmp_path):
+    """A SQLite file database holding the shipped export"""
+    session = init_db(f"sqlite:///{tmp_path / 'tracker.db'}")
+    sync_applications(session, pd.read_csv(SAMPLE_CSV))
+    session.commit()
+    yield session
+    session.close()
+
+def assert_same_frame(left, right):
+    """Compare snapshot and SQL frames value by value, ignoring dtypes"""
+    assert list(left.index) == list(right.index)
+    assert list(left.columns) == list(right.columns)
+    assert left.astype(object).fillna(-1).equals(right.astype(object).fillna(-1))
+
+def test_snapshot_path(file_db, tmp_path, test_db):
+    """Test that snapshots live next to SQLite files only"""
+    assert snapshot_path(file_db.get_bind()) == tmp_path / 'tracker.snapshot.arrow'
+    assert snapshot_path(test_db.get_bind()) is None
+
+def test_table_version_uses_no_scans(file_db):
+    """Test that the per-rerun fingerprint is index lookups only, and follows deletes"""
+    statements = []
+    engine = file_db.get_bind()
+    listener = lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters))
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        version = table_version(file_db)
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+
+    assert version['rows'] == file_db.query(JobApplication).count()
+    connection = file_db.connection()
+    for statement, parameters in statements:
+        plan = ' | '.join(row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+        assert 'SCAN' not in plan, statement
+
+    file_db.query(JobApplication).filter(JobApplication.id < 5).delete()
+    assert table_version(file_db)['rows'] == version['rows'] - 4
+
+def test_snapshot_matches_database(file_db):
+    """Test the snapshot's contents, dtypes and recorded version"""
+    path = snapshot_path(file_db.get_bind())
+    assert refresh_snapshot(file_db, path)
+    assert not refresh_snapshot(file_db, path)
+
+    frame = read_snapshot(path)
+    assert_same_frame(frame, load_applications_frame(file_db))
+    assert frame['Company'].dtype == 'category'
+    assert frame['Status'].dtype == 'category'
+    assert frame['Applied Date'].dtype == 'datetime64[ns]'
+    assert read_snapshot_version(path) == table_version(file_db)
+    assert list(read_snapshot(path, ['Status', 'Company']).columns) == ['Company', 'Status']
+
+def test_snapshot_refreshes_changed_rows_incrementally(file_db, monkeypatch):
+    """Test that a sync's inserts and updates are merged without a full reload"""
+    path = snapshot_path(file_db.get_bind())
+    refresh_snapshot(file_db, path)
+
+    export = pd.read_csv(SAMPLE_CSV)
+    export.loc[1, 'Status'] = 'INTERVIEW'
+    extra = export.iloc[[1]].assign(**{'Job URL': 'https://example.com/new'})
+    summary = sync_applications(file_db, pd.concat([export, extra]))
+    file_db.commit()
+    assert len(summary.inserted) == 1 and len(summary.updated) >= 1
+
+    loads = []
+    original = snapshot.load_applications_frame
+    monkeypatch.setattr(snapshot, 'load_applications_frame', lambda *args, **kwargs: loads.append(kwargs) or original(*args, **kwargs))
+    frame = load_snapshot_frame(file_db, path)
+
+    assert len(loads) == 1 and loads[0].get('where') is not None
+    assert_same_frame(frame, load_applications_frame(file_db))
+    assert read_snapshot_version(path) == table_version(file_db)
+
+def test_snapshot_rebuilds_after_deletes(file_db):
+    """Test that deleted rows invalidate the incremental merge"""
+    path = snapshot_path(file_db.get_bind())
+    refresh_snapshot(file_db, path)
+
+    file_db.query(JobApplication).filter(JobApplication.id <= 10).delete()
+    file_db.commit()
+
+    assert_same_frame(load_snapshot_frame(file_db, path), load_applications_frame(file_db))
+
+def test_snapshot_rebuilds_outdated_format(file_db, monkeypatch):
+    """Test that a file written in an older layout is not trusted"""
+    path = snapshot_path(file_db.get_bind())
+    refresh_snapshot(file_db, path)
+
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_FORMAT', snapshot.SNAPSHOT_FORMAT + 1)
+    assert read_snapshot_version(path) is None
+    assert refresh_snapshot(file_db, path)
+
+def test_search_index_reads_snapshot_lazily(file_db):
+    """Test that writes leave the snapshot alone and the index build brings it up to date"""
+    path = snapshot_path(file_db.get_bind())
+    assert not path.exists()
+
+    index = build_inverted_index(file_db)
+    assert read_snapshot_version(path) == table_version(file_db)
+    rows = list(snapshot_rows(file_db, path, ['Job Title', 'Company', 'Notes']))
+    assert len(rows) == len(index.doc_lengths)
+
+    file_db.query(JobApplication).filter_by(id=rows[0][0]).update({'notes': 'zeppelin'})
+    file_db.commit()
+    assert read_snapshot_version(path) != table_version(file_db)
+    assert build_inverted_index(file_db).search([(['zeppelin'], False)]) == [rows[0][0]]
+    assert read_snapshot_version(path) == table_version(file_db)
+
+def test_dashboard_download_reads_snapshot(file_db, monkeypatch):
+    """Test that the dashboard's CSV download loads every application through the snapshot"""
+    pytest.importorskip('streamlit')
+    from job_tracker import ui
+    from job_tracker.database import create_session_registry
+
+    registry = create_session_registry(file_db.get_bind())
+    monkeypatch.setattr(ui, 'get_session_registry', lambda: registry)
+    paths = []
+    def spy(session, path, columns):
+        paths.append(path)
+        return load_snapshot_frame(session, path, columns)
+    monkeypatch.setattr(ui, 'load_snapshot_frame', spy)
+
+    exported = pd.read_csv(io.StringIO(ui.applications_csv(['Status', 'Company'])), index_col='id')
+    assert list(exported.columns) == ['Status', 'Company']
+    assert list(exported.index) == list(load_applications_frame(file_db).index)
+    path = snapshot_path(file_db.get_bind())
+    assert paths == [path]
+    assert read_snapshot_version(path) == table_version(file_db)
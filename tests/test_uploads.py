@@ -0,0 +1,75 @@
+import io
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from src.job_tracker.ingest import compute_simplify_ids
+from src.job_tracker.models import JobApplication, SyncRun
+from src.job_tracker.uploads import file_fingerprints, sync_upload
+
+SAMPLE_CSV = Path(__file__).resolve().parent.parent / 'Simplify_Tracked_Jobs_2025-03-31.csv'
+
+@pytest.fixture
+def export_bytes():
+    """The shipped export and a shorter, earlier version of it (its first 100 rows)"""
+    content = SAMPLE_CSV.read_bytes()
+    earlier = pd.read_csv(io.BytesIO(content), nrows=100)
+    # Cut on the byte boundary where row 101 starts; the export has no quoted line breaks
+    lines = content.splitlines(keepends=True)
+    return content, b''.join(lines[:101]), len(earlier)
+
+def test_file_fingerprints():
+    """Test that prefix hashes match hashing the prefix on its own"""
+    content = b'a,b\n1,"x"\n2,y\n'
+    file_hash, prefixes = file_fingerprints(io.BytesIO(content), [4, 10, 99])
+
+    assert file_hash == file_fingerprints(io.BytesIO(content))[0]
+    assert prefixes[4] == (file_fingerprints(io.BytesIO(content[:4]))[0], 0)
+    assert prefixes[10] == (file_fingerprints(io.BytesIO(content[:10]))[0], 2)
+    assert 99 not in prefixes
+
+def test_sync_upload_skips_identical_bytes(test_db, export_bytes):
+    """Test that uploading the same bytes twice only syncs once"""
+    content, _, _ = export_bytes
+    run, summary = sync_upload(test_db, io.BytesIO(content))
+    assert summary.rows == 323
+    assert run.inserted == test_db.query(JobApplication).count()
+
+    start = time.perf_counter()
+    again, summary = sync_upload(test_db, io.BytesIO(content))
+    assert time.perf_counter() - start < 0.5
+    assert summary is None
+    assert again.id == run.id
+    assert test_db.query(SyncRun).count() == 1
+
+def test_sync_upload_reads_only_appended_rows(test_db, export_bytes):
+    """Test that an export extending an earlier upload only syncs its tail"""
+    content, earlier, earlier_rows = export_bytes
+    first, _ = sync_upload(test_db, io.BytesIO(earlier))
+
+    run, summary = sync_upload(test_db, io.BytesIO(content))
+    assert run.base_run_id == first.id
+    assert summary.rows == 323 - earlier_rows
+    expected = compute_simplify_ids(pd.read_csv(SAMPLE_CSV)).nunique()
+    assert test_db.query(JobApplication).count() == expected
+
+def test_sync_upload_changed_prefix_syncs_whole_file(test_db, export_bytes):
+    """Test that a file whose earlier rows changed is synced in full"""
+    content, earlier, _ = export_bytes
+    sync_upload(test_db, io.BytesIO(earlier))
+
+    edited = content.replace(b'APPLIED', b'INTERVIEW', 1)
+    run, summary = sync_upload(test_db, io.BytesIO(edited))
+    assert run.base_run_id is None
+    assert summary.rows == 323
+    assert len(summary.updated) == 1
+
+def test_sync_upload_partial_line_prefix_syncs_whole_file(test_db, export_bytes):
+    """Test that a prefix cut mid-row is not treated as an earlier export"""
+    content, earlier, _ = export_bytes
+    sync_upload(test_db, io.BytesIO(earlier[:-20]))
+
+    run, summary = sync_upload(test_db, io.BytesIO(content))
+    assert run.base_run_id is None
+    assert summary.rows == 323